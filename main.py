@@ -17,12 +17,182 @@ try:
 except ImportError:
     HAS_PIL = False
 
+# 性能工具放在 scripts/ 下（打包 exe 时通过 --paths scripts 一起打进去）
+_SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts")
+if os.path.isdir(_SCRIPTS_DIR) and _SCRIPTS_DIR not in sys.path:
+    sys.path.append(_SCRIPTS_DIR)
+
+try:
+    from profiler import FrameProfiler
+    from tracing import tracer, traced
+    from sampler import SamplingProfiler
+    from drawstats import DrawStats
+    from gcpause import GcPauseManager
+    from options import OPTIONS
+    from replay import InputRecorder, InputReplayer
+    from rng import seed as seed_rng, stream as rng_stream
+    from tasks import TaskScheduler
+    import view
+    import display
+    from idle import IdleThrottle
+    HAS_DEVTOOLS = True
+except ImportError:
+    HAS_DEVTOOLS = False
+
+    # 缺少 scripts/ 时的空实现：F3 / F4 / --trace / --profile / --draw-stats /
+    # GC 停顿管理 / 录制回放 / 空闲时预热 / --render-size / --display / 空闲降频都不生效
+    class FrameProfiler:
+        enabled = False
+
+        def begin_frame(self):
+            pass
+
+        def lap(self, name):
+            pass
+
+        def handle_event(self, event):
+            return False
+
+        def draw(self, surface):
+            pass
+
+    class _NullTracer:
+        enabled = False
+
+        def now(self):
+            return 0
+
+        def record(self, name, start, end=None):
+            pass
+
+        def enable(self, path=None, dump_at_exit=True):
+            pass
+
+        def dump_snapshot(self):
+            return None
+
+    tracer = _NullTracer()
+
+    def traced(name=None):
+        return name if callable(name) else (lambda fn: fn)
+
+    class GcPauseManager:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def install(self):
+            pass
+
+        def settle(self):
+            pass
+
+        def begin_frame(self):
+            pass
+
+        def end_frame(self, label=""):
+            pass
+
+    class OPTIONS:
+        trace = None
+        profile = None
+        draw_stats = None
+        hitch_log = None
+        no_gc_tune = False
+        record = None
+        replay = None
+        seed = None
+        headless = False
+        render_size = None
+        display = ()
+        no_idle = False
+
+    class TaskScheduler:
+        pending = 0
+
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def submit(self, gen, priority=10, name=None, on_done=None):
+            return None
+
+        def begin_frame(self):
+            pass
+
+        def run(self):
+            return 0.0
+
+    class view:
+        """按 1:1 画：直接用 pygame 自己的函数"""
+        draw = pygame.draw
+        Surface = pygame.Surface
+        font = pygame.font.Font
+        blit = staticmethod(pygame.Surface.blit)
+        rect = staticmethod(pygame.Surface.get_rect)
+        smoothscale = staticmethod(pygame.transform.smoothscale)
+
+    class display:
+        """不做格式转换，窗口就是画布"""
+        @staticmethod
+        def open_window(logical, render=None, flags=()):
+            window = pygame.display.set_mode(logical)
+            return window, window
+
+        @staticmethod
+        def convert(surf, alpha=None):
+            return surf
+
+        @staticmethod
+        def cache(mapping, alpha=None):
+            return mapping
+
+        @staticmethod
+        def to_logical(pos):
+            return pos
+
+        @staticmethod
+        def logical_events(events):
+            return events
+
+        @staticmethod
+        def on_rescale(callback):
+            return callback
+
+        @staticmethod
+        def settle():
+            return False
+
+        @staticmethod
+        def present(window, surface):
+            pass
+
+    class IdleThrottle:
+        """一直全速"""
+        paused = False
+        visible = True
+
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def events(self):
+            return pygame.event.get()
+
+        def wait(self, clock, fps, animating, ambient=False):
+            return clock.tick(fps)
+
+    def seed_rng(value=None):
+        random.seed(value)
+        return value
+
+    def rng_stream(name):
+        return random
+
 # ================================
 # 常量与配置
 # ================================
 SCREEN_W, SCREEN_H = 1440, 900
 FPS = 60
 TIME_LIMIT = 10  # 每个垃圾 10 秒
+GAME_ID = "sort"  # 输入录像里的游戏标识
 
 STATE_MENU = "menu"
 STATE_HELP = "help"
@@ -69,6 +239,9 @@ TRASH_ITEMS = [
     ("牙刷", CAT_OTHER, "🪥"), ("拖把头", CAT_OTHER, "🧹"),
 ]
 
+# 打乱垃圾顺序用的随机数流（由 --seed / 录像里的种子决定）
+_item_rng = rng_stream("items")
+
 # ================================
 # 工具函数
 # ================================
@@ -83,19 +256,20 @@ def get_font(size):
     for p in paths:
         if os.path.exists(p):
             try:
-                return pygame.font.Font(p, size)
+                return view.font(p, size)
             except Exception:
                 pass
-    return pygame.font.Font(None, size)
+    return view.font(None, size)
 
 
 def draw_text(surface, text, font, color, center):
     surf = font.render(text, True, color)
-    rect = surf.get_rect(center=center)
-    surface.blit(surf, rect)
+    rect = view.rect(surf, center=center)
+    view.blit(surface, surf, rect)
     return rect
 
 
+@traced
 def draw_gradient(surface, top, bottom):
     for y in range(SCREEN_H):
         ratio = y / SCREEN_H
@@ -104,19 +278,19 @@ def draw_gradient(surface, top, bottom):
             int(top[1] * (1 - ratio) + bottom[1] * ratio),
             int(top[2] * (1 - ratio) + bottom[2] * ratio),
         )
-        pygame.draw.line(surface, color, (0, y), (SCREEN_W, y))
+        view.draw.line(surface, color, (0, y), (SCREEN_W, y))
 
 
 def rounded_rect(surface, rect, color, radius=20, alpha=255):
-    temp = pygame.Surface(rect.size, pygame.SRCALPHA)
-    pygame.draw.rect(temp, (*color, alpha), temp.get_rect(), border_radius=radius)
-    surface.blit(temp, rect.topleft)
+    temp = view.Surface(rect.size, pygame.SRCALPHA)
+    view.draw.rect(temp, (*color, alpha), view.rect(temp), border_radius=radius)
+    view.blit(surface, temp, rect.topleft)
 
 
 def draw_button(surface, rect, label, font, base_color, hover=False):
     color = tuple(min(255, c + 20) for c in base_color) if hover else base_color
     rounded_rect(surface, rect, color, 28)
-    pygame.draw.rect(surface, (255, 255, 255, 80), rect, 3, border_radius=28)
+    view.draw.rect(surface, (255, 255, 255, 80), rect, 3, border_radius=28)
     draw_text(surface, label, font, WHITE, rect.center)
 
 
@@ -127,14 +301,15 @@ def draw_star(surface, center, size, color):
         angle = math.radians(i * 36 - 90)
         r = size if i % 2 == 0 else size * 0.45
         points.append((cx + r * math.cos(angle), cy + r * math.sin(angle)))
-    pygame.draw.polygon(surface, color, points)
+    view.draw.polygon(surface, color, points)
 
 
 # ================================
 # Emoji 渲染（Pillow → pygame Surface）
 # ================================
 
-_emoji_cache = {}
+# 已转成屏幕格式（Pillow 出来的是 RGBA 字节序，不转的话每次 blit 都要换格式）
+_emoji_cache = display.cache({}, alpha=True)
 
 # Apple Color Emoji 只支持特定尺寸，用不支持的尺寸会渲染成灰色方块
 _APPLE_EMOJI_SIZES = [160, 96, 64, 52, 48, 40, 32, 26, 20]
@@ -166,7 +341,22 @@ def emoji_to_surface(emoji_char, size=80):
     key = (emoji_char, size)
     if key in _emoji_cache:
         return _emoji_cache[key]
+    surf = display.convert(_render_emoji(emoji_char, size), alpha=True)
+    _emoji_cache[key] = surf
+    return surf
+
 
+def warm_item_icons(items):
+    """生成器：按出场顺序预先栅格化 emoji，每个一块（由 TaskScheduler 在空闲时推进）"""
+    for item in items:
+        if item.emoji:
+            emoji_to_surface(item.emoji, item.radius * 2)
+        yield
+
+
+@traced("emoji_to_surface")
+def _render_emoji(emoji_char, size):
+    """真正渲染一次 emoji（缓存未命中时才调用）"""
     if HAS_PIL and _EMOJI_FONT_PATH:
         try:
             render_size = _best_emoji_render_size(size)
@@ -180,25 +370,21 @@ def emoji_to_surface(emoji_char, size=80):
                 img = img.crop(bbox)
             raw = img.tobytes()
             surf = pygame.image.fromstring(raw, img.size, "RGBA")
-            surf = pygame.transform.smoothscale(surf, (size, size))
-            _emoji_cache[key] = surf
-            return surf
+            return view.smoothscale(surf, (size, size))
         except Exception:
             pass
 
     # 回退：用中文字体渲染 emoji 文字
     fallback_font = get_font(size)
-    surf = fallback_font.render(emoji_char, True, (80, 80, 80))
-    _emoji_cache[key] = surf
-    return surf
+    return fallback_font.render(emoji_char, True, (80, 80, 80))
 
 
 def draw_item_icon(surface, center, size, category, seed, emoji_char=None):
     """绘制物品图标：优先用 emoji，回退用几何图形"""
     if emoji_char:
         emoji_surf = emoji_to_surface(emoji_char, size * 2)
-        rect = emoji_surf.get_rect(center=center)
-        surface.blit(emoji_surf, rect)
+        rect = view.rect(emoji_surf, center=center)
+        view.blit(surface, emoji_surf, rect)
         return
 
     # 回退：原来的几何图标
@@ -206,21 +392,20 @@ def draw_item_icon(surface, center, size, category, seed, emoji_char=None):
     base = CATEGORY_STYLES[category]
     shade = (min(255, base[0] + 40), min(255, base[1] + 40), min(255, base[2] + 40))
     r = size
-    random.seed(seed)
     if category == CAT_RECY:
-        pygame.draw.circle(surface, base, center, r)
-        pygame.draw.circle(surface, shade, center, r - 8)
-        pygame.draw.rect(surface, WHITE, (x - 6, y - 18, 12, 36), border_radius=6)
+        view.draw.circle(surface, base, center, r)
+        view.draw.circle(surface, shade, center, r - 8)
+        view.draw.rect(surface, WHITE, (x - 6, y - 18, 12, 36), border_radius=6)
     elif category == CAT_KITCHEN:
-        pygame.draw.ellipse(surface, base, (x - r, y - r + 4, r * 2, r * 2 - 8))
-        pygame.draw.circle(surface, shade, (x - 8, y - 6), 6)
-        pygame.draw.circle(surface, shade, (x + 10, y + 4), 5)
+        view.draw.ellipse(surface, base, (x - r, y - r + 4, r * 2, r * 2 - 8))
+        view.draw.circle(surface, shade, (x - 8, y - 6), 6)
+        view.draw.circle(surface, shade, (x + 10, y + 4), 5)
     elif category == CAT_HAZ:
-        pygame.draw.circle(surface, base, center, r)
-        pygame.draw.circle(surface, WHITE, center, r - 8)
-        pygame.draw.circle(surface, base, center, r - 14)
+        view.draw.circle(surface, base, center, r)
+        view.draw.circle(surface, WHITE, center, r - 8)
+        view.draw.circle(surface, base, center, r - 14)
     else:
-        pygame.draw.rect(surface, base, (x - r, y - r, r * 2, r * 2), border_radius=12)
+        view.draw.rect(surface, base, (x - r, y - r, r * 2, r * 2), border_radius=12)
         draw_star(surface, (x, y), r // 2, shade)
 
 
@@ -284,15 +469,58 @@ class TrashItem:
 
 class Game:
     def __init__(self):
+        if OPTIONS.trace:
+            tracer.enable(OPTIONS.trace)
+        # --replay：种子和输入都来自录像；否则按 --seed（或随机）播种，--record 时录下来
+        self.recorder = None
+        self.replayer = None
+        if OPTIONS.replay:
+            self.replayer = InputReplayer(OPTIONS.replay, GAME_ID)
+            seed_rng(self.replayer.seed)
+        else:
+            seed = seed_rng(OPTIONS.seed)
+            if OPTIONS.record:
+                self.recorder = InputRecorder(OPTIONS.record, GAME_ID, seed, FPS)
+        # 游戏时钟：累加每帧耗时（回放时用录像里的耗时），倒计时按它算
+        self.now_ms = 0
+        self._frame_ms = 0
+        # 自对弈等批量无窗口运行时关掉绘制，只跑逻辑
+        self.render = True
+        # --headless：不开窗口、不出声音
+        if OPTIONS.headless:
+            os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+            os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
         pygame.init()
-        self.screen = pygame.display.set_mode((SCREEN_W, SCREEN_H))
+        # --render-size：画在较小的画布上，每帧放大一次贴到窗口（见 scripts/view.py）；
+        # --display：SCALED / vsync / 双缓冲；窗口可以拖动改大小（见 scripts/display.py）
+        self.window, self.screen = display.open_window(
+            (SCREEN_W, SCREEN_H), OPTIONS.render_size, OPTIONS.display)
         pygame.display.set_caption("垃圾分类小能手")
         self.clock = pygame.time.Clock()
-
-        self.font_title = get_font(72)
-        self.font_big = get_font(40)
-        self.font_mid = get_font(30)
-        self.font_small = get_font(24)
+        # F3 帧性能浮层
+        self.profiler = FrameProfiler()
+        # --profile：后台采样，栈按当前状态分组
+        self.sampler = None
+        if OPTIONS.profile:
+            self.sampler = SamplingProfiler(OPTIONS.profile_hz,
+                                            state_fn=lambda: self.state)
+            self.sampler.start(OPTIONS.profile)
+        # --draw-stats：逐帧计数 Surface 分配与绘制调用，显示在 F3 浮层里
+        if OPTIONS.draw_stats:
+            self.profiler.counters = DrawStats()
+            self.profiler.counters.install(OPTIONS.draw_stats)
+
+        self._load_fonts()
+
+        # 协作式后台任务：每帧 flip 之后用剩余预算推进（emoji 预热）
+        self.tasks = TaskScheduler(1000 / FPS)
+        self._icon_task = None
+        # 改窗口大小：画布比例变了时重开字体、重新栅格化 emoji（见 scripts/display.py）
+        display.on_rescale(self._rescaled)
+        # 空闲降频：菜单 / 帮助 / 结算画面不会自己动，没人操作时阻塞等输入；
+        # 窗口最小化或失焦时也不画，游戏中失焦暂停倒计时（见 scripts/idle.py）
+        self.idle = IdleThrottle(
+            enabled=not (OPTIONS.no_idle or OPTIONS.replay or OPTIONS.headless))
 
         self.state = STATE_MENU
         self.bins = make_bins()
@@ -304,16 +532,44 @@ class Game:
         self.btn_retry = pygame.Rect(SCREEN_W // 2 - 180, 560, 360, 70)
         self.btn_menu = pygame.Rect(SCREEN_W // 2 - 180, 650, 360, 70)
 
+        # GC 停顿管理：启动对象建好后冻结，完整回收只在切换画面和空闲帧里做
+        self.gc_pause = GcPauseManager(1000 / FPS, OPTIONS.hitch_log,
+                                       tune=not OPTIONS.no_gc_tune)
+        self.gc_pause.install()
+        if HAS_DEVTOOLS:
+            self.profiler.status.append(self.gc_pause.status)
+
+    def _load_fonts(self):
+        self.font_title = get_font(72)
+        self.font_big = get_font(40)
+        self.font_mid = get_font(30)
+        self.font_small = get_font(24)
+
+    def _warm_icons(self):
+        """按当前出场顺序预热 emoji；旧的预热任务作废"""
+        if self._icon_task is not None:
+            self._icon_task.cancel()
+        self._icon_task = self.tasks.submit(warm_item_icons(self.items),
+                                            priority=5, name="item-icons")
+
+    def _rescaled(self):
+        # 字号和 emoji 都按画布比例栅格化，旧的用不上了
+        self._load_fonts()
+        _emoji_cache.clear()
+        self._warm_icons()
+
     def reset_game(self):
         items = [TrashItem(n, c, i, e) for i, (n, c, e) in enumerate(TRASH_ITEMS)]
-        random.shuffle(items)
+        _item_rng.shuffle(items)
         self.items = items
+        # 新的出场顺序：按新顺序重新排预热
+        self._warm_icons()
         self.current_idx = 0
         self.score = 0
         self.correct = 0
         self.message = ""
         self.msg_timer = 0
-        self.start_item_time = pygame.time.get_ticks()
+        self.start_item_time = self.now_ms
 
     def current_item(self):
         if self.current_idx >= len(self.items):
@@ -324,7 +580,7 @@ class Game:
         self.current_idx += 1
         if self.current_idx < len(self.items):
             self.items[self.current_idx].reset_position()
-            self.start_item_time = pygame.time.get_ticks()
+            self.start_item_time = self.now_ms
 
     def add_message(self, text, ok=True):
         self.message = text
@@ -336,9 +592,10 @@ class Game:
             self.score = max(0, self.score - 1)
 
     def time_left(self):
-        elapsed = (pygame.time.get_ticks() - self.start_item_time) / 1000
+        elapsed = (self.now_ms - self.start_item_time) / 1000
         return max(0, TIME_LIMIT - elapsed)
 
+    @traced
     def draw_hud(self):
         rounded_rect(self.screen, pygame.Rect(40, 20, 360, 60), (255, 255, 255), 20, 200)
         draw_text(self.screen, f"得分：{self.score}", self.font_mid, DARK, (160, 50))
@@ -346,14 +603,16 @@ class Game:
         rounded_rect(self.screen, pygame.Rect(SCREEN_W - 240, 20, 200, 60), (255, 255, 255), 20, 200)
         draw_text(self.screen, f"倒计时：{t_left:.1f}s", self.font_small, DARK, (SCREEN_W - 140, 50))
 
+    @traced
     def draw_bins(self):
         for b in self.bins:
             rect = b["rect"]
             rounded_rect(self.screen, rect, b["color"], 26, 230)
-            pygame.draw.rect(self.screen, WHITE, rect, 3, border_radius=26)
+            view.draw.rect(self.screen, WHITE, rect, 3, border_radius=26)
             draw_text(self.screen, b["cat"], self.font_small, WHITE, rect.center)
             draw_star(self.screen, (rect.centerx, rect.top + 20), 10, WHITE)
 
+    @traced
     def draw_top_panel(self, item):
         panel = pygame.Rect(120, 90, SCREEN_W - 240, 180)
         rounded_rect(self.screen, panel, (255, 255, 255), 28, 220)
@@ -374,6 +633,7 @@ class Game:
         if not dropped:
             item.reset_position()
 
+    @traced
     def update_game(self, events):
         item = self.current_item()
         if item is None:
@@ -397,12 +657,20 @@ class Game:
         if self.msg_timer > 0:
             self.msg_timer -= 1
 
+    @traced
     def draw_message(self):
         if self.msg_timer > 0:
             color = (100, 200, 120) if "+" in self.message else (255, 120, 120)
             rounded_rect(self.screen, pygame.Rect(SCREEN_W // 2 - 140, 300, 280, 48), color, 20, 200)
             draw_text(self.screen, self.message, self.font_small, WHITE, (SCREEN_W // 2, 324))
 
+    def draw_paused(self):
+        rounded_rect(self.screen, pygame.Rect(0, 0, SCREEN_W, SCREEN_H), (0, 0, 0), 0, 110)
+        rounded_rect(self.screen, pygame.Rect(SCREEN_W // 2 - 240, SCREEN_H // 2 - 80, 480, 160), WHITE, 28, 240)
+        draw_text(self.screen, "已暂停", self.font_big, DARK, (SCREEN_W // 2, SCREEN_H // 2 - 22))
+        draw_text(self.screen, "点回游戏窗口继续", self.font_small, MUTED, (SCREEN_W // 2, SCREEN_H // 2 + 36))
+
+    @traced
     def draw_menu(self, mouse_pos):
         draw_gradient(self.screen, COLOR_BG_TOP, COLOR_BG_BOTTOM)
         draw_text(self.screen, "垃圾分类小能手", self.font_title, (60, 140, 230), (SCREEN_W // 2, 220))
@@ -415,6 +683,7 @@ class Game:
         draw_button(self.screen, self.btn_start, "开始游戏", self.font_mid, (90, 180, 255), self.btn_start.collidepoint(mouse_pos))
         draw_button(self.screen, self.btn_help, "游戏帮助", self.font_mid, (120, 210, 120), self.btn_help.collidepoint(mouse_pos))
 
+    @traced
     def draw_help(self, mouse_pos):
         draw_gradient(self.screen, COLOR_BG_TOP, COLOR_BG_BOTTOM)
         rounded_rect(self.screen, pygame.Rect(120, 120, SCREEN_W - 240, 600), WHITE, 28, 230)
@@ -431,6 +700,7 @@ class Game:
             y += 60
         draw_button(self.screen, self.btn_back, "返回", self.font_mid, (90, 180, 255), self.btn_back.collidepoint(mouse_pos))
 
+    @traced
     def draw_result(self, mouse_pos):
         draw_gradient(self.screen, (240, 245, 255), (255, 250, 240))
         rounded_rect(self.screen, pygame.Rect(200, 160, SCREEN_W - 400, 520), WHITE, 28, 230)
@@ -442,54 +712,134 @@ class Game:
         draw_button(self.screen, self.btn_menu, "返回菜单", self.font_mid, (90, 180, 255), self.btn_menu.collidepoint(mouse_pos))
 
     def run(self):
-        while True:
-            mouse_pos = pygame.mouse.get_pos()
-            events = pygame.event.get()
-            for e in events:
-                if e.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-                if e.type == pygame.KEYDOWN and e.key == pygame.K_ESCAPE:
-                    if self.state == STATE_PLAY:
-                        self.state = STATE_MENU
-
-            if self.state == STATE_MENU:
-                if any(e.type == pygame.MOUSEBUTTONDOWN and e.button == 1 for e in events):
-                    if self.btn_start.collidepoint(mouse_pos):
-                        self.reset_game()
-                        self.state = STATE_PLAY
-                    elif self.btn_help.collidepoint(mouse_pos):
-                        self.state = STATE_HELP
+        while self.step():
+            pass
+        pygame.quit()
+        sys.exit()
+
+    def step(self, events=None, mouse_pos=None, dt_ms=None, fps=FPS):
+        """
+        跑一帧，返回 False 表示退出。
+        events / mouse_pos 为空时读实时输入（--replay 时读录像）；
+        dt_ms 是上一帧的耗时，用来推进倒计时，为空时取上一次 clock.tick 的结果。
+        """
+        prof = self.profiler
+        prof.begin_frame()
+        self.gc_pause.begin_frame()
+        self.tasks.begin_frame()
+        frame_start = tracer.now()
+        if events is None and self.replayer is not None:
+            frame = self.replayer.next_frame()
+            if frame is None:
+                print(f"{self.replayer.summary()}，得分 {self.score}")
+                return False
+            dt_ms, events, mouse_pos, _ = frame
+            fps = 0
+        live = events is None
+        if mouse_pos is None:
+            mouse_pos = display.to_logical(pygame.mouse.get_pos())
+        if live:
+            events = display.logical_events(self.idle.events())
+        if dt_ms is None:
+            dt_ms = self._frame_ms
+        paused = live and self.idle.paused and self.state == STATE_PLAY
+        if paused:
+            # 失焦暂停：只认退出，倒计时不走，这一帧也不录
+            events = [e for e in events if e.type == pygame.QUIT]
+            dt_ms = 0
+        if self.recorder is not None and not paused:
+            self.recorder.record_frame(dt_ms, events, mouse_pos, None)
+        self.now_ms += dt_ms
+        last_state = self.state
+        for e in events:
+            if e.type == pygame.QUIT:
+                return False
+            prof.handle_event(e)
+            if e.type == pygame.KEYDOWN and e.key == pygame.K_F4:
+                # F4：未开启时开始追踪，已开启时导出一份快照
+                if tracer.enabled:
+                    print(f"追踪已写入 {tracer.dump_snapshot()}")
+                else:
+                    tracer.enable()
+            if e.type == pygame.KEYDOWN and e.key == pygame.K_ESCAPE:
+                if self.state == STATE_PLAY:
+                    self.state = STATE_MENU
+        prof.lap("input")
+
+        # 窗口最小化时不用画
+        drawing = self.render and (not live or self.idle.visible)
+        if self.state == STATE_MENU:
+            if any(e.type == pygame.MOUSEBUTTONDOWN and e.button == 1 for e in events):
+                if self.btn_start.collidepoint(mouse_pos):
+                    self.reset_game()
+                    self.state = STATE_PLAY
+                elif self.btn_help.collidepoint(mouse_pos):
+                    self.state = STATE_HELP
+            if drawing:
                 self.draw_menu(mouse_pos)
 
-            elif self.state == STATE_HELP:
-                if any(e.type == pygame.MOUSEBUTTONDOWN and e.button == 1 for e in events):
-                    if self.btn_back.collidepoint(mouse_pos):
-                        self.state = STATE_MENU
+        elif self.state == STATE_HELP:
+            if any(e.type == pygame.MOUSEBUTTONDOWN and e.button == 1 for e in events):
+                if self.btn_back.collidepoint(mouse_pos):
+                    self.state = STATE_MENU
+            if drawing:
                 self.draw_help(mouse_pos)
 
-            elif self.state == STATE_PLAY:
+        elif self.state == STATE_PLAY:
+            if drawing:
                 draw_gradient(self.screen, COLOR_BG_TOP, COLOR_BG_BOTTOM)
+                prof.lap("ground")
                 item = self.current_item()
                 if item:
                     self.draw_top_panel(item)
                     item.draw(self.screen)
                 self.draw_bins()
+                prof.lap("objects")
                 self.draw_hud()
                 self.draw_message()
+                if paused:
+                    self.draw_paused()
+                prof.lap("hud")
+            if not paused:
                 self.update_game(events)
-
-            elif self.state == STATE_RESULT:
-                if any(e.type == pygame.MOUSEBUTTONDOWN and e.button == 1 for e in events):
-                    if self.btn_retry.collidepoint(mouse_pos):
-                        self.reset_game()
-                        self.state = STATE_PLAY
-                    elif self.btn_menu.collidepoint(mouse_pos):
-                        self.state = STATE_MENU
+            prof.lap("update")
+
+        elif self.state == STATE_RESULT:
+            if any(e.type == pygame.MOUSEBUTTONDOWN and e.button == 1 for e in events):
+                if self.btn_retry.collidepoint(mouse_pos):
+                    self.reset_game()
+                    self.state = STATE_PLAY
+                elif self.btn_menu.collidepoint(mouse_pos):
+                    self.state = STATE_MENU
+            if drawing:
                 self.draw_result(mouse_pos)
-
+        prof.lap("ui")
+
+        if drawing:
+            if display.settle():
+                self.window, self.screen = display.window, display.screen
+            display.present(self.window, self.screen)
+            prof.draw(self.window)
+            prof.lap("overlay")
             pygame.display.flip()
-            self.clock.tick(FPS)
+            prof.lap("flip")
+        if self.render:
+            self.tasks.run()
+            prof.lap("tasks")
+        if self.state != last_state:
+            self.gc_pause.settle()
+        self.gc_pause.end_frame(self.state)
+        if live:
+            animating = (self.state == STATE_PLAY and not paused
+                         or self.profiler.enabled or self.tasks.pending > 0)
+            self._frame_ms = self.idle.wait(self.clock, fps, animating)
+            if paused:
+                self._frame_ms = 0  # 暂停期间的等待不算进恢复后第一帧的倒计时
+        else:
+            self._frame_ms = self.clock.tick(fps)
+        prof.lap("wait")
+        tracer.record("frame", frame_start)
+        return True
 
 
 if __name__ == "__main__":
@@ -0,0 +1,299 @@
+"""
+bench_micro.py —— 绘制开销微基准
+包含：gfx.py 每个绘图函数、items.py 每种物体的 draw()、Duck.draw、
+GameWorld.draw_hud、根目录 main.py 的 draw_item_icon、
+缓存贴图转成屏幕格式前后的 blit（见 display.py）
+
+无窗口运行（SDL dummy 驱动），对每一项报告：
+  每秒调用次数、每次调用新建的 Surface 数、每次调用的 Python 内存峰值
+结果可以保存成 JSON 基线，下次运行时对比。
+
+用法：
+  python bench_micro.py                      # 跑全部并打印
+  python bench_micro.py --save base.json     # 保存基线
+  python bench_micro.py --compare base.json  # 与基线对比
+  python bench_micro.py --filter items.      # 只跑名字含 items. 的项
+"""
+
+import os
+import io
+import json
+import time
+import argparse
+import platform
+import tracemalloc
+import importlib.util
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+pygame.init()
+pygame.display.set_mode((1440, 900))
+
+import gfx
+import items
+import display
+from items import (
+    Particle, ParticleSystem, Trash, TrashBin, Faucet, Puddle,
+    SeedlingPile, PlantSpot, Lumberjack, Decoration,
+)
+from player import Duck
+from level import GameWorld
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_ROOT_MAIN = os.path.join(os.path.dirname(_HERE), "main.py")
+
+
+def _load_sorter():
+    """以独立模块名导入根目录的垃圾分类单文件版（避免和本目录 main.py 重名）"""
+    spec = importlib.util.spec_from_file_location("sorter_main", _ROOT_MAIN)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# ============================================================
+#  计数：临时替换 pygame.Surface 统计新建次数
+# ============================================================
+class _SurfaceCounter:
+    def __init__(self):
+        self.count = 0
+        self._real = pygame.Surface
+
+    def __enter__(self):
+        real = self._real
+
+        def counting_surface(*args, **kwargs):
+            self.count += 1
+            return real(*args, **kwargs)
+
+        pygame.Surface = counting_surface
+        return self
+
+    def __exit__(self, *exc):
+        pygame.Surface = self._real
+        return False
+
+
+# ============================================================
+#  基准项
+# ============================================================
+def build_cases():
+    """返回 [(名称, 无参函数)]"""
+    screen = pygame.Surface((1440, 900))
+    font = items._get_font(24)
+    cases = []
+
+    def add(name, fn):
+        cases.append((name, fn))
+
+    # ---- gfx.py ----
+    rect = pygame.Rect(400, 300, 240, 120)
+    add("gfx.draw_shadow", lambda: gfx.draw_shadow(screen, rect))
+    add("gfx.draw_circle_shadow",
+        lambda: gfx.draw_circle_shadow(screen, 500, 400, 30))
+    add("gfx.draw_rounded_card",
+        lambda: gfx.draw_rounded_card(screen, rect, gfx.NEAR_WHITE, 16))
+    add("gfx.draw_pill_badge",
+        lambda: gfx.draw_pill_badge(screen, 500, 400, "第一关", font, gfx.BLUE))
+    add("gfx.draw_gradient_v[card]",
+        lambda: gfx.draw_gradient_v(screen, rect, gfx.WHITE, gfx.SOFT_BLUE))
+    add("gfx.draw_gradient_v[screen]",
+        lambda: gfx.draw_gradient_v(screen, (0, 0, 1440, 900),
+                                    gfx.WHITE, gfx.SOFT_BLUE))
+    add("gfx.draw_soft_circle",
+        lambda: gfx.draw_soft_circle(screen, 500, 400, 20, gfx.GREEN))
+    add("gfx.draw_soft_ellipse",
+        lambda: gfx.draw_soft_ellipse(screen, (480, 390, 48, 20), gfx.EARTH))
+    add("gfx.lerp_color", lambda: gfx.lerp_color(gfx.RED, gfx.BLUE, 0.3))
+    add("gfx.ease_out_quad", lambda: gfx.ease_out_quad(0.3))
+    add("gfx.draw_progress_bar",
+        lambda: gfx.draw_progress_bar(screen, 350, 42, 300, 16, 0.6))
+
+    # ---- items.py ----
+    particle = Particle(500, 400, (255, 80, 80))
+    add("items.Particle.draw", lambda: particle.draw(screen))
+    system = ParticleSystem()
+    system.emit(500, 400, (100, 255, 100), 20)
+    add("items.ParticleSystem.draw[20]", lambda: system.draw(screen))
+    for cat in items.TRASH_DATA:
+        trash = Trash(500, 400, cat)
+        add(f"items.Trash.draw[{cat}]", lambda trash=trash: trash.draw(screen))
+    trash_bin = TrashBin(500, 400, "recyclable")
+    add("items.TrashBin.draw", lambda: trash_bin.draw(screen))
+    faucet_open = Faucet(500, 400)
+    for _ in range(40):
+        faucet_open.update()
+    add("items.Faucet.draw[open]", lambda: faucet_open.draw(screen))
+    faucet_closed = Faucet(500, 400)
+    faucet_closed.close()
+    add("items.Faucet.draw[closed]", lambda: faucet_closed.draw(screen))
+    puddle = Puddle(500, 400)
+    add("items.Puddle.draw", lambda: puddle.draw(screen))
+    pile = SeedlingPile(500, 400)
+    add("items.SeedlingPile.draw", lambda: pile.draw(screen))
+    spot = PlantSpot(500, 400)
+    add("items.PlantSpot.draw[empty]", lambda: spot.draw(screen))
+    tree = PlantSpot(500, 400)
+    tree.plant()
+    for _ in range(60):
+        tree.update()
+    add("items.PlantSpot.draw[planted]", lambda: tree.draw(screen))
+    lumberjack = Lumberjack(500, 400, 170, 1270)
+    add("items.Lumberjack.draw", lambda: lumberjack.draw(screen))
+    for deco_type in ["desk", "chair", "slide", "swing", "track_cone", "sink",
+                      "tree", "bush", "fence", "grass", "flower", "bench"]:
+        deco = Decoration(500, 400, deco_type)
+        add(f"items.Decoration.draw[{deco_type}]",
+            lambda deco=deco: deco.draw(screen))
+
+    # ---- player.py ----
+    duck = Duck()
+    add("player.Duck.draw", lambda: duck.draw(screen))
+    busy_duck = Duck()
+    busy_duck.pick_up("塑料瓶", "recyclable", "trash")
+    busy_duck.apply_slow(10 ** 9)
+    busy_duck.show_hint("拾取了 塑料瓶", 10 ** 9)
+    add("player.Duck.draw[carry+hint+slow]", lambda: busy_duck.draw(screen))
+
+    # ---- level.py ----
+    hud_font = items._get_font(38)
+    for level_id in (1, 2, 3):
+        world = GameWorld(level_id)
+        add(f"level.GameWorld.draw_hud[{level_id}]",
+            lambda world=world: world.draw_hud(screen, hud_font, 3))
+
+    # ---- 贴图：源格式和屏幕不同时每次 blit 都要换格式 ----
+    # 从 PNG 读进来的图是 24 位 RGB；emoji 经 Pillow fromstring 进来是 RGBA 字节序
+    ground = pygame.Surface((1440, 900))
+    gfx.draw_gradient_v(ground, (0, 0, 1440, 900), gfx.GRASS_LIGHT, gfx.GRASS)
+    buf = io.BytesIO()
+    pygame.image.save(ground, buf, "ground.png")
+    buf.seek(0)
+    ground_png = pygame.image.load(buf, "ground.png")
+    ground_converted = display.convert(ground_png, alpha=False)
+    add("blit.ground[png]", lambda: screen.blit(ground_png, (0, 0)))
+    add("blit.ground[converted]", lambda: screen.blit(ground_converted, (0, 0)))
+    icon = pygame.Surface((92, 92), pygame.SRCALPHA)
+    pygame.draw.circle(icon, (234, 67, 53, 200), (46, 46), 40)
+    icon_rgba = pygame.image.fromstring(pygame.image.tostring(icon, "RGBA"),
+                                        (92, 92), "RGBA")
+    icon_converted = display.convert(icon_rgba, alpha=True)
+    add("blit.emoji[rgba]", lambda: screen.blit(icon_rgba, (674, 214)))
+    add("blit.emoji[converted]", lambda: screen.blit(icon_converted, (674, 214)))
+
+    # ---- 根目录 main.py ----
+    sorter = _load_sorter()
+    add("sorter.draw_item_icon[emoji]",
+        lambda: sorter.draw_item_icon(screen, (720, 260), 46,
+                                      sorter.CAT_RECY, 0, "📦"))
+    for i, cat in enumerate(sorter.CATEGORIES):
+        add(f"sorter.draw_item_icon[{cat}]",
+            lambda cat=cat, i=i: sorter.draw_item_icon(
+                screen, (720, 260), 46, cat, i))
+
+    return cases
+
+
+# ============================================================
+#  计时
+# ============================================================
+def measure(fn, min_time):
+    fn()  # 预热：字体、emoji 等首调缓存
+    with _SurfaceCounter() as counter:
+        fn()
+    surfaces = counter.count
+
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1] - base
+    tracemalloc.stop()
+
+    calls = 0
+    batch = 1
+    start = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < min_time:
+        for _ in range(batch):
+            fn()
+        calls += batch
+        batch *= 2
+        elapsed = time.perf_counter() - start
+    return {
+        "calls_per_sec": calls / elapsed,
+        "us_per_call": elapsed / calls * 1e6,
+        "surfaces_per_call": surfaces,
+        "py_peak_bytes_per_call": peak,
+    }
+
+
+def run(cases, min_time, name_filter=None):
+    results = {}
+    for name, fn in cases:
+        if name_filter and name_filter not in name:
+            continue
+        results[name] = measure(fn, min_time)
+    return results
+
+
+# ============================================================
+#  输出
+# ============================================================
+def print_table(results, baseline=None):
+    header = f"{'benchmark':44s} {'calls/s':>12s} {'us/call':>9s} {'surf':>5s} {'py KiB':>8s}"
+    if baseline:
+        header += f" {'vs base':>9s}"
+    print(header)
+    print("-" * len(header))
+    for name, r in results.items():
+        line = (f"{name:44s} {r['calls_per_sec']:12.0f} {r['us_per_call']:9.2f} "
+                f"{r['surfaces_per_call']:5d} {r['py_peak_bytes_per_call'] / 1024:8.2f}")
+        if baseline:
+            old = baseline.get("results", {}).get(name)
+            if old:
+                change = r["calls_per_sec"] / old["calls_per_sec"] - 1
+                line += f" {change * 100:+8.1f}%"
+            else:
+                line += f" {'new':>9s}"
+        print(line)
+
+
+def save(results, path):
+    data = {
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "machine": platform.machine(),
+        "results": results,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="gfx / items 绘制开销微基准")
+    parser.add_argument("--min-time", type=float, default=0.2,
+                        help="每项至少计时多少秒")
+    parser.add_argument("--filter", default=None, help="只跑名字包含该字符串的项")
+    parser.add_argument("--save", default=None, help="把结果保存为 JSON 基线")
+    parser.add_argument("--compare", default=None, help="与某个 JSON 基线对比")
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    results = run(build_cases(), args.min_time, args.filter)
+    print_table(results, baseline)
+    if args.save:
+        save(results, args.save)
+        print(f"\n基线已保存到 {args.save}")
+
+
+if __name__ == "__main__":
+    main()
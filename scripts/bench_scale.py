@@ -0,0 +1,223 @@
+"""
+bench_scale.py —— GameWorld 规模伸缩基准
+包含：按数量合成第 1~3 关场景的生成器、逐项计时、CSV 伸缩曲线
+
+每一关按给定规模 N 生成场景（默认该关用到的每种物体各 N 个，外加 N 个粒子，
+可用 --kinds 指定参与伸缩的种类），
+分别测量：
+  update      GameWorld.update
+  draw        GameWorld.draw_objects
+  query       最近可交互物体 + 水坑 / 伐木工人碰撞 + 剩余计数
+  frame       一整帧：更新 + 地面 + 物体 + 粒子 + 小鸭 + HUD
+输出 CSV，每行带上"每个物体耗时"，便于看出哪一项在哪个规模开始偏离线性。
+
+用法：
+  python bench_scale.py                                # 默认 10 ~ 100000
+  python bench_scale.py --sizes 10,100,1000 --levels 2
+  python bench_scale.py --out scaling.csv --budget 1.0
+  python bench_scale.py --kinds trash,lumberjacks,particles
+"""
+
+import os
+import sys
+import csv
+import math
+import time
+import random
+import argparse
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+pygame.init()
+pygame.display.set_mode((1440, 900))
+
+from items import (
+    Particle, ParticleSystem, Trash, Faucet, Puddle, PlantSpot, Lumberjack,
+    TRASH_DATA, _get_font,
+)
+from player import Duck
+from level import GameWorld
+from rng import seed as seed_streams
+
+SCREEN_WIDTH, SCREEN_HEIGHT = 1440, 900
+DEFAULT_SIZES = [10, 100, 1000, 10000, 100000]
+
+# 每关会出现的物体种类
+LEVEL_KINDS = {
+    1: ("trash",),
+    2: ("faucets", "puddles"),
+    3: ("plant_spots", "lumberjacks"),
+}
+ALL_KINDS = ("trash", "faucets", "puddles", "plant_spots", "lumberjacks",
+             "particles")
+
+
+# ============================================================
+#  场景生成
+# ============================================================
+def _make_object(kind, x, y, store, rng):
+    if kind == "trash":
+        return Trash(x, y, rng.choice(list(TRASH_DATA)), store)
+    if kind == "faucets":
+        faucet = Faucet(x, y, store)
+        if rng.random() < 0.5:
+            faucet.close()
+        return faucet
+    if kind == "puddles":
+        return Puddle(x, y, store)
+    if kind == "plant_spots":
+        spot = PlantSpot(x, y, store)
+        if rng.random() < 0.5:
+            spot.plant()
+        return spot
+    if kind == "lumberjacks":
+        return Lumberjack(x, y, max(0, x - 150), min(SCREEN_WIDTH, x + 150),
+                          store)
+    raise ValueError(kind)
+
+
+def scatter(world, count, rng):
+    """
+    用关卡的泊松圆盘采样器摆放 count 个点；间距按密度自适应，
+    太挤采不满时剩下的点均匀随机补齐。
+    """
+    area = (40, 120, SCREEN_WIDTH - 80, SCREEN_HEIGHT - 160)
+    min_dist = max(2.0, 0.6 * math.sqrt(area[2] * area[3] / max(1, count)))
+    spawner = world.make_spawner(area, min_dist, margin=0)
+    points = spawner.sample(count, rng=rng, attempts=8)
+    while len(points) < count:
+        points.append((rng.randint(area[0], area[0] + area[2]),
+                       rng.randint(area[1], area[1] + area[3])))
+    return points
+
+
+def build_scene(level_id, counts, particles=0, seed=0):
+    """
+    生成一个合成场景。
+    counts: {"trash": N, "faucets": N, ...}
+    返回 (world, particle_system)
+    """
+    # 物体构造时从各自的随机数流里抽属性，一起固定
+    seed_streams(seed)
+    rng = random.Random(seed)
+    world = GameWorld(level_id, SCREEN_WIDTH, SCREEN_HEIGHT)
+    for kind, n in counts.items():
+        for x, y in scatter(world, n, rng):
+            world.objects.append(_make_object(kind, x, y, world.store, rng))
+
+    system = ParticleSystem()
+    for _ in range(particles):
+        p = Particle(rng.randint(0, SCREEN_WIDTH),
+                     rng.randint(80, SCREEN_HEIGHT), (255, 200, 80))
+        # 基准期间保持存活
+        p.life = p.max_life = 10 ** 9
+        system.particles.append(p)
+    return world, system
+
+
+# ============================================================
+#  计时
+# ============================================================
+def time_call(fn, budget, max_reps):
+    """至少跑 1 次，总时长不超过 budget（秒）或 max_reps 次；返回 (ms/次, 次数)"""
+    reps = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while reps < max_reps and (reps == 0 or elapsed < budget):
+        fn()
+        reps += 1
+        elapsed = time.perf_counter() - start
+    return elapsed / reps * 1000, reps
+
+
+def measure_scene(level_id, size, budget, max_reps, kinds=None):
+    if kinds is None:
+        kinds = LEVEL_KINDS[level_id] + ("particles",)
+    counts = {kind: size for kind in kinds if kind != "particles"}
+    particles = size if "particles" in kinds else 0
+    world, system = build_scene(level_id, counts, particles=particles)
+    duck = Duck(SCREEN_WIDTH, SCREEN_HEIGHT)
+    screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    hud_font = _get_font(38)
+    px, py = duck.x, duck.y
+    world.draw_ground(screen)  # 地面缓存不计入
+
+    def query():
+        world.get_nearest_interactable(px, py)
+        world.get_colliding_puddles(px, py)
+        world.get_colliding_lumberjacks(px, py)
+        world.count_remaining()
+
+    def frame():
+        world.update((px, py))
+        system.update()
+        world.draw_ground(screen)
+        world.draw_objects(screen)
+        system.draw(screen)
+        duck.draw(screen)
+        world.draw_hud(screen, hud_font, duck.lives)
+
+    n_objects = len(world.objects) + len(system.particles)
+    rows = []
+    for metric, fn in (("update", lambda: world.update((px, py))),
+                       ("draw", lambda: world.draw_objects(screen)),
+                       ("query", query),
+                       ("frame", frame)):
+        ms, reps = time_call(fn, budget, max_reps)
+        rows.append({
+            "level": level_id,
+            "size": size,
+            "objects": n_objects,
+            "metric": metric,
+            "ms_per_call": round(ms, 4),
+            "us_per_object": round(ms * 1000 / max(1, n_objects), 4),
+            "reps": reps,
+        })
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="GameWorld 规模伸缩基准")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="逗号分隔的规模列表")
+    parser.add_argument("--levels", default="1,2,3", help="逗号分隔的关卡号")
+    parser.add_argument("--budget", type=float, default=0.5,
+                        help="每项最多计时多少秒（至少跑一次）")
+    parser.add_argument("--max-reps", type=int, default=200)
+    parser.add_argument("--kinds", default=None,
+                        help="逗号分隔的物体种类（" + ",".join(ALL_KINDS)
+                             + "），默认按关卡选取")
+    parser.add_argument("--out", default=None, help="CSV 输出路径，默认打印到标准输出")
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    levels = [int(s) for s in args.levels.split(",") if s]
+    kinds = None
+    if args.kinds:
+        kinds = tuple(k for k in args.kinds.split(",") if k)
+        unknown = [k for k in kinds if k not in ALL_KINDS]
+        if unknown:
+            parser.error("未知的物体种类: " + ",".join(unknown))
+    fields = ["level", "size", "objects", "metric", "ms_per_call",
+              "us_per_object", "reps"]
+
+    out = open(args.out, "w", newline="", encoding="utf-8") if args.out else sys.stdout
+    try:
+        writer = csv.DictWriter(out, fieldnames=fields)
+        writer.writeheader()
+        for level_id in levels:
+            for size in sizes:
+                for row in measure_scene(level_id, size, args.budget,
+                                         args.max_reps, kinds):
+                    writer.writerow(row)
+                out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,309 @@
+"""
+bot.py —— 自动玩家
+包含：scripts/main.py 三关的寻路机器人（捡垃圾投对桶、关水龙头、种树并躲开伐木工人）、
+根目录 main.py 的拖拽分类机器人
+
+两个机器人都只"按键 / 点鼠标"：每帧返回要喂给 Game.step 的输入，
+不直接改游戏状态，所以打出来的局和真人操作走的是同一条路径，也可以录像回放。
+"""
+
+import math
+import random
+
+import numpy as np
+import pygame
+
+from flowfield import FlowField
+from items import (
+    Trash, TrashBin, Faucet, Puddle, SeedlingPile, PlantSpot, Lumberjack,
+)
+from replay import KeyState, TRACKED_KEYS
+
+
+_LEFT, _RIGHT, _UP, _DOWN = (1 << i for i in range(len(TRACKED_KEYS)))
+
+# 状态名与两个游戏里的 STATE_* 一致（不导入游戏模块：导入时就会开窗口）
+_MENU, _PLAYING, _LEVEL_UP, _WIN, _GAME_OVER = (
+    "menu", "playing", "level_up", "win", "game_over")
+_PLAY, _RESULT = "play", "result"
+
+
+def _click(pos):
+    return [pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=pos)]
+
+
+def _space():
+    return pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE,
+                              mod=0, unicode=" ", scancode=0)
+
+
+# ============================================================
+#  环保小鸭（scripts/main.py）
+# ============================================================
+class DuckBot:
+    """
+    每关按规则挑一个目标物体，沿流场绕开装饰物走过去，目标成为最近的
+    可交互物体时按空格。水坑（减速）和伐木工人（扣血）额外加一个排斥力。
+    mistakes: 第一关投错桶的概率，用来让分数有起伏
+    """
+
+    CELL = 20           # 寻路网格（比伐木工人用的流场细一些，贴近目标时不绕远）
+    DIRECT = 60         # 离目标这么近就直接朝目标走
+    # 要躲开的物体：(类型, 排斥半径, 力度)
+    HAZARDS = ((Lumberjack, 130, 2.0), (Puddle, 75, 1.0))
+    STUCK_FRAMES = 120  # 这么多帧没有靠近目标就换一个
+    BLACKLIST = 600     # 换掉的目标这么多帧内不再选
+    UI_DELAY = 30       # 结算 / 过关画面停留帧数再点按钮
+
+    def __init__(self, game, rng=None, mistakes=0.0):
+        self.game = game
+        self.rng = rng or random.Random()
+        self.mistakes = mistakes
+        self.frame = 0
+        self._world = None
+        self._field = None
+        self._foot = 0
+        self._target = None
+        self._wrong_bin = None
+        self._best = math.inf
+        self._best_frame = 0
+        self._blacklist = {}
+
+    # --------------------------------------------------
+    #  每帧输入
+    # --------------------------------------------------
+    def next_input(self):
+        """返回 (events, mouse_pos, keys)"""
+        game = self.game
+        self.frame += 1
+        state = game.state
+        if state == _MENU:
+            pos = game.btn_start.rect.center
+            return _click(pos), pos, KeyState()
+        if state in (_LEVEL_UP, _WIN, _GAME_OVER):
+            button = game.btn_next if state == _LEVEL_UP else game.btn_menu
+            pos = button.rect.center
+            if game.result_timer > self.UI_DELAY:
+                return _click(pos), pos, KeyState()
+            return [], pos, KeyState()
+        if state == _PLAYING and game.world is not None:
+            return self._play()
+        return [], (0, 0), KeyState()
+
+    def _play(self):
+        game = self.game
+        world, duck = game.world, game.duck
+        if world is not self._world:
+            self._enter_world(world)
+        target = self._choose_target()
+        if target is not self._target:
+            self._target = target
+            self._best = math.inf
+            self._best_frame = self.frame
+        if target is None:
+            return [], (0, 0), KeyState(self._avoid_mask())
+
+        dist = target.distance_to(duck.x, duck.y)
+        if dist < self._best - 2:
+            self._best = dist
+            self._best_frame = self.frame
+        elif self.frame - self._best_frame > self.STUCK_FRAMES:
+            self._blacklist[id(target)] = self.frame + self.BLACKLIST
+            self._target = None
+            return [], (0, 0), KeyState()
+
+        events = []
+        if (game.space_cooldown == 0
+                and world.get_nearest_interactable(duck.x, duck.y) is target):
+            events.append(_space())
+            self._wrong_bin = None
+        return events, (0, 0), KeyState(self._steer(target.x, target.y))
+
+    def _enter_world(self, world):
+        self._world = world
+        self._target = None
+        self._blacklist.clear()
+        collision = getattr(world, "collision", None)
+        if collision is not None:
+            self._field = FlowField(world.screen_width, world.screen_height,
+                                    collision, cell=self.CELL)
+            self._foot = collision.foot_offset
+        else:
+            self._field = None
+            self._foot = 0
+
+    # --------------------------------------------------
+    #  选目标
+    # --------------------------------------------------
+    def _choose_target(self):
+        game = self.game
+        duck = game.duck
+        level_id = game.level_manager.current_level
+        objects = [o for o in game.world.objects if o.active
+                   and self._blacklist.get(id(o), 0) < self.frame]
+        if level_id == 1:
+            if duck.carrying is None:
+                wanted = [o for o in objects if isinstance(o, Trash)]
+            else:
+                bins = [o for o in objects if isinstance(o, TrashBin)]
+                wanted = [o for o in bins if o.category == duck.carrying_category]
+                if self._wrong_bin is None and self.rng.random() < self.mistakes:
+                    self._wrong_bin = self.rng.choice(bins) if bins else None
+                if self._wrong_bin is not None:
+                    wanted = [self._wrong_bin]
+        elif level_id == 2:
+            wanted = [o for o in objects if isinstance(o, Faucet) and o.is_open]
+        else:
+            if duck.carrying is None:
+                wanted = [o for o in objects if isinstance(o, SeedlingPile)]
+            else:
+                wanted = [o for o in objects
+                          if isinstance(o, PlantSpot) and not o.planted]
+        if not wanted:
+            return None
+        # 已有目标还在候选里就继续走，避免两个距离差不多的目标之间来回摇摆
+        if self._target in wanted:
+            return self._target
+        return min(wanted, key=lambda o: o.distance_to(duck.x, duck.y))
+
+    # --------------------------------------------------
+    #  走路
+    # --------------------------------------------------
+    def _steer(self, tx, ty):
+        duck = self.game.duck
+        x, y = duck.x, duck.y
+        dx, dy = tx - x, ty - y
+        dist = math.hypot(dx, dy)
+        if dist < 4:
+            return self._avoid_mask()
+        if dist > self.DIRECT and self._field is not None:
+            # 流场建在脚底坐标上（和碰撞位图一致）
+            self._field.set_goals([(tx, ty + self._foot)])
+            fx, fy = self._field.directions(np.array([x]),
+                                            np.array([y + self._foot]))
+            if fx[0] or fy[0]:
+                dx, dy = float(fx[0]), float(fy[0])
+        length = math.hypot(dx, dy)
+        dx, dy = dx / length, dy / length
+        ax, ay = self._avoid_vector()
+        return self._mask(dx + ax, dy + ay)
+
+    def _avoid_vector(self):
+        duck = self.game.duck
+        ax = ay = 0.0
+        for obj in self.game.world.objects:
+            if not obj.active:
+                continue
+            for kind, radius, strength in self.HAZARDS:
+                if isinstance(obj, kind):
+                    break
+            else:
+                continue
+            ox, oy = duck.x - obj.x, duck.y - obj.y
+            d = math.hypot(ox, oy)
+            if 0 < d < radius:
+                push = strength * (radius - d) / radius
+                ax += ox / d * push
+                ay += oy / d * push
+        return ax, ay
+
+    def _avoid_mask(self):
+        return self._mask(*self._avoid_vector())
+
+    @staticmethod
+    def _mask(dx, dy, dead=0.35):
+        length = math.hypot(dx, dy)
+        if length < 1e-6:
+            return 0
+        dx, dy = dx / length, dy / length
+        mask = 0
+        if dx < -dead:
+            mask |= _LEFT
+        elif dx > dead:
+            mask |= _RIGHT
+        if dy < -dead:
+            mask |= _UP
+        elif dy > dead:
+            mask |= _DOWN
+        return mask
+
+
+# ============================================================
+#  垃圾分类（根目录 main.py）
+# ============================================================
+class SortBot:
+    """
+    对每个垃圾：想一会儿（think 帧）→ 按下 → 分几帧拖到桶上 → 松开。
+    mistakes: 拖错桶的概率
+    """
+
+    DRAG_FRAMES = 8
+    UI_DELAY = 20
+
+    def __init__(self, game, rng=None, mistakes=0.1, think=(10, 45)):
+        self.game = game
+        self.rng = rng or random.Random()
+        self.mistakes = mistakes
+        self.think = think
+        self._item = None
+        self._wait = 0
+        self._path = []
+        self._ui_wait = 0
+
+    def next_input(self):
+        """返回 (events, mouse_pos)"""
+        game = self.game
+        state = game.state
+        if state == _MENU:
+            return self._button(game.btn_start)
+        if state == _RESULT:
+            return self._button(game.btn_menu)
+        if state != _PLAY:
+            return self._button(game.btn_back)
+        self._ui_wait = 0
+
+        item = game.current_item()
+        if item is None:
+            return [], (0, 0)
+        if item is not self._item:
+            self._item = item
+            self._wait = self.rng.randint(*self.think)
+            self._path = []
+        if self._wait > 0:
+            self._wait -= 1
+            return [], (0, 0)
+
+        if not self._path:
+            start = (int(item.pos[0]), int(item.pos[1]))
+            self._path = self._plan(start, self._choose_bin(item).center)
+            return [pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1,
+                                       pos=start)], start
+        pos = self._path.pop(0)
+        if self._path:
+            return [pygame.event.Event(pygame.MOUSEMOTION, pos=pos, rel=(0, 0),
+                                       buttons=(1, 0, 0))], pos
+        return [pygame.event.Event(pygame.MOUSEMOTION, pos=pos, rel=(0, 0),
+                                   buttons=(1, 0, 0)),
+                pygame.event.Event(pygame.MOUSEBUTTONUP, button=1, pos=pos)], pos
+
+    def _button(self, rect):
+        self._ui_wait += 1
+        if self._ui_wait > self.UI_DELAY:
+            self._ui_wait = 0
+            return _click(rect.center), rect.center
+        return [], rect.center
+
+    def _choose_bin(self, item):
+        bins = self.game.bins
+        if self.rng.random() < self.mistakes:
+            return self.rng.choice(bins)["rect"]
+        for b in bins:
+            if b["cat"] == item.category:
+                return b["rect"]
+        return bins[0]["rect"]
+
+    def _plan(self, start, end):
+        n = self.DRAG_FRAMES
+        return [(round(start[0] + (end[0] - start[0]) * i / n),
+                 round(start[1] + (end[1] - start[1]) * i / n))
+                for i in range(1, n + 1)]
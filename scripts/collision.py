@@ -0,0 +1,65 @@
+"""
+collision.py —— 预烘焙的可行走区域
+包含：按关卡生成的碰撞位图、小鸭脚底探测点、按轴分离的滑动移动
+"""
+
+import pygame
+
+
+# 小鸭脚底的碰撞盒：宽、高、相对小鸭中心的向下偏移
+DUCK_FOOTPRINT = (40, 14, 30)
+
+
+class CollisionMap:
+    """
+    整个关卡一张 pygame.mask 位图。障碍登记时按脚底盒的大小向外膨胀，
+    之后判断小鸭能不能站在某处只需查询一个像素，和障碍物数量无关。
+    """
+
+    def __init__(self, width, height, footprint=DUCK_FOOTPRINT):
+        self.width = width
+        self.height = height
+        self.foot_w, self.foot_h, self.foot_offset = footprint
+        self.mask = pygame.mask.Mask((width, height))
+
+    def add_rect(self, rect):
+        """登记一个实心障碍（世界坐标）"""
+        r = pygame.Rect(rect).inflate(self.foot_w, self.foot_h)
+        r = r.clip(pygame.Rect(0, 0, self.width, self.height))
+        if r.width > 0 and r.height > 0:
+            self.mask.draw(pygame.mask.Mask(r.size, fill=True), r.topleft)
+
+    def blocked(self, x, y):
+        """小鸭中心在 (x, y) 时脚底是否压在障碍上"""
+        px = int(x)
+        py = int(y) + self.foot_offset
+        if px < 0 or py < 0 or px >= self.width or py >= self.height:
+            return False
+        return bool(self.mask.get_at((px, py)))
+
+    def slide(self, x, y, dx, dy):
+        """
+        从 (x, y) 移动 (dx, dy)：先走 x 轴再走 y 轴，被挡住的轴原地不动，
+        贴着障碍时仍能沿另一轴滑过去。起点已在障碍里时不拦截，方便脱困。
+        """
+        if self.blocked(x, y):
+            return x + dx, y + dy
+        nx = x + dx
+        if dx and self.blocked(nx, y):
+            nx = x
+        ny = y + dy
+        if dy and self.blocked(nx, ny):
+            ny = y
+        return nx, ny
+
+
+def bake_collision_map(width, height, decorations, walls=()):
+    """根据装饰物的实心占地和墙体生成碰撞位图"""
+    cmap = CollisionMap(width, height)
+    for deco in decorations:
+        rect = deco.footprint()
+        if rect is not None:
+            cmap.add_rect(rect)
+    for wall in walls:
+        cmap.add_rect(wall)
+    return cmap
@@ -0,0 +1,348 @@
+"""
+display.py —— 显示模式、窗口大小与像素格式
+包含：按配置选择显示标志（SCALED / vsync / 双缓冲）并开可缩放窗口、
+画布在窗口里的位置（等比缩放、居中留边）与鼠标坐标换算、
+改窗口大小后的防抖重建、缓存 Surface 登记表（转成显示格式，换显示模式后重转）
+
+游戏逻辑、关卡布局、按钮一律用逻辑坐标（1440x900，见 view.py），窗口多大都不变；
+窗口大小只决定画布的比例和它在窗口里的位置（viewport）：
+
+    window, screen = display.open_window((1440, 900), render_size, flags)
+    ...
+    if display.settle():                 # 每帧一次：窗口大小稳定后才重建
+        window, screen = display.window, display.screen
+    display.present(window, screen)      # 画布贴进窗口（必要时缩放、两侧留边）
+    mouse = display.to_logical(pygame.mouse.get_pos())
+
+桌面比 1440x900 小（1366x768、1280x720 的教室电脑）时，一开始就按桌面大小开窗口。
+拖动窗口边缘时每帧只把旧画布缩放贴进新窗口；大小停止变化 SETTLE_MS 后才
+按新比例重新配置画布，并且只在比例真的变了时通知 on_rescale() 登记的回调
+去丢掉和分辨率有关的缓存（字体、关卡地面、菜单底图、emoji、流水线画布）。
+画布最大按逻辑尺寸画，窗口更大时贴的时候放大。
+
+源格式和屏幕不同的 Surface 每次 blit 都要逐像素换格式：PNG 读进来是 24 位 RGB，
+Pillow 经 fromstring 进来的 emoji 是 RGBA 字节序，而屏幕是 32 位 XRGB。
+长期缓存的 Surface 在这里登记一次：
+
+    _emoji_cache = display.cache({}, alpha=True)      # 字典缓存
+    _emoji_cache[key] = display.convert(surf, alpha=True)
+    display.keep(self, "base")                         # 对象属性上的缓存
+    display.keep(self, "_ground_cache", sized=True)    # 和分辨率有关：换比例时置 None
+
+窗口已存在时立即转换；窗口还没建（或以后 set_mode 换了模式）时，
+set_mode() 之后统一转换一遍。格式已经和屏幕一致的 Surface 原样返回。
+
+显示标志（--display scaled,vsync,doublebuf，或环境变量 GHX_DISPLAY）：
+  scaled     交给 SDL 缩放窗口（拖动窗口大小也由 SDL 处理）；配合 --render-size 时
+             直接开画布大小的窗口，由 SDL 放大，省掉 present() 的一次整窗缩放
+  vsync      垂直同步（驱动不支持时退回不同步）
+  doublebuf  双缓冲
+"""
+
+import inspect
+import weakref
+
+import pygame
+
+import view
+
+
+SETTLE_MS = 250         # 窗口大小停止变化这么久才重建画布
+DESKTOP_MARGIN = (40, 100)  # 按桌面开窗口时给任务栏、标题栏留的空间
+BORDER_COLOR = (0, 0, 0)
+
+names = frozenset()     # 当前生效的显示标志
+generation = 0          # 每 set_mode 一次加一
+window = None
+screen = None           # 所有东西画上去的画布（比例为 1 且不留边时就是 window）
+
+_logical = (1440, 900)
+_render = None          # --render-size；None 表示跟着窗口大小
+_window_size = None     # 上次配置画布时的窗口大小
+_changed_at = None      # 窗口大小最近一次变化的时间（ms）
+_viewport = (None, None)    # (窗口大小, 画布在窗口里的 Rect)
+
+_caches = []            # [(字典, alpha)]
+_slots = weakref.WeakKeyDictionary()   # 对象 -> {属性名: (alpha, 和分辨率有关)}；对象没了自动删
+_listeners = []         # on_rescale 回调（弱引用）
+_formats = {}           # alpha -> 屏幕格式 (位深, 掩码)
+
+
+# ============================================================
+#  开窗口
+# ============================================================
+def _fit(size, area):
+    """size 等比缩放后放进 area 的最大尺寸（取整方式和 view.py 一致）"""
+    s = min(area[0] / size[0], area[1] / size[1])
+    return (max(1, int(size[0] * s + 0.5)), max(1, int(size[1] * s + 0.5)))
+
+
+def _initial_size(logical):
+    """桌面放得下就用逻辑尺寸，否则按桌面大小（无窗口测试用的 dummy 驱动不管）"""
+    if pygame.display.get_driver() == "dummy":
+        return tuple(logical)
+    try:
+        desktop = pygame.display.get_desktop_sizes()[0]
+    except (AttributeError, IndexError, pygame.error):
+        return tuple(logical)
+    room = (desktop[0] - DESKTOP_MARGIN[0], desktop[1] - DESKTOP_MARGIN[1])
+    if logical[0] <= room[0] and logical[1] <= room[1]:
+        return tuple(logical)
+    return _fit(logical, room)
+
+
+def open_window(logical, render=None, flags=()):
+    """
+    按 flags（标志名）开可缩放窗口并配置 view（见 view.py）。
+    返回 (window, screen)：screen 是所有东西画上去的画布。
+    """
+    global names, window, screen, _logical, _render, _window_size
+    names = frozenset(flags)
+    _logical = tuple(logical)
+    _render = tuple(render) if render else None
+    mode = pygame.RESIZABLE
+    if "doublebuf" in names:
+        mode |= pygame.DOUBLEBUF
+    if "scaled" in names:
+        mode |= pygame.SCALED
+        view.configure(_logical, _render)
+        size = view.render_size
+    else:
+        size = _initial_size(_logical)
+        view.configure(_logical, _canvas_size(size))
+    window = set_mode(size, mode, vsync=1 if "vsync" in names else 0)
+    _window_size = window.get_size()
+    screen = view.canvas(window)
+    return window, screen
+
+
+def _canvas_size(window_size):
+    """给定窗口大小时画布的像素大小（None 表示按逻辑尺寸 1:1 画）"""
+    if _render is not None:
+        return _render
+    size = _fit(_logical, window_size)
+    if size[0] >= _logical[0]:
+        return None         # 窗口比逻辑尺寸大：按 1:1 画，贴的时候放大
+    return size
+
+
+def set_mode(size, mode=0, vsync=0):
+    """pygame.display.set_mode，之后把登记过的缓存转成新的显示格式"""
+    global generation
+    try:
+        surface = pygame.display.set_mode(size, mode, vsync=vsync)
+    except pygame.error as e:
+        if not vsync:
+            raise
+        print(f"垂直同步不可用（{e}），改为不同步")
+        surface = pygame.display.set_mode(size, mode)
+    generation += 1
+    _formats.clear()
+    convert_all()
+    return surface
+
+
+# ============================================================
+#  改窗口大小
+# ============================================================
+def settle(now=None, before=None):
+    """
+    每帧调用一次。窗口大小变了并且已经 SETTLE_MS 没再变时，按新大小重新配置画布。
+    画布或窗口换了时返回 True（新的见 display.screen / display.window），否则返回 False。
+    before()：真要重新配置 view 之前先调用（比如等绘制线程把手上这一帧画完）。
+    """
+    global window, screen, _window_size, _changed_at
+    surface = pygame.display.get_surface()
+    if surface is None:
+        return False
+    size = surface.get_size()
+    now = pygame.time.get_ticks() if now is None else now
+    if size != _window_size:
+        _window_size = size
+        _changed_at = now
+        if screen is surface:
+            # 一直直接画在窗口上：稳定前先画在原大小的画布上，由 present() 缩放
+            window = surface
+            screen = pygame.Surface(view.render_size).convert(surface)
+            return True
+        return False
+    if _changed_at is None or now - _changed_at < SETTLE_MS:
+        return False
+    _changed_at = None
+    if before is not None:
+        before()
+    window = surface
+    old_scale = view.scale
+    if "scaled" not in names:
+        view.configure(_logical, _canvas_size(size))
+    if screen is None or screen.get_size() != view.render_size or size == view.render_size:
+        screen = view.canvas(window)
+    if view.scale != old_scale:
+        _rescaled()
+    return True
+
+
+def on_rescale(callback):
+    """登记画布比例变化后要调用的 callback()（绑定方法只弱引用，对象没了自动作废）"""
+    if inspect.ismethod(callback):
+        _listeners.append(weakref.WeakMethod(callback))
+    else:
+        _listeners.append(lambda: callback)
+    return callback
+
+
+def _rescaled():
+    for obj, attrs in list(_slots.items()):
+        for attr, (alpha, sized) in attrs.items():
+            if sized:
+                setattr(obj, attr, None)
+    listeners = []
+    for ref in _listeners:
+        callback = ref()
+        if callback is not None:
+            callback()
+            listeners.append(ref)
+    _listeners[:] = listeners
+
+
+# ============================================================
+#  画布 → 窗口
+# ============================================================
+def viewport(size):
+    """画布在 size 大小的窗口里占的 Rect：等比放大、居中"""
+    cached_size, rect = _viewport
+    if cached_size != size:
+        w, h = _fit(_logical, size)
+        rect = pygame.Rect((size[0] - w) // 2, (size[1] - h) // 2, w, h)
+        globals()["_viewport"] = (size, rect)
+    return rect
+
+
+def present(target, surface):
+    """把画布贴进窗口：大小正好就直接贴，否则缩放；窗口比例不一致时两侧留边"""
+    if surface is target:
+        return
+    size = target.get_size()
+    rect = viewport(size)
+    if rect.size == surface.get_size():
+        target.blit(surface, rect.topleft)
+    else:
+        pygame.transform.scale(surface, rect.size, target.subsurface(rect))
+    if rect.size != size:
+        if rect.x:
+            target.fill(BORDER_COLOR, (0, 0, rect.x, size[1]))
+            target.fill(BORDER_COLOR, (rect.right, 0, size[0] - rect.right, size[1]))
+        else:
+            target.fill(BORDER_COLOR, (0, 0, size[0], rect.y))
+            target.fill(BORDER_COLOR, (0, rect.bottom, size[0], size[1] - rect.bottom))
+
+
+# ============================================================
+#  鼠标坐标
+# ============================================================
+_POS_EVENTS = (pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP)
+
+
+def _mapping():
+    """(偏移 x, 偏移 y, 倍数)；窗口正好是逻辑尺寸时为 None"""
+    surface = pygame.display.get_surface()
+    if surface is None:
+        return None
+    rect = viewport(surface.get_size())
+    if rect.topleft == (0, 0) and rect.size == _logical:
+        return None
+    return rect.x, rect.y, _logical[0] / rect.width
+
+
+def to_logical(pos, mapping=None):
+    mapping = mapping or _mapping()
+    if mapping is None:
+        return pos
+    x0, y0, k = mapping
+    return (int((pos[0] - x0) * k), int((pos[1] - y0) * k))
+
+
+def logical_events(events):
+    """鼠标事件里的 pos / rel 换成逻辑坐标（窗口就是逻辑尺寸时原样返回）"""
+    mapping = _mapping()
+    if mapping is None:
+        return events
+    result = []
+    for event in events:
+        if event.type in _POS_EVENTS:
+            attrs = dict(event.dict, pos=to_logical(event.pos, mapping))
+            if "rel" in attrs:
+                k = mapping[2]
+                attrs["rel"] = (int(event.rel[0] * k), int(event.rel[1] * k))
+            event = pygame.event.Event(event.type, attrs)
+        result.append(event)
+    return result
+
+
+# ============================================================
+#  缓存 Surface 登记表
+# ============================================================
+def _format(surf):
+    return (surf.get_bitsize(), surf.get_masks())
+
+
+def _screen_format(alpha):
+    fmt = _formats.get(alpha)
+    if fmt is None:
+        probe = pygame.Surface((1, 1), pygame.SRCALPHA if alpha else 0)
+        probe = probe.convert_alpha() if alpha else probe.convert()
+        fmt = _formats[alpha] = _format(probe)
+    return fmt
+
+
+def convert(surf, alpha=None):
+    """
+    转成屏幕格式（alpha 为 None 时按 surf 有没有 SRCALPHA 判断）。
+    还没有窗口、或格式已一致时原样返回。
+    """
+    if surf is None or pygame.display.get_surface() is None:
+        return surf
+    if alpha is None:
+        alpha = bool(surf.get_flags() & pygame.SRCALPHA)
+    if _format(surf) == _screen_format(alpha):
+        return surf
+    return surf.convert_alpha() if alpha else surf.convert()
+
+
+def cache(mapping, alpha=None):
+    """登记 {键: Surface} 缓存，原样返回；放进去的值请先 convert()"""
+    _caches.append((mapping, alpha))
+    return mapping
+
+
+def keep(obj, attr, alpha=None, sized=False):
+    """
+    登记 obj.attr 上长期缓存的 Surface：现在转一次，换模式时再转（obj 只弱引用）。
+    sized=True 表示它按画布比例画的：比例变了就置 None，由 obj 下次用时重建。
+    """
+    attrs = _slots.get(obj)
+    if attrs is None:
+        attrs = _slots[obj] = {}
+    attrs[attr] = (alpha, sized)
+    setattr(obj, attr, convert(getattr(obj, attr), alpha))
+
+
+def convert_all():
+    """把登记过的缓存全部转成当前显示格式；同一个 Surface 被几处引用时只转一次"""
+    converted = {}
+
+    def one(surf, alpha):
+        if surf is None:
+            return None
+        key = id(surf)
+        if key not in converted:
+            # 连原 Surface 一起存着，保证 id 在本轮里不被复用
+            converted[key] = (surf, convert(surf, alpha))
+        return converted[key][1]
+
+    for mapping, alpha in _caches:
+        for key, surf in list(mapping.items()):
+            mapping[key] = one(surf, alpha)
+    for obj, attrs in list(_slots.items()):
+        for attr, (alpha, sized) in attrs.items():
+            setattr(obj, attr, one(getattr(obj, attr), alpha))
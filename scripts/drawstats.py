@@ -0,0 +1,194 @@
+"""
+drawstats.py —— 每帧分配与绘制调用计数
+包含：Surface 新建、pygame.draw.*、Surface.blit、font.render 的逐帧计数，
+按调用它的"模块:函数"归类，列出分配最多的位置，导出 JSON
+
+实现：
+  · sys.setprofile 的 c_call 事件能看到主线程里每一次 C 函数调用和调用方的帧，
+    blit / render / draw.* / transform.* 都在这里统计（包括显示 Surface 上的 blit）；
+  · pygame.Surface(...) 是"调用类型"，不产生 c_call，所以临时把 pygame.Surface
+    换成一个计数子类（isinstance 判断不受影响）。
+只统计次数：开启后每次 Python 调用都会经过钩子，帧时间会变慢，不要同时看耗时。
+"""
+
+import os
+import sys
+import json
+import atexit
+
+import pygame
+
+
+SURFACE = "surface"     # 新建 Surface（构造、copy、convert、transform.*）
+DRAW = "draw"           # pygame.draw.*
+BLIT = "blit"           # Surface.blit / blits / fill
+TEXT = "text"           # font.render（每次也会新建一个 Surface）
+KINDS = (SURFACE, DRAW, BLIT, TEXT)
+
+_RealSurface = pygame.Surface
+
+
+class DrawStats:
+    # 这些文件里的调用不计入（性能浮层自己画的东西）
+    IGNORE_FILES = ("profiler.py", "drawstats.py")
+    # 这些文件只是转手调用（view.py 的缩放包装），算到调用它们的位置上
+    PASS_FILES = ("view.py",)
+
+    def __init__(self):
+        self.installed = False
+        self.frames = 0
+        self.current = dict.fromkeys(KINDS, 0)
+        self.last = dict.fromkeys(KINDS, 0)
+        self.totals = dict.fromkeys(KINDS, 0)
+        self.peak = dict.fromkeys(KINDS, 0)
+        self.sites = {}             # (kind, "模块:函数") -> 累计次数
+        self._labels = {}
+        self._pass = {}             # 代码对象 -> 是否属于 PASS_FILES
+        self._kinds = self._build_kind_table()
+        self.path = "drawstats.json"
+        self._atexit = False
+
+    @staticmethod
+    def _build_kind_table():
+        """(所属对象, 函数名) -> 类别；函数名为 None 表示整个模块"""
+        table = {
+            (pygame.draw, None): DRAW,
+            (pygame.transform, None): SURFACE,
+            (pygame.font.Font, "render"): TEXT,
+        }
+        for name in ("blit", "blits", "fill"):
+            table[(_RealSurface, name)] = BLIT
+        for name in ("copy", "convert", "convert_alpha", "subsurface"):
+            table[(_RealSurface, name)] = SURFACE
+        for name in ("fromstring", "frombytes", "frombuffer", "load"):
+            table[(pygame.image, name)] = SURFACE
+        return table
+
+    # --------------------------------------------------
+    #  安装 / 卸载
+    # --------------------------------------------------
+    def install(self, path=None, dump_at_exit=True):
+        if path:
+            self.path = path
+        if dump_at_exit and not self._atexit:
+            atexit.register(self._dump_at_exit)
+            self._atexit = True
+        if self.installed:
+            return
+        stats = self
+
+        class CountingSurface(_RealSurface):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                stats._count(SURFACE, stats._site(sys._getframe(1)))
+
+        for kind_owner in list(self._kinds):
+            if kind_owner[0] is _RealSurface:
+                self._kinds[(CountingSurface, kind_owner[1])] = self._kinds[kind_owner]
+        pygame.Surface = CountingSurface
+        sys.setprofile(self._hook)
+        self.installed = True
+
+    def uninstall(self):
+        if not self.installed:
+            return
+        sys.setprofile(None)
+        pygame.Surface = _RealSurface
+        self.installed = False
+
+    # --------------------------------------------------
+    #  计数
+    # --------------------------------------------------
+    def _hook(self, frame, event, arg):
+        if event != "c_call":
+            return
+        owner = getattr(arg, "__self__", None)
+        if owner is None:
+            return
+        if type(owner) is not type(sys):        # 方法：按实例类型查
+            owner = type(owner)
+        kinds = self._kinds
+        kind = kinds.get((owner, arg.__name__)) or kinds.get((owner, None))
+        if kind is not None:
+            self._count(kind, self._site(frame))
+
+    def _site(self, frame):
+        """跳过 PASS_FILES 里的包装函数，返回真正发起调用的代码对象"""
+        while frame.f_back is not None:
+            code = frame.f_code
+            passing = self._pass.get(code)
+            if passing is None:
+                passing = os.path.basename(code.co_filename) in self.PASS_FILES
+                self._pass[code] = passing
+            if not passing:
+                break
+            frame = frame.f_back
+        return frame.f_code
+
+    def _count(self, kind, code):
+        label = self._labels.get(code)
+        if label is None:
+            filename = os.path.basename(code.co_filename)
+            if filename in self.IGNORE_FILES:
+                label = ""
+            else:
+                name = getattr(code, "co_qualname", code.co_name)
+                label = f"{os.path.splitext(filename)[0]}:{name}"
+            self._labels[code] = label
+        if not label:
+            return
+        self.current[kind] += 1
+        key = (kind, label)
+        self.sites[key] = self.sites.get(key, 0) + 1
+
+    def end_frame(self):
+        """每帧开头调用：把上一帧的计数归档"""
+        self.frames += 1
+        for kind, n in self.current.items():
+            self.last[kind] = n
+            self.totals[kind] += n
+            if n > self.peak[kind]:
+                self.peak[kind] = n
+            self.current[kind] = 0
+
+    # --------------------------------------------------
+    #  报告
+    # --------------------------------------------------
+    def top(self, n=10, kinds=(SURFACE, TEXT)):
+        """分配最多的位置：[(类别, "模块:函数", 每帧平均次数)]"""
+        frames = max(1, self.frames)
+        rows = [(kind, label, count / frames)
+                for (kind, label), count in self.sites.items() if kind in kinds]
+        rows.sort(key=lambda r: -r[2])
+        return rows[:n]
+
+    def report(self):
+        frames = max(1, self.frames)
+        return {
+            "frames": self.frames,
+            "per_frame": {k: self.totals[k] / frames for k in KINDS},
+            "peak": dict(self.peak),
+            "sites": [
+                {"kind": kind, "site": label, "count": count,
+                 "per_frame": count / frames}
+                for (kind, label), count in sorted(
+                    self.sites.items(), key=lambda item: -item[1])
+            ],
+        }
+
+    def dump(self, path=None):
+        path = path or self.path
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, ensure_ascii=False, indent=2)
+        return path
+
+    def _dump_at_exit(self):
+        self.uninstall()
+        if self.frames:
+            self.print_top()
+            print(f"绘制计数已写入 {self.dump()}")
+
+    def print_top(self, n=10):
+        print(f"{'kind':8s} {'site':48s} {'per frame':>10s}")
+        for kind, label, per_frame in self.top(n):
+            print(f"{kind:8s} {label:48s} {per_frame:10.1f}")
@@ -0,0 +1,280 @@
+"""
+ecs.py —— 组件存储与批量动画系统
+包含：结构化数组组件、正弦查表、每帧一次推进全部实体的动画系统
+"""
+
+import copy
+import math
+
+import numpy as np
+
+import rng
+
+# 水滴散布用的随机数流
+_drop_rng = rng.stream("drops")
+
+
+# ============================================================
+#  正弦 / 余弦查表（代替每次绘制都调用 math.sin）
+# ============================================================
+TRIG_TABLE_SIZE = 4096
+_TRIG_MASK = TRIG_TABLE_SIZE - 1
+_TRIG_SCALE = TRIG_TABLE_SIZE / (2 * math.pi)
+_QUARTER = TRIG_TABLE_SIZE // 4
+TWO_PI = 2 * math.pi
+
+SIN_TABLE = np.sin(np.arange(TRIG_TABLE_SIZE) * (TWO_PI / TRIG_TABLE_SIZE))
+# 标量查询用 list 比索引 numpy 数组快得多
+_SIN_LIST = SIN_TABLE.tolist()
+
+
+def fast_sin(x):
+    """查表正弦（标量）"""
+    return _SIN_LIST[int(x * _TRIG_SCALE) & _TRIG_MASK]
+
+
+def fast_cos(x):
+    """查表余弦（标量）"""
+    return _SIN_LIST[(int(x * _TRIG_SCALE) + _QUARTER) & _TRIG_MASK]
+
+
+def table_sin(values):
+    """查表正弦（数组）"""
+    return SIN_TABLE[(values * _TRIG_SCALE).astype(np.int64) & _TRIG_MASK]
+
+
+# ============================================================
+#  组件：每个字段一条连续 numpy 数组（SoA 布局）
+# ============================================================
+class Component:
+    def __init__(self, fields, capacity=32):
+        self.fields = fields
+        self.capacity = capacity
+        self.count = 0              # 用过的最大行号 + 1
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.owners = [None] * capacity
+        self._free = []
+        for name, (dtype, default) in fields.items():
+            setattr(self, name, np.full(capacity, default, dtype=dtype))
+
+    def _grow(self):
+        new_cap = self.capacity * 2
+        for name, (dtype, default) in self.fields.items():
+            old = getattr(self, name)
+            arr = np.full(new_cap, default, dtype=dtype)
+            arr[:self.capacity] = old
+            setattr(self, name, arr)
+        alive = np.zeros(new_cap, dtype=bool)
+        alive[:self.capacity] = self.alive
+        self.alive = alive
+        self.owners.extend([None] * (new_cap - self.capacity))
+        self.capacity = new_cap
+
+    def add(self, owner, **values):
+        """分配一行并写入初值，返回行号"""
+        if self._free:
+            row = self._free.pop()
+        else:
+            if self.count >= self.capacity:
+                self._grow()
+            row = self.count
+            self.count += 1
+        for name, (dtype, default) in self.fields.items():
+            getattr(self, name)[row] = values.get(name, default)
+        self.alive[row] = True
+        self.owners[row] = owner
+        return row
+
+    def remove(self, row):
+        if not self.alive[row]:
+            return
+        self.alive[row] = False
+        self.owners[row] = None
+        self._free.append(row)
+
+    def live_rows(self):
+        return np.flatnonzero(self.alive[:self.count])
+
+    def snapshot(self):
+        """只读副本：数组全部拷贝，owners 共用（绘制不改它）"""
+        snap = copy.copy(self)
+        for name in self.fields:
+            setattr(snap, name, getattr(self, name).copy())
+        snap.alive = self.alive.copy()
+        snap._free = []
+        return snap
+
+
+# ============================================================
+#  组件存储 + 系统
+# ============================================================
+class ComponentStore:
+    """
+    场景里所有会动的物体把相位、位置、速度存在这里，
+    每帧由 step() 用少量数组运算一次推进全部实体。
+    """
+
+    DRIP_INTERVAL = 7
+
+    def __init__(self, capacity=32):
+        # 周期相位：摆动、发光、走路节奏 …… sin 列缓存本帧的查表结果
+        self.phases = Component({
+            "value": (np.float64, 0.0),
+            "speed": (np.float64, 0.0),
+            "sin": (np.float64, 0.0),
+        }, capacity)
+        # 巡逻 / 追击：伐木工人。chase 行沿 flow_field 前进，其余左右巡逻
+        self.patrols = Component({
+            "x": (np.float64, 0.0),
+            "y": (np.float64, 0.0),
+            "velocity": (np.float64, 0.0),
+            "x_min": (np.float64, 0.0),
+            "x_max": (np.float64, 0.0),
+            "chase": (bool, False),
+        }, capacity)
+        # 追击行共用的流场（FlowField），为空时全部巡逻
+        self.flow_field = None
+        # 带上限的计数器：树苗生长、水龙头滴水计时
+        self.ramps = Component({
+            "value": (np.float64, 0.0),
+            "rate": (np.float64, 1.0),
+            "limit": (np.float64, np.inf),
+            "enabled": (bool, False),
+            "emit_every": (np.int64, 0),
+        }, capacity)
+        # 水滴粒子（source 为发射它的 ramps 行号）
+        self.drops = Component({
+            "x": (np.float64, 0.0),
+            "y": (np.float64, 0.0),
+            "vy": (np.float64, 0.0),
+            "size": (np.float64, 0.0),
+            "life": (np.float64, 0.0),
+            "max_life": (np.float64, 1.0),
+            "source": (np.int64, -1),
+        }, capacity)
+
+    # --------------------------------------------------
+    #  分配
+    # --------------------------------------------------
+    def add_phase(self, owner, value, speed):
+        return self.phases.add(owner, value=value, speed=speed,
+                               sin=fast_sin(value))
+
+    def add_patrol(self, owner, x, y, velocity, x_min, x_max, chase=False):
+        return self.patrols.add(owner, x=x, y=y, velocity=velocity,
+                                x_min=x_min, x_max=x_max, chase=chase)
+
+    def add_ramp(self, owner, limit=np.inf, enabled=False, emit_every=0):
+        return self.ramps.add(owner, limit=limit, enabled=enabled,
+                              emit_every=emit_every)
+
+    def drops_from(self, source):
+        """某个发射源当前存活的水滴行号"""
+        n = self.drops.count
+        return np.flatnonzero(self.drops.alive[:n]
+                              & (self.drops.source[:n] == source))
+
+    def snapshot(self):
+        """绘制线程用的只读副本（见 pipeline.py）；流场共用"""
+        snap = copy.copy(self)
+        for name in ("phases", "patrols", "ramps", "drops"):
+            setattr(snap, name, getattr(self, name).snapshot())
+        return snap
+
+    def clear_drops(self, source):
+        for row in self.drops_from(source):
+            self.drops.remove(row)
+
+    def release(self, owner):
+        """回收某个物体占用的全部行"""
+        for comp in (self.phases, self.patrols, self.ramps):
+            for row in comp.live_rows():
+                if comp.owners[row] is owner:
+                    if comp is self.ramps:
+                        self.clear_drops(row)
+                    comp.remove(row)
+
+    # --------------------------------------------------
+    #  每帧推进
+    # --------------------------------------------------
+    def step(self):
+        self._step_phases()
+        self._step_patrols()
+        self._step_ramps()
+        self._step_drops()
+
+    def _step_phases(self):
+        p = self.phases
+        n = p.count
+        if n == 0:
+            return
+        value = p.value[:n]
+        value += p.speed[:n]
+        np.mod(value, TWO_PI, out=value)
+        p.sin[:n] = table_sin(value)
+
+    def _step_patrols(self):
+        p = self.patrols
+        n = p.count
+        if n == 0:
+            return
+        x = p.x[:n]
+        y = p.y[:n]
+        velocity = p.velocity[:n]
+
+        # 追击：查流场方向，整批移动；流场没给方向（到达 / 不可达）的仍旧巡逻
+        following = np.zeros(n, dtype=bool)
+        field = self.flow_field
+        if field is not None and field.has_goals:
+            rows = np.flatnonzero(p.chase[:n] & p.alive[:n])
+            if len(rows):
+                dx, dy = field.directions(x[rows], y[rows])
+                moving = (dx != 0) | (dy != 0)
+                rows, dx, dy = rows[moving], dx[moving], dy[moving]
+                speed = np.abs(velocity[rows])
+                x[rows] += dx * speed
+                y[rows] += dy * speed
+                turn = dx != 0
+                velocity[rows[turn]] = np.copysign(speed[turn], dx[turn])
+                following[rows] = True
+
+        patrol = ~following
+        x[patrol] += velocity[patrol]
+        out = patrol & ((x < p.x_min[:n]) | (x > p.x_max[:n]))
+        velocity[out] *= -1
+
+    def _step_ramps(self):
+        r = self.ramps
+        n = r.count
+        if n == 0:
+            return
+        on = r.enabled[:n] & r.alive[:n]
+        value = r.value[:n]
+        np.minimum(value + r.rate[:n] * on, r.limit[:n], out=value)
+
+        # 到点的发射源各生成一颗水滴
+        every = r.emit_every[:n]
+        emit = on & (every > 0)
+        if emit.any():
+            emit &= (value.astype(np.int64) % np.maximum(every, 1)) == 0
+            for row in np.flatnonzero(emit):
+                owner = r.owners[row]
+                self.drops.add(None,
+                               x=owner.x + _drop_rng.uniform(-2, 2),
+                               y=owner.y + 20,
+                               vy=0.8,
+                               size=_drop_rng.uniform(2.5, 4),
+                               life=35, max_life=35,
+                               source=row)
+
+    def _step_drops(self):
+        d = self.drops
+        n = d.count
+        if n == 0:
+            return
+        d.y[:n] += d.vy[:n]
+        d.vy[:n] += 0.12
+        d.life[:n] -= 1
+        np.maximum(d.size[:n] - 0.05, 0.5, out=d.size[:n])
+        for row in np.flatnonzero(d.alive[:n] & (d.life[:n] <= 0)):
+            d.remove(row)
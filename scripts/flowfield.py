@@ -0,0 +1,116 @@
+"""
+flowfield.py —— 共享流场寻路
+包含：粗网格可通行图、波前 BFS 距离场、每格的前进方向
+所有追击者查同一张方向表，寻路开销与敌人数量无关
+"""
+
+import math
+
+import numpy as np
+
+
+# 8 个邻居方向 (drow, dcol)
+_NEIGHBOURS = [(-1, 0), (1, 0), (0, -1), (0, 1),
+               (-1, -1), (-1, 1), (1, -1), (1, 1)]
+
+
+class FlowField:
+    """
+    目标格集合变化时才重算（波前每一步是整张网格的数组运算）；
+    目标不变的帧里，追击者只做一次查表。
+    """
+
+    CELL = 40
+    UNREACHABLE = np.iinfo(np.int32).max
+
+    def __init__(self, width, height, collision=None, cell=CELL):
+        self.cell = cell
+        self.cols = width // cell + (1 if width % cell else 0)
+        self.rows = height // cell + (1 if height % cell else 0)
+        self.passable = np.ones((self.rows, self.cols), dtype=bool)
+        if collision is not None:
+            self._mark_blocked(collision)
+        self.dist = np.full((self.rows, self.cols), self.UNREACHABLE,
+                            dtype=np.int32)
+        self.dir_x = np.zeros((self.rows, self.cols))
+        self.dir_y = np.zeros((self.rows, self.cols))
+        self._goals = frozenset()
+        self.recomputes = 0
+
+    def _mark_blocked(self, collision):
+        """格子中心被碰撞位图挡住就视为不可通行"""
+        mask = collision.mask
+        w, h = mask.get_size()
+        for r in range(self.rows):
+            cy = min(h - 1, r * self.cell + self.cell // 2)
+            for c in range(self.cols):
+                cx = min(w - 1, c * self.cell + self.cell // 2)
+                if mask.get_at((cx, cy)):
+                    self.passable[r, c] = False
+
+    # --------------------------------------------------
+    #  目标
+    # --------------------------------------------------
+    def cell_of(self, x, y):
+        c = min(self.cols - 1, max(0, int(x) // self.cell))
+        r = min(self.rows - 1, max(0, int(y) // self.cell))
+        return r, c
+
+    def set_goals(self, points):
+        """设置目标点（世界坐标）；目标格集合没变就什么也不做"""
+        goals = frozenset(self.cell_of(x, y) for x, y in points)
+        if goals == self._goals:
+            return False
+        self._goals = goals
+        self._recompute()
+        return True
+
+    @property
+    def has_goals(self):
+        return bool(self._goals)
+
+    # --------------------------------------------------
+    #  重算
+    # --------------------------------------------------
+    def _recompute(self):
+        self.recomputes += 1
+        inf = self.UNREACHABLE
+        dist = self.dist
+        dist.fill(inf)
+        frontier = np.zeros_like(self.passable)
+        for r, c in self._goals:
+            frontier[r, c] = True
+        dist[frontier] = 0
+
+        # 波前 BFS：每一步把整条前沿同时向四邻扩一格
+        step = 0
+        grow = np.empty_like(frontier)
+        while frontier.any():
+            step += 1
+            grow.fill(False)
+            grow[1:, :] |= frontier[:-1, :]
+            grow[:-1, :] |= frontier[1:, :]
+            grow[:, 1:] |= frontier[:, :-1]
+            grow[:, :-1] |= frontier[:, 1:]
+            frontier = grow & self.passable & (dist == inf)
+            dist[frontier] = step
+
+        # 每格指向 8 邻居里距离最小的那个
+        padded = np.full((self.rows + 2, self.cols + 2), inf, dtype=np.int64)
+        padded[1:-1, 1:-1] = dist
+        best = dist.astype(np.int64)
+        self.dir_x.fill(0.0)
+        self.dir_y.fill(0.0)
+        for dr, dc in _NEIGHBOURS:
+            nb = padded[1 + dr:1 + dr + self.rows, 1 + dc:1 + dc + self.cols]
+            better = nb < best
+            best = np.where(better, nb, best)
+            norm = 1.0 / math.hypot(dr, dc)
+            self.dir_x[better] = dc * norm
+            self.dir_y[better] = dr * norm
+
+    def directions(self, xs, ys):
+        """批量查询一组位置的前进方向，返回 (dx 数组, dy 数组)"""
+        c = np.clip((xs // self.cell).astype(np.int64), 0, self.cols - 1)
+        r = np.clip((ys // self.cell).astype(np.int64), 0, self.rows - 1)
+        return self.dir_x[r, c], self.dir_y[r, c]
@@ -0,0 +1,161 @@
+"""
+gcpause.py —— GC 停顿管理与卡帧检测
+包含：启动 / 换场景后冻结存活对象、把完整回收挪到场景切换和空闲帧、
+记录超出预算的帧以及这一帧里有没有跑 GC（统计显示在 F3 浮层里）
+
+每秒新建成千上万个临时 Surface 和 dict，CPython 的第 2 代回收随时可能
+落在拖拽 / 移动的某一帧中间。这里：
+  · 抬高第 2 代阈值，不让它自动触发；
+  · 场景切换时 unfreeze → collect → freeze，把场景里长期存活的对象移出 GC 视野；
+  · 平时只在本帧还有富余（比上一次完整回收耗时多一截）时补做完整回收。
+"""
+
+import gc
+import time
+import atexit
+
+
+_now = time.perf_counter
+
+
+class GcPauseManager:
+    DEFERRED_GEN2 = 1_000_000   # 第 2 代阈值：实际上不会自动触发
+    FULL_INTERVAL = 600         # 距上次完整回收至少这么多帧才在空闲帧补做
+    SPARE_FACTOR = 1.5          # 富余时间要大于预计回收耗时的倍数
+    RING = 64                   # 最近多少次卡帧的耗时留在内存里
+
+    def __init__(self, budget_ms=1000 / 60, log_path=None, tune=True):
+        self.budget_ms = budget_ms
+        self.log_path = log_path
+        # tune=False 时只检测卡帧、不改 GC 行为，用来对比
+        self.tune = tune
+        self.installed = False
+        self.frame = 0
+        # 卡帧多少取决于机器快慢：内存里只留计数和最近 RING 次的耗时（固定大小），
+        # 逐帧明细（标签、这一帧的每次回收）只在 --hitch-log 时写进文件
+        self.recent_hitch_ms = [0.0] * self.RING
+        self.worst_hitch_ms = 0.0
+        self.hitch_count = 0
+        self.hitch_with_gc = 0
+        self.collections = [0, 0, 0]
+        self.last_full_ms = 1.0
+        self._last_full_frame = 0
+        self._thresholds = gc.get_threshold()
+        self._gc_start = 0.0
+        self._frame_gc_count = 0
+        self._frame_gc = []     # [(代, ms)]，只在写卡帧日志时记
+        self._frame_start = None
+        self._log = None
+
+    # --------------------------------------------------
+    #  安装
+    # --------------------------------------------------
+    def install(self):
+        if self.installed:
+            return
+        self._thresholds = gc.get_threshold()
+        if self.tune:
+            gen0, gen1, _ = self._thresholds
+            gc.set_threshold(gen0, gen1, self.DEFERRED_GEN2)
+        gc.callbacks.append(self._on_gc)
+        if self.log_path:
+            self._log = open(self.log_path, "w", encoding="utf-8")
+            atexit.register(self._close_log)
+        self.installed = True
+        self.settle()
+
+    def uninstall(self):
+        if not self.installed:
+            return
+        gc.callbacks.remove(self._on_gc)
+        gc.set_threshold(*self._thresholds)
+        gc.unfreeze()
+        self.installed = False
+
+    def _on_gc(self, phase, info):
+        if phase == "start":
+            self._gc_start = _now()
+            return
+        ms = (_now() - self._gc_start) * 1000
+        generation = info["generation"]
+        self.collections[generation] += 1
+        self._frame_gc_count += 1
+        if self._log is not None:
+            self._frame_gc.append((generation, ms))
+        if generation == 2:
+            self.last_full_ms = ms
+            self._last_full_frame = self.frame
+
+    # --------------------------------------------------
+    #  场景切换 / 每帧
+    # --------------------------------------------------
+    def settle(self):
+        """换场景时调用：完整回收一次，再把剩下的对象冻结"""
+        if not (self.installed and self.tune):
+            return
+        gc.unfreeze()
+        gc.collect()
+        gc.freeze()
+
+    def begin_frame(self):
+        if not self.installed:
+            return
+        self._frame_start = _now()
+        self._frame_gc_count = 0
+        if self._frame_gc:
+            self._frame_gc.clear()
+
+    def end_frame(self, label=""):
+        """在 flip 之后、等待下一帧之前调用"""
+        if not self.installed or self._frame_start is None:
+            return
+        self.frame += 1
+        work_ms = (_now() - self._frame_start) * 1000
+        if work_ms > self.budget_ms:
+            self._record_hitch(work_ms, label)
+        spare = self.budget_ms - work_ms
+        if (self.tune and self.frame - self._last_full_frame >= self.FULL_INTERVAL
+                and spare > self.last_full_ms * self.SPARE_FACTOR):
+            gc.collect()
+
+    def _record_hitch(self, work_ms, label):
+        self.recent_hitch_ms[self.hitch_count % self.RING] = work_ms
+        self.worst_hitch_ms = max(self.worst_hitch_ms, work_ms)
+        self.hitch_count += 1
+        if self._frame_gc_count:
+            self.hitch_with_gc += 1
+        if self._log is not None:
+            hitch = (self.frame, work_ms, label, self._frame_gc)
+            self._log.write(self.format_hitch(hitch) + "\n")
+            self._log.flush()
+
+    @staticmethod
+    def format_hitch(hitch):
+        frame, work_ms, label, collections = hitch
+        if collections:
+            gc_text = ", ".join(f"gen{g} {ms:.1f}ms" for g, ms in collections)
+        else:
+            gc_text = "无"
+        return f"帧 {frame:7d}  {work_ms:6.1f} ms  {label:10s}  GC: {gc_text}"
+
+    # --------------------------------------------------
+    #  报告
+    # --------------------------------------------------
+    def status(self):
+        """性能浮层里显示的一行：卡帧数、最近 RING 次的中位耗时、最长一次"""
+        recent = sorted(self.recent_hitch_ms[:min(self.hitch_count, self.RING)])
+        typical = recent[len(recent) // 2] if recent else 0.0
+        return (f"hitch {self.hitch_count} (gc {self.hitch_with_gc})"
+                f"  p50 {typical:.0f}  max {self.worst_hitch_ms:.0f} ms")
+
+    def summary(self):
+        return (f"{self.frame} 帧，超预算 {self.hitch_count} 帧"
+                f"（其中 {self.hitch_with_gc} 帧跑了 GC，最长 {self.worst_hitch_ms:.1f} ms），"
+                f"回收次数 gen0/1/2 = {'/'.join(map(str, self.collections))}")
+
+    def _close_log(self):
+        if self._log is not None:
+            self._log.write(self.summary() + "\n")
+            self._log.close()
+            self._log = None
+            print(f"卡帧记录已写入 {self.log_path}")
@@ -6,6 +6,9 @@ Google Doodle 风格：柔和阴影、圆润形状、明亮配色、Material 质
 import pygame
 import math
 
+import view
+import quality
+
 # ============================================================
 #  Google 风格调色板
 # ============================================================
@@ -55,38 +58,43 @@ BIN_GRAY = (154, 160, 166)
 # ============================================================
 
 def draw_shadow(surface, rect, radius=8, offset=(3, 4), alpha=40):
-    """绘制柔和投影"""
-    shadow = pygame.Surface((rect.width + 6, rect.height + 6), pygame.SRCALPHA)
+    """绘制柔和投影（低画质不画）"""
+    if not quality.shadows:
+        return
+    shadow = view.Surface((rect.width + 6, rect.height + 6), pygame.SRCALPHA)
     shadow_rect = pygame.Rect(3, 3, rect.width, rect.height)
-    pygame.draw.rect(shadow, (0, 0, 0, alpha), shadow_rect, border_radius=radius)
-    surface.blit(shadow, (rect.x + offset[0] - 3, rect.y + offset[1] - 3))
+    view.draw.rect(shadow, (0, 0, 0, alpha), shadow_rect, border_radius=radius)
+    view.blit(surface, shadow, (rect.x + offset[0] - 3, rect.y + offset[1] - 3))
 
 
 def draw_circle_shadow(surface, cx, cy, radius, offset=(2, 3), alpha=35):
-    """绘制圆形投影"""
-    s = pygame.Surface((radius * 2 + 10, radius * 2 + 10), pygame.SRCALPHA)
-    pygame.draw.circle(s, (0, 0, 0, alpha),
-                       (radius + 5, radius + 5), radius)
-    surface.blit(s, (cx - radius - 5 + offset[0], cy - radius - 5 + offset[1]))
+    """绘制圆形投影（低画质不画）"""
+    if not quality.shadows:
+        return
+    s = view.Surface((radius * 2 + 10, radius * 2 + 10), pygame.SRCALPHA)
+    view.draw.circle(s, (0, 0, 0, alpha),
+                     (radius + 5, radius + 5), radius)
+    view.blit(surface, s, (cx - radius - 5 + offset[0], cy - radius - 5 + offset[1]))
 
 
 def draw_rounded_card(surface, rect, color, radius=12, shadow=True, border=None):
     """绘制 Material 风格圆角卡片"""
     if shadow:
         draw_shadow(surface, rect, radius, (2, 3), 45)
-    pygame.draw.rect(surface, color, rect, border_radius=radius)
+    view.draw.rect(surface, color, rect, border_radius=radius)
     # 顶部高光条
-    highlight = pygame.Surface((rect.width - 4, 3), pygame.SRCALPHA)
-    highlight.fill((*[min(255, c + 35) for c in color[:3]], 80))
-    surface.blit(highlight, (rect.x + 2, rect.y + 2))
+    if quality.highlights:
+        highlight = view.Surface((rect.width - 4, 3), pygame.SRCALPHA)
+        highlight.fill((*[min(255, c + 35) for c in color[:3]], 80))
+        view.blit(surface, highlight, (rect.x + 2, rect.y + 2))
     if border:
-        pygame.draw.rect(surface, border, rect, width=2, border_radius=radius)
+        view.draw.rect(surface, border, rect, width=2, border_radius=radius)
 
 
 def draw_pill_badge(surface, x, y, text, font, bg_color, text_color=WHITE, shadow=True):
     """绘制药丸形标签"""
     text_surf = font.render(text, True, text_color)
-    tw, th = text_surf.get_size()
+    tw, th = view.size(text_surf)
     pad_x, pad_y = 14, 6
     w = tw + pad_x * 2
     h = th + pad_y * 2
@@ -94,46 +102,51 @@ def draw_pill_badge(surface, x, y, text, font, bg_color, text_color=WHITE, shado
 
     if shadow:
         draw_shadow(surface, rect, h // 2, (1, 2), 35)
-    pygame.draw.rect(surface, bg_color, rect, border_radius=h // 2)
+    view.draw.rect(surface, bg_color, rect, border_radius=h // 2)
     # 高光
-    hl = pygame.Surface((w - 4, h // 3), pygame.SRCALPHA)
-    hl.fill((255, 255, 255, 40))
-    surface.blit(hl, (rect.x + 2, rect.y + 1))
-    surface.blit(text_surf, (x - tw // 2, y - th // 2))
+    if quality.highlights:
+        hl = view.Surface((w - 4, h // 3), pygame.SRCALPHA)
+        hl.fill((255, 255, 255, 40))
+        view.blit(surface, hl, (rect.x + 2, rect.y + 1))
+    view.blit(surface, text_surf, (x - tw // 2, y - th // 2))
     return rect
 
 
 def draw_gradient_v(surface, rect, color_top, color_bottom):
-    """绘制垂直渐变矩形（优化：只绘制 rect 内）"""
+    """绘制垂直渐变矩形（优化：只绘制 rect 内；画质降低时几行一条色带）"""
     x, y, w, h = rect
-    for row in range(h):
+    step = quality.gradient_step
+    for row in range(0, h, step):
         ratio = row / max(1, h - 1)
         r = int(color_top[0] + (color_bottom[0] - color_top[0]) * ratio)
         g = int(color_top[1] + (color_bottom[1] - color_top[1]) * ratio)
         b = int(color_top[2] + (color_bottom[2] - color_top[2]) * ratio)
-        pygame.draw.line(surface, (r, g, b), (x, y + row), (x + w - 1, y + row))
+        if step == 1:
+            view.draw.line(surface, (r, g, b), (x, y + row), (x + w - 1, y + row))
+        else:
+            view.draw.rect(surface, (r, g, b), (x, y + row, w, min(step, h - row)))
 
 
 def draw_soft_circle(surface, cx, cy, radius, color, highlight=True):
     """绘制带高光的柔和圆"""
-    pygame.draw.circle(surface, color, (cx, cy), radius)
-    if highlight and radius > 4:
-        hl_surf = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+    view.draw.circle(surface, color, (cx, cy), radius)
+    if highlight and quality.highlights and radius > 4:
+        hl_surf = view.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
         hl_r = max(2, radius // 3)
-        pygame.draw.circle(hl_surf, (255, 255, 255, 55),
-                           (radius - radius // 4, radius - radius // 4), hl_r)
-        surface.blit(hl_surf, (cx - radius, cy - radius))
+        view.draw.circle(hl_surf, (255, 255, 255, 55),
+                         (radius - radius // 4, radius - radius // 4), hl_r)
+        view.blit(surface, hl_surf, (cx - radius, cy - radius))
 
 
 def draw_soft_ellipse(surface, rect, color, highlight=True):
     """绘制带高光的柔和椭圆"""
-    pygame.draw.ellipse(surface, color, rect)
-    if highlight:
+    view.draw.ellipse(surface, color, rect)
+    if highlight and quality.highlights:
         r = pygame.Rect(rect[0] + rect[2] // 6, rect[1] + rect[3] // 6,
                         rect[2] // 2, rect[3] // 3)
-        s = pygame.Surface((r.width, r.height), pygame.SRCALPHA)
-        pygame.draw.ellipse(s, (255, 255, 255, 45), (0, 0, r.width, r.height))
-        surface.blit(s, r.topleft)
+        s = view.Surface((r.width, r.height), pygame.SRCALPHA)
+        view.draw.ellipse(s, (255, 255, 255, 45), (0, 0, r.width, r.height))
+        view.blit(surface, s, r.topleft)
 
 
 def lerp_color(c1, c2, t):
@@ -152,12 +165,13 @@ def draw_progress_bar(surface, x, y, width, height, progress, bg_color=LIGHT_GRA
     if radius is None:
         radius = height // 2
     # 背景
-    pygame.draw.rect(surface, bg_color, (x, y, width, height), border_radius=radius)
+    view.draw.rect(surface, bg_color, (x, y, width, height), border_radius=radius)
     # 填充
     fw = max(0, int(width * min(1.0, progress)))
     if fw > 0:
-        pygame.draw.rect(surface, fill_color, (x, y, fw, height), border_radius=radius)
+        view.draw.rect(surface, fill_color, (x, y, fw, height), border_radius=radius)
         # 高光
-        hl = pygame.Surface((fw, height // 2), pygame.SRCALPHA)
-        hl.fill((255, 255, 255, 40))
-        surface.blit(hl, (x, y))
+        if quality.highlights:
+            hl = view.Surface((fw, height // 2), pygame.SRCALPHA)
+            hl.fill((255, 255, 255, 40))
+            view.blit(surface, hl, (x, y))
@@ -0,0 +1,58 @@
+"""
+groundcache.py —— 关卡地面贴图缓存
+包含：按 关卡 / 分辨率 / 画布比例 在进程内复用画好的地面、空闲时预先画好的预热任务
+
+地面只由关卡号和分辨率决定（见 level.GROUND_RENDERERS），同一进程里
+重开 / 重建关卡直接复用已经画好的 Surface，不再跑几百次绘制调用。
+第一次进关前由 warm() 在每帧的空闲时间里先画好（见 tasks.py）。
+
+不存盘：1440x900 下从 PNG 读回（含转屏幕格式）和现画差不多快
+（第一关 14.1 / 15.1 ms，第二关 10.0 / 4.5 ms，第三关 20.6 / 18.5 ms），
+省不下时间，反而要缓存目录、按代码哈希失效和清理旧文件。
+"""
+
+import view
+import display
+
+
+# (关卡, 宽, 高, 缩放比例) -> 画好的 Surface（已转成屏幕格式，换显示模式时重转）
+_surfaces = display.cache({}, alpha=False)
+
+
+def _key(level_id, width, height):
+    return (level_id, width, height, view.scale)
+
+
+@display.on_rescale
+def _forget_other_scales():
+    """窗口比例变了：别的比例下画的地面用不上了，不再占内存"""
+    for key in [k for k in _surfaces if k[3] != view.scale]:
+        del _surfaces[key]
+
+
+def _renderer(level_id):
+    from level import GROUND_RENDERERS   # level 导入本模块，这里延迟导入
+    return GROUND_RENDERERS[level_id]
+
+
+def render(level_id, width, height):
+    surf = view.Surface((width, height))
+    _renderer(level_id)(surf, width, height)
+    return surf
+
+
+def get_ground(level_id, width, height):
+    """取一关的地面：进程内已有就复用，否则现画"""
+    key = _key(level_id, width, height)
+    surf = _surfaces.get(key)
+    if surf is None:
+        surf = display.convert(render(level_id, width, height), alpha=False)
+        _surfaces[key] = surf
+    return surf
+
+
+def warm(width, height, levels=(1, 2, 3)):
+    """生成器：预先画好这几关的地面，每关一块（见 tasks.py）"""
+    for level_id in levels:
+        get_ground(level_id, width, height)
+        yield
@@ -0,0 +1,104 @@
+"""
+idle.py —— 空闲降频与失焦暂停
+包含：跟踪最近一次输入和窗口焦点 / 最小化状态、按本帧有没有东西在动选择
+等下一帧的方式（全速 / 低帧率 / 阻塞等事件），事件等待期间有输入立即醒
+
+菜单、帮助、结算画面没人操作时没必要每秒画 60 帧：
+
+    events = idle.events()                  # 代替 pygame.event.get()
+    ...
+    frame_ms = idle.wait(clock, fps, animating, ambient)   # 代替 clock.tick(fps)
+
+  animating  有必须流畅的动画（游戏画面、纸屑、后台任务没跑完）→ 照常 clock.tick(fps)
+  ambient    只有装饰性的循环动画（浮动圆、标题跳动）→ 没输入超过 IDLE_AFTER_MS 后
+             降到 IDLE_FPS；动画按帧推进，降频后只是变慢，不会跳
+  都没有     画面不会自己变 → 阻塞在 pygame.event.wait 上，最长 STILL_WAIT_MS 醒一次
+             （让后台任务和 GC 有机会跑）
+
+窗口最小化或失去焦点时一律按"都没有"处理；游戏画面里失去焦点时 paused 为真，
+由主循环暂停游戏（不更新、不推进计时、不录像），点回窗口继续。
+低帧率和阻塞都用 pygame.event.wait 等，来了事件立即返回，这个事件留到下一帧的
+events() 里交还，不会丢也不会乱序。
+
+--replay 回放、无窗口测试（自己传入事件）时不降频；--no-idle 关闭。
+"""
+
+import pygame
+
+
+IDLE_AFTER_MS = 2000    # 多久没输入算空闲
+IDLE_FPS = 10           # 空闲时装饰动画的帧率
+STILL_WAIT_MS = 1000    # 画面不动时最长阻塞多久
+
+# 这些事件不算"有人在操作"
+_PASSIVE = frozenset((
+    pygame.NOEVENT,
+    pygame.WINDOWFOCUSLOST,
+    pygame.WINDOWMINIMIZED,
+    pygame.WINDOWHIDDEN,
+    pygame.WINDOWLEAVE,
+))
+
+
+class IdleThrottle:
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.focused = True
+        self.visible = True
+        self.idle_frames = 0        # 降频或阻塞等待的帧数
+        self._pending = []          # event.wait 醒来时取到的事件，下一帧交还
+        self._last_input = pygame.time.get_ticks()
+
+    # --------------------------------------------------
+    #  事件
+    # --------------------------------------------------
+    def events(self):
+        """本帧的事件：上次等待时取到的 + 队列里的"""
+        events = self._pending + pygame.event.get()
+        self._pending = []
+        self.note(events)
+        return events
+
+    def note(self, events):
+        for event in events:
+            kind = event.type
+            if kind == pygame.WINDOWFOCUSLOST:
+                self.focused = False
+            elif kind == pygame.WINDOWFOCUSGAINED:
+                self.focused = True
+            elif kind in (pygame.WINDOWMINIMIZED, pygame.WINDOWHIDDEN):
+                self.visible = False
+            elif kind in (pygame.WINDOWRESTORED, pygame.WINDOWSHOWN,
+                          pygame.WINDOWEXPOSED, pygame.WINDOWMAXIMIZED):
+                self.visible = True
+            if kind not in _PASSIVE:
+                self._last_input = pygame.time.get_ticks()
+
+    @property
+    def paused(self):
+        """窗口最小化或失去焦点（游戏画面据此暂停）"""
+        return self.enabled and not (self.focused and self.visible)
+
+    # --------------------------------------------------
+    #  等下一帧
+    # --------------------------------------------------
+    def wait(self, clock, fps, animating, ambient=False):
+        """代替 clock.tick(fps)，返回值也一样是上一帧到现在的 ms"""
+        if not self.enabled or not fps:
+            return clock.tick(fps)
+        if self.focused and self.visible:
+            if animating:
+                return clock.tick(fps)
+            quiet = pygame.time.get_ticks() - self._last_input
+            if quiet < IDLE_AFTER_MS:
+                return clock.tick(fps)
+            if ambient:
+                return self._block(clock, 1000 // IDLE_FPS)
+        return self._block(clock, STILL_WAIT_MS)
+
+    def _block(self, clock, timeout_ms):
+        self.idle_frames += 1
+        event = pygame.event.wait(timeout_ms)
+        if event.type != pygame.NOEVENT:
+            self._pending.append(event)
+        return clock.tick()
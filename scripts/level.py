@@ -7,13 +7,25 @@ import pygame
 import math
 import random
 import os
+import copy
 
 from items import (
     Trash, TrashBin, TRASH_DATA,
     Faucet, Puddle,
     SeedlingPile, PlantSpot, Lumberjack,
-    Decoration,
+    Decoration, warm_fonts as warm_item_fonts,
 )
+from ecs import ComponentStore
+from spawn import PoissonSpawner
+from collision import bake_collision_map
+from flowfield import FlowField
+from timers import Scheduler
+from tracing import traced
+import rng
+import groundcache
+import view
+import display
+import quality
 from gfx import (
     draw_soft_circle, draw_soft_ellipse, draw_rounded_card,
     draw_pill_badge, draw_progress_bar, draw_shadow,
@@ -25,8 +37,12 @@ from gfx import (
     WATER, WATER_LIGHT,
 )
 
+# 刷新垃圾、重开水龙头、散布伐木工人用的随机数流
+_rng = rng.stream("level")
+
 # 共享字体缓存
 _cached_fonts = {}
+display.on_rescale(_cached_fonts.clear)   # 字号按画布比例，比例变了重开
 
 def _get_font(size):
     if size in _cached_fonts:
@@ -40,16 +56,24 @@ def _get_font(size):
     for p in paths:
         if os.path.exists(p):
             try:
-                f = pygame.font.Font(p, size)
+                f = view.font(p, size)
                 _cached_fonts[size] = f
                 return f
             except Exception:
                 continue
-    f = pygame.font.Font(None, size)
+    f = view.font(None, size)
     _cached_fonts[size] = f
     return f
 
 
+def warm_fonts():
+    """生成器：预先打开 HUD 和物体标签用的字号（见 tasks.py）"""
+    for size in (24, 26):
+        _get_font(size)
+        yield
+    yield from warm_item_fonts()
+
+
 # ============================================================
 #  关卡配置信息
 # ============================================================
@@ -60,6 +84,9 @@ LEVEL_CONFIGS = {
         "target_score": 15,
         "tip": "空格键拾取/投放垃圾，送到对应颜色的垃圾桶！",
         "color": BLUE,
+        # 场上剩余垃圾少于 trash_min 个时补刷 trash_refill 个
+        "trash_min": 5,
+        "trash_refill": 8,
     },
     2: {
         "name": "第二关：节约用水",
@@ -68,6 +95,8 @@ LEVEL_CONFIGS = {
         "time_limit": 60,
         "tip": "空格键关水龙头，小心水坑会让你滑倒减速！",
         "color": WATER,
+        # 每隔多少帧随机重新打开一个已关的水龙头
+        "faucet_reopen_interval": 300,
     },
     3: {
         "name": "第三关：植树造林",
@@ -75,6 +104,13 @@ LEVEL_CONFIGS = {
         "target_score": 12,
         "tip": "先去树苗堆拿树苗，再到土坑按空格种下！",
         "color": GREEN,
+        # 伐木工人数量与行为："patrol" 左右巡逻；
+        # "duck" / "unplanted" / "planted" 沿共享流场追小鸭 / 空土坑 / 已种的树
+        "lumberjacks": 3,
+        "lumberjack_ai": "patrol",
+        # 伐木工人巡逻速度（像素 / 帧）在这个范围内随机
+        "lumberjack_speed_min": 1.0,
+        "lumberjack_speed_max": 2.0,
     },
 }
 
@@ -83,25 +119,37 @@ LEVEL_CONFIGS = {
 #  游戏世界
 # ============================================================
 class GameWorld:
-    def __init__(self, level_id, screen_width=1440, screen_height=900):
+    def __init__(self, level_id, screen_width=1440, screen_height=900,
+                 scheduler=None):
         self.level_id = level_id
         self.screen_width = screen_width
         self.screen_height = screen_height
         self.objects = []
         self.decorations = []
+        self.walls = []
+        # 所有动画物体共用的组件存储，update() 一次推进
+        self.store = ComponentStore()
         self.score = 0
-        self.time_left = -1
-        self.timer_frames = 0
+
+        # 关卡倒计时和周期事件登记在调度器里；
+        # 没有外部调度器时自带一个，由 update() 推进
+        self._owns_scheduler = scheduler is None
+        self.scheduler = scheduler if scheduler is not None else Scheduler()
+        self._time_limit_t = None
 
         # 第二关专用
-        self.faucet_reopen_timer = 0
-        self.faucet_reopen_interval = 300
+        self.faucet_reopen_interval = LEVEL_CONFIGS[2]["faucet_reopen_interval"]
+        self._faucet_reopen_t = None
 
         # 预渲染的地面贴图（避免每帧重绘）
         self._ground_cache = None
 
+        # 垃圾出生点采样器（首次刷垃圾时按装饰物登记禁区）
+        self._trash_spawner = None
+
         self._build_level()
 
+    @traced("GameWorld.build")
     def _build_level(self):
         if self.level_id == 1:
             self._build_level_1()
@@ -109,6 +157,15 @@ class GameWorld:
             self._build_level_2()
         elif self.level_id == 3:
             self._build_level_3()
+        # 场景摆好后烘焙一次碰撞位图，之后每步移动只查一个像素
+        self.collision = bake_collision_map(
+            self.screen_width, self.screen_height, self.decorations, self.walls)
+        # 追击型伐木工人共用一张流场
+        self.chase_target = LEVEL_CONFIGS[self.level_id].get("lumberjack_ai",
+                                                               "patrol")
+        if self.chase_target != "patrol":
+            self.store.flow_field = FlowField(
+                self.screen_width, self.screen_height, self.collision)
 
     # --------------------------------------------------
     #  第一关：操场
@@ -120,8 +177,6 @@ class GameWorld:
         for cat, bx in zip(categories, bin_positions):
             self.objects.append(TrashBin(bx, bin_y, cat))
 
-        self._spawn_trash(20)
-
         # 丰富装饰
         self.decorations.append(Decoration(100, 315, "slide"))
         self.decorations.append(Decoration(1340, 315, "swing"))
@@ -135,33 +190,60 @@ class GameWorld:
         for x_pos in [130, 420, 1000, 1310]:
             self.decorations.append(Decoration(x_pos, 830, "flower"))
 
-    def _spawn_trash(self, count):
+        self._spawn_trash(20)
+
+    def make_spawner(self, area, min_dist, margin=10):
+        """
+        建一个泊松圆盘采样器，禁区为垃圾桶卡片和所有装饰物。
+        垃圾、水坑、种植点的随机布局都可以共用。
+        """
+        spawner = PoissonSpawner(area, min_dist)
+        if self.level_id == 1:
+            spawner.exclude_rect((40, 72, 1360, 108), margin)
+        for deco in self.decorations:
+            spawner.exclude_rect(deco.get_rect(), margin)
+        for obj in self.objects:
+            if isinstance(obj, (TrashBin, Faucet, SeedlingPile)):
+                spawner.exclude_rect(obj.get_rect(), margin)
+        return spawner
+
+    def _spawn_trash(self, count, avoid=()):
+        """
+        刷出 count 个垃圾：互不重叠，也不压在垃圾桶、装饰物上。
+        avoid: 额外避开的圆 [(x, y, r)]，例如小鸭当前位置
+        """
+        if self._trash_spawner is None:
+            area = (120, 235, self.screen_width - 240, self.screen_height - 335)
+            self._trash_spawner = self.make_spawner(area, 48)
+        existing = [(o.x, o.y) for o in self.objects
+                    if isinstance(o, Trash) and o.active]
+        points = self._trash_spawner.sample(count, existing, avoid, rng=_rng)
         categories = list(TRASH_DATA.keys())
-        for _ in range(count):
-            x = random.randint(120, self.screen_width - 120)
-            y = random.randint(235, self.screen_height - 100)
-            cat = random.choice(categories)
-            self.objects.append(Trash(x, y, cat))
+        for x, y in points:
+            cat = _rng.choice(categories)
+            self.objects.append(Trash(x, y, cat, self.store))
 
     # --------------------------------------------------
     #  第二关：教室饭堂
     # --------------------------------------------------
     def _build_level_2(self):
         config = LEVEL_CONFIGS[2]
-        self.time_left = config["time_limit"] * 60
+        self._time_limit_t = self.scheduler.after(config["time_limit"] * 60)
+        self._faucet_reopen_t = self.scheduler.every(
+            self.faucet_reopen_interval, self._reopen_random_faucet)
 
         faucet_positions = [
             (200, 128), (480, 128), (760, 128), (1040, 128), (1320, 128),
             (200, 428), (680, 428), (1160, 428),
         ]
         for fx, fy in faucet_positions:
-            self.objects.append(Faucet(fx, fy))
+            self.objects.append(Faucet(fx, fy, self.store))
 
         puddle_positions = [
             (340, 300), (860, 540), (510, 690), (1120, 300), (250, 620),
         ]
         for px, py in puddle_positions:
-            self.objects.append(Puddle(px, py))
+            self.objects.append(Puddle(px, py, self.store))
 
         desk_positions = [
             (300, 620), (580, 620), (860, 620), (1140, 620),
@@ -174,6 +256,9 @@ class GameWorld:
         self.decorations.append(Decoration(130, 280, "sink"))
         self.decorations.append(Decoration(1310, 280, "sink"))
 
+        # 顶部墙壁带（水龙头挂在墙上，小鸭只能站在墙下）
+        self.walls.append((0, 75, self.screen_width, 90))
+
     # --------------------------------------------------
     #  第三关：荒地公园
     # --------------------------------------------------
@@ -188,11 +273,7 @@ class GameWorld:
             (420, 750), (770, 780),
         ]
         for px, py in plant_positions:
-            self.objects.append(PlantSpot(px, py))
-
-        self.objects.append(Lumberjack(510, 255, 170, 1270))
-        self.objects.append(Lumberjack(860, 495, 170, 1270))
-        self.objects.append(Lumberjack(340, 690, 170, 1270))
+            self.objects.append(PlantSpot(px, py, self.store))
 
         self.decorations.append(Decoration(80, 120, "bush"))
         self.decorations.append(Decoration(1360, 120, "bush"))
@@ -203,26 +284,100 @@ class GameWorld:
         self.decorations.append(Decoration(250, 840, "grass"))
         self.decorations.append(Decoration(1170, 840, "grass"))
 
+        config = LEVEL_CONFIGS[3]
+        chase = config.get("lumberjack_ai", "patrol") != "patrol"
+        count = config.get("lumberjacks", 3)
+        lumberjack_positions = [(510, 255), (860, 495), (340, 690)][:count]
+        if count > len(lumberjack_positions):
+            # 更高难度：多出来的伐木工人随机散布在场地里
+            spawner = self.make_spawner(
+                (170, 120, 1100, self.screen_height - 200), 24)
+            lumberjack_positions += spawner.sample(
+                count - len(lumberjack_positions),
+                existing=lumberjack_positions, rng=_rng)
+        speed_range = (config["lumberjack_speed_min"],
+                       config["lumberjack_speed_max"])
+        for lx, ly in lumberjack_positions:
+            self.objects.append(Lumberjack(lx, ly, 170, 1270, self.store,
+                                           chase=chase, speed_range=speed_range))
+
     # --------------------------------------------------
     #  更新
     # --------------------------------------------------
-    def update(self):
+    def update(self, player_pos=None):
+        """
+        player_pos: 小鸭坐标，追击小鸭的伐木工人用它做流场目标
+        """
+        if self.store.flow_field is not None:
+            self._update_chase_goals(player_pos)
+        # 摆动、巡逻、生长、滴水：每类组件一次数组运算
+        self.store.step()
+        if self._owns_scheduler:
+            self.scheduler.tick()
+
+    def _update_chase_goals(self, player_pos):
+        """目标所在格变化时流场才会重算"""
+        if self.chase_target == "duck":
+            goals = [player_pos] if player_pos is not None else []
+        else:
+            want_planted = self.chase_target == "planted"
+            goals = [(o.x, o.y) for o in self.objects
+                     if isinstance(o, PlantSpot) and o.planted == want_planted]
+        self.store.flow_field.set_goals(goals)
+
+    @property
+    def time_left(self):
+        """剩余帧数；没有时间限制的关卡为 -1"""
+        if self._time_limit_t is None:
+            return -1
+        return self.scheduler.remaining(self._time_limit_t)
+
+    @property
+    def faucet_reopen_timer(self):
+        if self._faucet_reopen_t is None:
+            return 0
+        return (self.faucet_reopen_interval
+                - self.scheduler.remaining(self._faucet_reopen_t))
+
+    def snapshot(self):
+        """
+        绘制线程用的只读副本（见 pipeline.py）：活动物体浅拷贝并改挂到组件数组的拷贝上，
+        时钟停在当前帧；装饰物和墙不会变，直接共用。
+        """
+        snap = copy.copy(self)
+        store = self.store.snapshot()
+        snap.store = store
+        snap.scheduler = self.scheduler.snapshot()
+        objects = []
         for obj in self.objects:
-            obj.update()
-
-        if self.level_id == 2:
-            if self.time_left > 0:
-                self.time_left -= 1
-            self.faucet_reopen_timer += 1
-            if self.faucet_reopen_timer >= self.faucet_reopen_interval:
-                self.faucet_reopen_timer = 0
-                self._reopen_random_faucet()
+            if obj.active:
+                obj = copy.copy(obj)
+                if obj.store is self.store:
+                    obj.store = store
+                objects.append(obj)
+        snap.objects = objects
+        return snap
+
+    def dispose(self):
+        """撤下这个世界：取消它登记在共享调度器里的定时器"""
+        self.scheduler.cancel(self._time_limit_t)
+        self.scheduler.cancel(self._faucet_reopen_t)
+
+    def prune_inactive(self):
+        """移走已被捡起的垃圾并回收它们的组件行（第一关无限刷新时列表不再增长）"""
+        keep = []
+        for obj in self.objects:
+            if isinstance(obj, Trash) and not obj.active:
+                self.store.release(obj)
+            else:
+                keep.append(obj)
+        self.objects = keep
 
     def _reopen_random_faucet(self):
         closed = [o for o in self.objects
                   if isinstance(o, Faucet) and not o.is_open]
         if closed:
-            faucet = random.choice(closed)
+            faucet = _rng.choice(closed)
             faucet.reopen()
 
     # --------------------------------------------------
@@ -273,162 +428,38 @@ class GameWorld:
         return 0
 
     # --------------------------------------------------
-    #  绘制场景  — 预渲染缓存
+    #  绘制场景  — 预渲染缓存（进程内复用见 groundcache.py）
     # --------------------------------------------------
+    def load_ground(self):
+        """取地面贴图（窗口比例变了会被置空，下次 draw_ground 时重取）"""
+        self._ground_cache = groundcache.get_ground(
+            self.level_id, self.screen_width, self.screen_height)
+        display.keep(self, "_ground_cache", alpha=False, sized=True)
+
     def draw_ground(self, screen):
         if self._ground_cache is None:
-            self._ground_cache = pygame.Surface(
-                (self.screen_width, self.screen_height))
-            if self.level_id == 1:
-                self._render_playground(self._ground_cache)
-            elif self.level_id == 2:
-                self._render_classroom(self._ground_cache)
-            elif self.level_id == 3:
-                self._render_wasteland(self._ground_cache)
-        screen.blit(self._ground_cache, (0, 0))
-
-    def _render_playground(self, surf):
-        """第一关：操场 — 柔和草地 + 跑道"""
-        # 渐变草地
-        for y in range(self.screen_height):
-            t = y / self.screen_height
-            r = int(148 + 25 * t)
-            g = int(215 - 20 * t)
-            b = int(110 + 15 * t)
-            pygame.draw.line(surf, (r, g, b), (0, y), (self.screen_width, y))
-
-        # 跑道
-        track_rect = pygame.Rect(130, 240, 1180, 590)
-        pygame.draw.ellipse(surf, (212, 175, 140), track_rect)
-        inner = track_rect.inflate(-120, -110)
-        pygame.draw.ellipse(surf, (138, 205, 108), inner)
-        # 跑道线 — 柔和白色
-        pygame.draw.ellipse(surf, (255, 255, 255, 180), track_rect, 4)
-        mid = track_rect.inflate(-60, -55)
-        pygame.draw.ellipse(surf, (255, 255, 255, 100), mid, 2)
-        pygame.draw.ellipse(surf, (255, 255, 255, 180), inner, 4)
-
-        # 中间草地纹理 — 浅色圆点
-        rng = random.Random(42)
-        for _ in range(70):
-            fx = rng.randint(inner.left + 35, inner.right - 35)
-            fy = rng.randint(inner.top + 35, inner.bottom - 35)
-            c = rng.choice([(120, 200, 95), (130, 210, 100), (110, 190, 85)])
-            pygame.draw.circle(surf, c, (fx, fy), rng.randint(3, 8))
-
-        # 小雏菊
-        rng2 = random.Random(123)
-        for _ in range(14):
-            fx = rng2.randint(inner.left + 50, inner.right - 50)
-            fy = rng2.randint(inner.top + 50, inner.bottom - 50)
-            for a in range(0, 360, 60):
-                dx = int(6 * math.cos(math.radians(a)))
-                dy = int(6 * math.sin(math.radians(a)))
-                pygame.draw.circle(surf, WHITE, (fx + dx, fy + dy), 3)
-            pygame.draw.circle(surf, YELLOW, (fx, fy), 3)
-
-        # 垃圾桶区域 — 圆角卡片
-        card_surf = pygame.Surface((1360, 108), pygame.SRCALPHA)
-        pygame.draw.rect(card_surf, (240, 238, 230, 200), (0, 0, 1360, 108),
-                         border_radius=16)
-        pygame.draw.rect(card_surf, (210, 208, 200, 150), (0, 0, 1360, 108),
-                         width=2, border_radius=16)
-        surf.blit(card_surf, (40, 72))
-
-    def _render_classroom(self, surf):
-        """第二关：教室/饭堂 — 瓷砖地板"""
-        # 温暖底色
-        surf.fill((235, 220, 198))
-
-        # 瓷砖 — 棋盘格
-        tile = 80
-        colors = [(230, 218, 195), (222, 210, 185)]
-        for tx in range(0, self.screen_width, tile):
-            for ty in range(0, self.screen_height, tile):
-                ci = ((tx // tile) + (ty // tile)) % 2
-                pygame.draw.rect(surf, colors[ci], (tx, ty, tile, tile))
-                # 砖缝
-                pygame.draw.rect(surf, (210, 198, 175), (tx, ty, tile, tile), 1)
-
-        # 墙壁带
-        for wy in [75, 385]:
-            # 墙壁
-            pygame.draw.rect(surf, (200, 205, 212), (0, wy, self.screen_width, 90))
-            # 顶部线
-            pygame.draw.line(surf, (180, 185, 192),
-                             (0, wy), (self.screen_width, wy), 3)
-            # 底部线
-            pygame.draw.line(surf, (180, 185, 192),
-                             (0, wy + 90), (self.screen_width, wy + 90), 3)
-            # 腰线
-            pygame.draw.line(surf, (170, 175, 185),
-                             (0, wy + 45), (self.screen_width, wy + 45), 2)
-            # 高光
-            hl = pygame.Surface((self.screen_width, 8), pygame.SRCALPHA)
-            hl.fill((255, 255, 255, 30))
-            surf.blit(hl, (0, wy + 3))
-
-    def _render_wasteland(self, surf):
-        """第三关：荒地/公园 — 泥土质感"""
-        # 渐变泥土
-        for y in range(self.screen_height):
-            t = y / self.screen_height
-            r = int(175 + 20 * t)
-            g = int(155 + 15 * t)
-            b = int(115 + 10 * t)
-            pygame.draw.line(surf, (r, g, b), (0, y), (self.screen_width, y))
-
-        # 草皮块 — 柔和椭圆
-        rng = random.Random(77)
-        grass_spots = [
-            (80, 75, 180, 100), (380, 225, 150, 85),
-            (880, 120, 210, 85), (1140, 465, 165, 100),
-            (150, 690, 200, 85), (720, 735, 180, 85),
-            (600, 90, 130, 70), (1040, 720, 115, 62),
-        ]
-        for gx, gy, gw, gh in grass_spots:
-            # 柔和边缘
-            s = pygame.Surface((gw + 14, gh + 14), pygame.SRCALPHA)
-            pygame.draw.ellipse(s, (130, 185, 95, 60), (0, 0, gw + 14, gh + 14))
-            pygame.draw.ellipse(s, (140, 195, 100, 120), (7, 7, gw, gh))
-            surf.blit(s, (gx - 7, gy - 7))
-            # 草纹
-            for _ in range(8):
-                fx = gx + rng.randint(15, gw - 15)
-                fy = gy + rng.randint(8, gh - 8)
-                pygame.draw.circle(surf, (120, 180, 85), (fx, fy), 3)
-
-        # 小路 — 圆角
-        path_s = pygame.Surface((self.screen_width, self.screen_height), pygame.SRCALPHA)
-        pygame.draw.rect(path_s, (155, 140, 105, 160),
-                         (660, 0, 80, self.screen_height), border_radius=12)
-        pygame.draw.rect(path_s, (155, 140, 105, 160),
-                         (0, 420, self.screen_width, 65), border_radius=12)
-        surf.blit(path_s, (0, 0))
-
-        # 石子
-        rng2 = random.Random(55)
-        for _ in range(25):
-            sx = rng2.randint(666, 735)
-            sy = rng2.randint(15, self.screen_height - 15)
-            pygame.draw.circle(surf, (140, 128, 95), (sx, sy), rng2.randint(3, 6))
-        for _ in range(25):
-            sx = rng2.randint(15, self.screen_width - 15)
-            sy = rng2.randint(428, 478)
-            pygame.draw.circle(surf, (140, 128, 95), (sx, sy), rng2.randint(3, 6))
-
-        # 树苗堆区域
-        for rx in [25, 1270]:
-            area = pygame.Surface((150, 120), pygame.SRCALPHA)
-            pygame.draw.rect(area, (120, 140, 85, 100), (0, 0, 150, 120),
-                             border_radius=18)
-            pygame.draw.rect(area, (100, 120, 70, 80), (0, 0, 150, 120),
-                             width=3, border_radius=18)
-            surf.blit(area, (rx, 390))
+            self.load_ground()
+        view.blit(screen, self._ground_cache, (0, 0))
 
     # --------------------------------------------------
     #  绘制物体
     # --------------------------------------------------
+    def warm_up(self, font=None):
+        """
+        生成器：把进关第一帧才做的准备提前做掉，每做一块 yield 一次（见 tasks.py）。
+        取地面贴图，把物体和 HUD 往草稿上画一遍（第一次画时才加载的字体就都加载好了）。
+        装饰物每帧用随机数画草叶，不画它们。
+        """
+        self.load_ground()
+        yield
+        scratch = view.Surface((self.screen_width, self.screen_height))
+        for obj in self.objects:
+            if obj.active:
+                obj.draw(scratch)
+        yield
+        if font is not None:
+            self.draw_hud(scratch, font, 3)
+
     def draw_objects(self, screen):
         for deco in self.decorations:
             deco.draw(screen)
@@ -444,11 +475,11 @@ class GameWorld:
         sw = self.screen_width
 
         # ---- 顶部栏 ----
-        hud = pygame.Surface((sw, 72), pygame.SRCALPHA)
-        pygame.draw.rect(hud, (255, 255, 255, 210), (0, 0, sw, 72))
+        hud = view.Surface((sw, 72), pygame.SRCALPHA)
+        view.draw.rect(hud, (255, 255, 255, 210), (0, 0, sw, 72))
         # 底边线
-        pygame.draw.line(hud, (0, 0, 0, 20), (0, 71), (sw, 71), 1)
-        screen.blit(hud, (0, 0))
+        view.draw.line(hud, (0, 0, 0, 20), (0, 71), (sw, 71), 1)
+        view.blit(screen, hud, (0, 0))
 
         font_name = _get_font(26)
         font_score = _get_font(24)
@@ -468,7 +499,7 @@ class GameWorld:
             score_str = f"已种 {self.score}/{config['target_score']}"
 
         score_surf = font_score.render(score_str, True, CHARCOAL)
-        screen.blit(score_surf, (350, 9))
+        view.blit(screen, score_surf, (350, 9))
 
         # 进度条
         progress = min(1.0, self.score / max(1, config["target_score"]))
@@ -490,47 +521,276 @@ class GameWorld:
             hx = sw - 55 - i * 48
             hy = 28
             # 阴影
-            s = pygame.Surface((36, 36), pygame.SRCALPHA)
-            self._draw_heart(s, 18, 16, 13, (0, 0, 0, 30))
-            screen.blit(s, (hx - 18 + 2, hy - 16 + 3))
+            if quality.shadows:
+                s = view.Surface((36, 36), pygame.SRCALPHA)
+                self._draw_heart(s, 18, 16, 13, (0, 0, 0, 30))
+                view.blit(screen, s, (hx - 18 + 2, hy - 16 + 3))
             # 红心
             self._draw_heart(screen, hx, hy, 13, (234, 67, 83))
             # 高光
-            hl = pygame.Surface((10, 10), pygame.SRCALPHA)
-            pygame.draw.circle(hl, (255, 255, 255, 80), (5, 5), 5)
-            screen.blit(hl, (hx - 6, hy - 10))
+            if quality.highlights:
+                hl = view.Surface((10, 10), pygame.SRCALPHA)
+                view.draw.circle(hl, (255, 255, 255, 80), (5, 5), 5)
+                view.blit(screen, hl, (hx - 6, hy - 10))
 
     def _draw_heart(self, surface, cx, cy, size, color):
         """画一个可爱的爱心"""
         r = size * 0.55
-        pygame.draw.circle(surface, color,
-                           (int(cx - r * 0.7), int(cy - r * 0.3)), int(r))
-        pygame.draw.circle(surface, color,
-                           (int(cx + r * 0.7), int(cy - r * 0.3)), int(r))
-        pygame.draw.polygon(surface, color, [
+        view.draw.circle(surface, color,
+                         (int(cx - r * 0.7), int(cy - r * 0.3)), int(r))
+        view.draw.circle(surface, color,
+                         (int(cx + r * 0.7), int(cy - r * 0.3)), int(r))
+        view.draw.polygon(surface, color, [
             (int(cx - size * 0.9), int(cy)),
             (cx, int(cy + size * 1.1)),
             (int(cx + size * 0.9), int(cy)),
         ])
 
 
+# ============================================================
+#  地面贴图
+# ============================================================
+# 三关的地面只由关卡号和分辨率决定（随机纹理用固定种子），
+# 画好一次就能一直复用，见 groundcache.py
+@traced
+def render_playground(surf, width, height):
+    """第一关：操场 — 柔和草地 + 跑道"""
+    # 渐变草地
+    for y in range(height):
+        t = y / height
+        r = int(148 + 25 * t)
+        g = int(215 - 20 * t)
+        b = int(110 + 15 * t)
+        view.draw.line(surf, (r, g, b), (0, y), (width, y))
+
+    # 跑道
+    track_rect = pygame.Rect(130, 240, 1180, 590)
+    view.draw.ellipse(surf, (212, 175, 140), track_rect)
+    inner = track_rect.inflate(-120, -110)
+    view.draw.ellipse(surf, (138, 205, 108), inner)
+    # 跑道线 — 柔和白色
+    view.draw.ellipse(surf, (255, 255, 255, 180), track_rect, 4)
+    mid = track_rect.inflate(-60, -55)
+    view.draw.ellipse(surf, (255, 255, 255, 100), mid, 2)
+    view.draw.ellipse(surf, (255, 255, 255, 180), inner, 4)
+
+    # 中间草地纹理 — 浅色圆点
+    rng = random.Random(42)
+    for _ in range(70):
+        fx = rng.randint(inner.left + 35, inner.right - 35)
+        fy = rng.randint(inner.top + 35, inner.bottom - 35)
+        c = rng.choice([(120, 200, 95), (130, 210, 100), (110, 190, 85)])
+        view.draw.circle(surf, c, (fx, fy), rng.randint(3, 8))
+
+    # 小雏菊
+    rng2 = random.Random(123)
+    for _ in range(14):
+        fx = rng2.randint(inner.left + 50, inner.right - 50)
+        fy = rng2.randint(inner.top + 50, inner.bottom - 50)
+        for a in range(0, 360, 60):
+            dx = int(6 * math.cos(math.radians(a)))
+            dy = int(6 * math.sin(math.radians(a)))
+            view.draw.circle(surf, WHITE, (fx + dx, fy + dy), 3)
+        view.draw.circle(surf, YELLOW, (fx, fy), 3)
+
+    # 垃圾桶区域 — 圆角卡片
+    card_surf = view.Surface((1360, 108), pygame.SRCALPHA)
+    view.draw.rect(card_surf, (240, 238, 230, 200), (0, 0, 1360, 108),
+                   border_radius=16)
+    view.draw.rect(card_surf, (210, 208, 200, 150), (0, 0, 1360, 108),
+                   width=2, border_radius=16)
+    view.blit(surf, card_surf, (40, 72))
+
+@traced
+def render_classroom(surf, width, height):
+    """第二关：教室/饭堂 — 瓷砖地板"""
+    # 温暖底色
+    surf.fill((235, 220, 198))
+
+    # 瓷砖 — 棋盘格
+    tile = 80
+    colors = [(230, 218, 195), (222, 210, 185)]
+    for tx in range(0, width, tile):
+        for ty in range(0, height, tile):
+            ci = ((tx // tile) + (ty // tile)) % 2
+            view.draw.rect(surf, colors[ci], (tx, ty, tile, tile))
+            # 砖缝
+            view.draw.rect(surf, (210, 198, 175), (tx, ty, tile, tile), 1)
+
+    # 墙壁带
+    for wy in [75, 385]:
+        # 墙壁
+        view.draw.rect(surf, (200, 205, 212), (0, wy, width, 90))
+        # 顶部线
+        view.draw.line(surf, (180, 185, 192),
+                       (0, wy), (width, wy), 3)
+        # 底部线
+        view.draw.line(surf, (180, 185, 192),
+                       (0, wy + 90), (width, wy + 90), 3)
+        # 腰线
+        view.draw.line(surf, (170, 175, 185),
+                       (0, wy + 45), (width, wy + 45), 2)
+        # 高光
+        hl = view.Surface((width, 8), pygame.SRCALPHA)
+        hl.fill((255, 255, 255, 30))
+        view.blit(surf, hl, (0, wy + 3))
+
+@traced
+def render_wasteland(surf, width, height):
+    """第三关：荒地/公园 — 泥土质感"""
+    # 渐变泥土
+    for y in range(height):
+        t = y / height
+        r = int(175 + 20 * t)
+        g = int(155 + 15 * t)
+        b = int(115 + 10 * t)
+        view.draw.line(surf, (r, g, b), (0, y), (width, y))
+
+    # 草皮块 — 柔和椭圆
+    rng = random.Random(77)
+    grass_spots = [
+        (80, 75, 180, 100), (380, 225, 150, 85),
+        (880, 120, 210, 85), (1140, 465, 165, 100),
+        (150, 690, 200, 85), (720, 735, 180, 85),
+        (600, 90, 130, 70), (1040, 720, 115, 62),
+    ]
+    for gx, gy, gw, gh in grass_spots:
+        # 柔和边缘
+        s = view.Surface((gw + 14, gh + 14), pygame.SRCALPHA)
+        view.draw.ellipse(s, (130, 185, 95, 60), (0, 0, gw + 14, gh + 14))
+        view.draw.ellipse(s, (140, 195, 100, 120), (7, 7, gw, gh))
+        view.blit(surf, s, (gx - 7, gy - 7))
+        # 草纹
+        for _ in range(8):
+            fx = gx + rng.randint(15, gw - 15)
+            fy = gy + rng.randint(8, gh - 8)
+            view.draw.circle(surf, (120, 180, 85), (fx, fy), 3)
+
+    # 小路 — 圆角
+    path_s = view.Surface((width, height), pygame.SRCALPHA)
+    view.draw.rect(path_s, (155, 140, 105, 160),
+                   (660, 0, 80, height), border_radius=12)
+    view.draw.rect(path_s, (155, 140, 105, 160),
+                   (0, 420, width, 65), border_radius=12)
+    view.blit(surf, path_s, (0, 0))
+
+    # 石子
+    rng2 = random.Random(55)
+    for _ in range(25):
+        sx = rng2.randint(666, 735)
+        sy = rng2.randint(15, height - 15)
+        view.draw.circle(surf, (140, 128, 95), (sx, sy), rng2.randint(3, 6))
+    for _ in range(25):
+        sx = rng2.randint(15, width - 15)
+        sy = rng2.randint(428, 478)
+        view.draw.circle(surf, (140, 128, 95), (sx, sy), rng2.randint(3, 6))
+
+    # 树苗堆区域
+    for rx in [25, 1270]:
+        area = view.Surface((150, 120), pygame.SRCALPHA)
+        view.draw.rect(area, (120, 140, 85, 100), (0, 0, 150, 120),
+                       border_radius=18)
+        view.draw.rect(area, (100, 120, 70, 80), (0, 0, 150, 120),
+                       width=3, border_radius=18)
+        view.blit(surf, area, (rx, 390))
+
+
+GROUND_RENDERERS = {
+    1: render_playground,
+    2: render_classroom,
+    3: render_wasteland,
+}
+
+
+# ============================================================
+#  下一关预载
+# ============================================================
+class WorldPreload:
+    """
+    用协作式任务（tasks.py）分几帧建好一关的 GameWorld 并预热，不占满任何一帧。
+    过关画面期间没有别处用关卡 / 物体的随机数流，所以建出来的世界
+    和点"下一关"时现建的完全一样，录像回放不受影响。
+    """
+
+    def __init__(self, level_id, screen_width, screen_height, scheduler, tasks,
+                 font=None):
+        self.level_id = level_id
+        self.world = None
+        self.task = tasks.submit(
+            self._steps(screen_width, screen_height, scheduler, font),
+            priority=0, name=f"preload-level{level_id}")
+
+    def _steps(self, screen_width, screen_height, scheduler, font):
+        self.world = GameWorld(self.level_id, screen_width, screen_height,
+                               scheduler)
+        yield
+        yield from self.world.warm_up(font)
+
+    @property
+    def ready(self):
+        return self.task.done
+
+    def result(self):
+        """马上要用：没跑完的部分立刻跑完，返回建好的世界（失败时为 None）"""
+        self.task.finish()
+        if self.task.error is not None:
+            self.discard()
+        return self.world
+
+    def discard(self):
+        self.task.cancel()
+        if self.world is not None:
+            self.world.dispose()
+            self.world = None
+
+
 # ============================================================
 #  关卡管理器
 # ============================================================
 class LevelManager:
-    def __init__(self, screen_width=1440, screen_height=900):
+    def __init__(self, screen_width=1440, screen_height=900, scheduler=None,
+                 tasks=None):
         self.screen_width = screen_width
         self.screen_height = screen_height
+        self.scheduler = scheduler
+        # 协作式任务调度器（tasks.py）；没有时不预载下一关
+        self.tasks = tasks
         self.current_level = 1
         self.total_levels = 3
         self.world = None
+        self._preload = None
 
     def get_config(self):
         return LEVEL_CONFIGS[self.current_level]
 
+    def preload_next(self, font=None):
+        """后台开始建下一关（过关画面期间调用），build_world() 时直接换上"""
+        self.discard_preload()
+        if self.tasks is not None and self.current_level < self.total_levels:
+            self._preload = WorldPreload(
+                self.current_level + 1, self.screen_width, self.screen_height,
+                self.scheduler, self.tasks, font)
+
+    def discard_preload(self):
+        preload, self._preload = self._preload, None
+        if preload is not None:
+            preload.discard()
+
+    @traced
     def build_world(self):
-        self.world = GameWorld(self.current_level,
-                               self.screen_width, self.screen_height)
+        world = None
+        preload, self._preload = self._preload, None
+        if preload is not None:
+            # 还没做完的部分当场做完（已做的不用重来）
+            world = preload.result()
+            if world is not None and world.level_id != self.current_level:
+                world.dispose()
+                world = None
+        if self.world is not None:
+            self.world.dispose()
+        self.world = world or GameWorld(self.current_level,
+                                        self.screen_width, self.screen_height,
+                                        self.scheduler)
         return self.world
 
     def next_level(self):
@@ -540,5 +800,8 @@ class LevelManager:
         return False
 
     def reset(self):
+        self.discard_preload()
         self.current_level = 1
+        if self.world is not None:
+            self.world.dispose()
         self.world = None
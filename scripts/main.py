@@ -12,11 +12,28 @@ main.py —— 环保小鸭闯关游戏 主程序  (Google Doodle 美术风格)
 import pygame
 import sys
 import math
-import random
 import os
 
 from player import Duck
-from level import LevelManager, LEVEL_CONFIGS
+from timers import Scheduler
+from tasks import TaskScheduler
+from pipeline import RenderPipeline, PlayingFrame, NO_LAPS
+from profiler import FrameProfiler
+from tracing import tracer, traced
+from sampler import SamplingProfiler
+from drawstats import DrawStats
+from memdiag import MemoryDiagnostics
+from gcpause import GcPauseManager
+from options import OPTIONS
+from replay import InputRecorder, InputReplayer
+import rng
+import groundcache
+import view
+import display
+import quality
+from quality import QualityGovernor
+from idle import IdleThrottle
+from level import LevelManager, LEVEL_CONFIGS, warm_fonts
 from items import (
     ParticleSystem, Trash, TrashBin, Faucet, Puddle,
     SeedlingPile, PlantSpot, Lumberjack,
@@ -32,21 +49,38 @@ from gfx import (
 # ============================================================
 #  初始化 Pygame
 # ============================================================
+# --headless：不开窗口、不出声音（要在 pygame.init 之前设置）
+if OPTIONS.headless:
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
 pygame.init()
 pygame.mixer.init()
 
 SCREEN_WIDTH = 1440
 SCREEN_HEIGHT = 900
 FPS = 60
+GAME_ID = "duck"    # 输入录像里的游戏标识
 
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+# --render-size：所有画面先画在较小的画布上，每帧放大一次贴到窗口（见 view.py）；
+# --display：SCALED / vsync / 双缓冲；窗口可以拖动改大小（见 display.py）
+window, screen = display.open_window((SCREEN_WIDTH, SCREEN_HEIGHT),
+                                     OPTIONS.render_size, OPTIONS.display)
 pygame.display.set_caption("环保小鸭大冒险")
 clock = pygame.time.Clock()
 
+# --trace：从这里开始记录（包括下面的音效生成）
+if OPTIONS.trace:
+    tracer.enable(OPTIONS.trace)
+
+# 菜单背景、彩纸、画面抖动用的随机数流（不影响关卡里的随机序列）
+_ui_rng = rng.stream("ui")
+
 
 # ============================================================
 #  音效
 # ============================================================
+@traced
 def create_sound(frequency, duration_ms=100, volume =0.3):
     sample_rate = 44100
     num_samples = int(sample_rate * duration_ms / 1000)
@@ -97,19 +131,25 @@ def get_font(size):
     for path in font_paths:
         if os.path.exists(path):
             try:
-                font = pygame.font.Font(path, size)
+                font = view.font(path, size)
                 test = font.render("测试", True, (0, 0, 0))
-                if test.get_width() > 10:
+                if view.width(test) > 10:
                     return font
             except Exception:
                 continue
-    return pygame.font.Font(None, size)
+    return view.font(None, size)
+
 
+def load_fonts():
+    """字号按画布比例（见 view.py），窗口比例变了要重开"""
+    global font_small, font_medium, font_large, font_title
+    font_small = get_font(30)
+    font_medium = get_font(38)
+    font_large = get_font(66)
+    font_title = get_font(84)
 
-font_small = get_font(30)
-font_medium = get_font(38)
-font_large = get_font(66)
-font_title = get_font(84)
+
+load_fonts()
 
 # ============================================================
 #  状态常量
@@ -151,24 +191,26 @@ class Button:
         radius = h // 2  # 药丸形
 
         # 阴影
-        elev = 5 if self.is_hovered else 3
-        shadow = pygame.Surface((w + 12, h + 12), pygame.SRCALPHA)
-        pygame.draw.rect(shadow, (0, 0, 0, 35),
-                         (6, elev + 3, w, h), border_radius=radius)
-        surface.blit(shadow, (x - 6, y - 3))
+        if quality.shadows:
+            elev = 5 if self.is_hovered else 3
+            shadow = view.Surface((w + 12, h + 12), pygame.SRCALPHA)
+            view.draw.rect(shadow, (0, 0, 0, 35),
+                           (6, elev + 3, w, h), border_radius=radius)
+            view.blit(surface, shadow, (x - 6, y - 3))
 
         # 主体
-        pygame.draw.rect(surface, color, scaled, border_radius=radius)
+        view.draw.rect(surface, color, scaled, border_radius=radius)
 
         # 高光条
-        hl = pygame.Surface((w - 12, h // 3), pygame.SRCALPHA)
-        hl.fill((255, 255, 255, 35 if not self.is_hovered else 50))
-        surface.blit(hl, (x + 6, y + 3))
+        if quality.highlights:
+            hl = view.Surface((w - 12, h // 3), pygame.SRCALPHA)
+            hl.fill((255, 255, 255, 35 if not self.is_hovered else 50))
+            view.blit(surface, hl, (x + 6, y + 3))
 
         # 文字
         text_surf = font_medium.render(self.text, True, WHITE)
-        tr = text_surf.get_rect(center=scaled.center)
-        surface.blit(text_surf, tr)
+        tr = view.rect(text_surf, center=scaled.center)
+        view.blit(surface, text_surf, tr)
 
     def is_clicked(self, mouse_pos, mouse_click):
         return mouse_click and self.rect.collidepoint(mouse_pos)
@@ -180,35 +222,44 @@ class Button:
 class MenuBackground:
     def __init__(self):
         self.time = 0
-        # 预渲染渐变底图
-        self.base = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        draw_gradient_v(self.base, (0, 0, SCREEN_WIDTH, SCREEN_HEIGHT),
-                        (230, 240, 255), (200, 225, 250))
+        self.base = None
+        self._build_base()
         # 浮动装饰圆
         self.circles = []
         for _ in range(24):
             self.circles.append({
-                "x": random.randint(0, SCREEN_WIDTH),
-                "y": random.randint(0, SCREEN_HEIGHT),
-                "r": random.randint(30, 110),
-                "color": random.choice([SOFT_BLUE, SOFT_GREEN, SOFT_YELLOW, SOFT_RED]),
-                "speed": random.uniform(0.3, 0.8),
-                "phase": random.uniform(0, 6.28),
+                "x": _ui_rng.randint(0, SCREEN_WIDTH),
+                "y": _ui_rng.randint(0, SCREEN_HEIGHT),
+                "r": _ui_rng.randint(30, 110),
+                "color": _ui_rng.choice([SOFT_BLUE, SOFT_GREEN, SOFT_YELLOW, SOFT_RED]),
+                "speed": _ui_rng.uniform(0.3, 0.8),
+                "phase": _ui_rng.uniform(0, 6.28),
             })
 
+    def _build_base(self):
+        """预渲染渐变底图（总按最高画质；窗口比例变了会被置空，下次 draw 时重画）"""
+        self.base = view.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        with quality.full():
+            draw_gradient_v(self.base, (0, 0, SCREEN_WIDTH, SCREEN_HEIGHT),
+                            (230, 240, 255), (200, 225, 250))
+        display.keep(self, "base", alpha=False, sized=True)
+
     def update(self):
         self.time += 0.015
 
     def draw(self, surface):
-        surface.blit(self.base, (0, 0))
-        for c in self.circles:
+        if self.base is None:
+            self._build_base()
+        view.blit(surface, self.base, (0, 0))
+        # 画质降低时只画前几个圆（每个都要一块半透明临时画布）
+        for c in self.circles[:quality.menu_circles]:
             cx = c["x"] + math.sin(self.time + c["phase"]) * 30
             cy = c["y"] + math.cos(self.time * 0.7 + c["phase"]) * 22
             alpha = 30 + int(math.sin(self.time * 1.5 + c["phase"]) * 15)
-            s = pygame.Surface((c["r"] * 2, c["r"] * 2), pygame.SRCALPHA)
-            pygame.draw.circle(s, (*c["color"], alpha),
-                               (c["r"], c["r"]), c["r"])
-            surface.blit(s, (int(cx) - c["r"], int(cy) - c["r"]))
+            s = view.Surface((c["r"] * 2, c["r"] * 2), pygame.SRCALPHA)
+            view.draw.circle(s, (*c["color"], alpha),
+                             (c["r"], c["r"]), c["r"])
+            view.blit(surface, s, (int(cx) - c["r"], int(cy) - c["r"]))
 
 
 # ============================================================
@@ -219,20 +270,24 @@ class Confetti:
         self.particles = []
 
     def burst(self, count=80):
-        for _ in range(count):
+        for _ in range(quality.share(count, quality.confetti)):
             self.particles.append({
-                "x": random.randint(0, SCREEN_WIDTH),
-                "y": random.randint(-80, -10),
-                "vx": random.uniform(-2, 2),
-                "vy": random.uniform(1.5, 5),
-                "size": random.randint(6, 12),
-                "color": random.choice([BLUE, RED, YELLOW, GREEN,
+                "x": _ui_rng.randint(0, SCREEN_WIDTH),
+                "y": _ui_rng.randint(-80, -10),
+                "vx": _ui_rng.uniform(-2, 2),
+                "vy": _ui_rng.uniform(1.5, 5),
+                "size": _ui_rng.randint(6, 12),
+                "color": _ui_rng.choice([BLUE, RED, YELLOW, GREEN,
                                         SOFT_BLUE, SOFT_GREEN, SOFT_YELLOW]),
-                "rot": random.uniform(0, 6.28),
-                "rot_speed": random.uniform(-0.1, 0.1),
-                "life": random.randint(160, 320),
+                "rot": _ui_rng.uniform(0, 6.28),
+                "rot_speed": _ui_rng.uniform(-0.1, 0.1),
+                "life": _ui_rng.randint(160, 320),
             })
 
+    def clear(self):
+        # 只在过关 / 结算画面推进，离开时要清掉，否则每局都会留下一批
+        self.particles.clear()
+
     def update(self):
         for p in self.particles[:]:
             p["x"] += p["vx"] + math.sin(p["rot"]) * 0.5
@@ -247,10 +302,14 @@ class Confetti:
             alpha = min(255, p["life"] * 3)
             s = p["size"]
             w = max(3, int(s * abs(math.cos(p["rot"]))))
-            surf = pygame.Surface((w, s), pygame.SRCALPHA)
-            pygame.draw.rect(surf, (*p["color"], alpha), (0, 0, w, s),
-                             border_radius=2)
-            surface.blit(surf, (int(p["x"]), int(p["y"])))
+            if not quality.soft_particles:
+                view.draw.rect(surface, p["color"],
+                               (int(p["x"]), int(p["y"]), w, s))
+                continue
+            surf = view.Surface((w, s), pygame.SRCALPHA)
+            view.draw.rect(surf, (*p["color"], alpha), (0, 0, w, s),
+                           border_radius=2)
+            view.blit(surface, surf, (int(p["x"]), int(p["y"])))
 
 
 # ============================================================
@@ -258,14 +317,78 @@ class Confetti:
 # ============================================================
 class Game:
     def __init__(self):
-        self.state = STATE_MENU
-        self.duck = Duck(SCREEN_WIDTH, SCREEN_HEIGHT)
-        self.level_manager = LevelManager(SCREEN_WIDTH, SCREEN_HEIGHT)
+        # 状态切换时依次调用 listener(old, new)（内存诊断等工具挂在这里）
+        self.state_listeners = []
+        self._state = STATE_MENU
+        self._keys = None
+        # --replay：种子和输入都来自录像；否则按 --seed（或随机）播种，--record 时录下来
+        self.recorder = None
+        self.replayer = None
+        if OPTIONS.replay:
+            self.replayer = InputReplayer(OPTIONS.replay, GAME_ID)
+            rng.seed(self.replayer.seed)
+        else:
+            seed = rng.seed(OPTIONS.seed)
+            if OPTIONS.record:
+                self.recorder = InputRecorder(OPTIONS.record, GAME_ID, seed, FPS)
+        self._frame_ms = 0
+        # 自对弈等批量无窗口运行时关掉绘制，只跑逻辑
+        self.render = True
+        # --pipeline：游戏画面交给绘制线程画，和下一帧的更新重叠
+        self.pipeline = None
+        if OPTIONS.pipeline:
+            self.pipeline = RenderPipeline(screen.get_size(),
+                                           self._compose_playing)
+        # timers：游戏内计时（离开游戏画面时暂停）；ui_timers：界面计时，始终运行
+        self.timers = Scheduler()
+        self.ui_timers = Scheduler()
+        # F3 帧性能浮层
+        self.profiler = FrameProfiler()
+        # --profile：后台采样，栈按当前状态分组
+        self.sampler = None
+        if OPTIONS.profile:
+            self.sampler = SamplingProfiler(OPTIONS.profile_hz,
+                                            state_fn=lambda: self.state)
+            self.sampler.start(OPTIONS.profile)
+        # --draw-stats：逐帧计数 Surface 分配与绘制调用，显示在 F3 浮层里
+        if OPTIONS.draw_stats:
+            self.profiler.counters = DrawStats()
+            self.profiler.counters.install(OPTIONS.draw_stats)
+        # --memory：每次状态切换拍一次内存快照
+        self.memory = None
+        if OPTIONS.memory:
+            self.memory = MemoryDiagnostics()
+            self.memory.start(OPTIONS.memory)
+            self.state_listeners.append(self.memory.on_transition)
+        # GC 停顿管理：完整回收只在换场景和空闲帧里做
+        self.gc_pause = GcPauseManager(1000 / FPS, OPTIONS.hitch_log,
+                                       tune=not OPTIONS.no_gc_tune)
+        self.state_listeners.append(lambda old, new: self.gc_pause.settle())
+        self.profiler.status.append(self.gc_pause.status)
+        # 画质：--quality 固定一档；默认 auto 按帧耗时升降（--replay 跑基准时固定最高档）
+        self.quality = None
+        tier = OPTIONS.quality or ("high" if OPTIONS.replay else "auto")
+        if tier == "auto":
+            self.quality = QualityGovernor(1000 / FPS)
+            self.profiler.status.append(self.quality.status)
+        else:
+            quality.set_tier(quality.parse(tier))
+        # 协作式后台任务：每帧 flip 之后用剩余预算推进（预热、下一关预载）
+        self.tasks = TaskScheduler(1000 / FPS)
+        self.tasks.submit(self._warm_up(), priority=20, name="warm-up")
+        self.duck = Duck(SCREEN_WIDTH, SCREEN_HEIGHT, self.timers)
+        self.level_manager = LevelManager(SCREEN_WIDTH, SCREEN_HEIGHT,
+                                          self.timers, self.tasks)
         self.particles = ParticleSystem()
         self.confetti = Confetti()
         self.world = None
 
         self.menu_bg = MenuBackground()
+        # 改窗口大小：画布比例变了时重开字体、换流水线画布（见 display.py）
+        display.on_rescale(self._rescaled)
+        # 空闲降频：没人操作、窗口最小化或失焦时少画，游戏画面失焦时暂停（见 idle.py）
+        self.idle = IdleThrottle(
+            enabled=not (OPTIONS.no_idle or OPTIONS.replay or OPTIONS.headless))
 
         cx = SCREEN_WIDTH // 2
         self.btn_start = Button(cx, 520, 360, 78, "开始游戏",
@@ -283,68 +406,250 @@ class Game:
         self.btn_next = Button(cx, 630, 360, 78, "下一关",
                                GREEN, (62, 188, 93))
 
-        self.result_timer = 0
-        self.tip_timer = 180
+        self._result_start = 0
+        self._tip_t = self.timers.after(180)
         self.tip_text = ""
-        self.shake_timer = 0
+        self._shake_t = None
         self.shake_intensity = 0
         self.total_score = 0
-        self.space_cooldown = 0
+        self._space_cooldown_t = None
+
+        # 启动期的对象（字体、按钮、音效）到这里都建好了，冻结一次
+        self.gc_pause.install()
+
+    @property
+    def state(self):
+        return self._state
+
+    @state.setter
+    def state(self, new):
+        old = self._state
+        self._state = new
+        if new != old:
+            for listener in self.state_listeners:
+                listener(old, new)
+
+    # 剩余 / 经过的帧数（只读，由调度器算出）
+    @property
+    def tip_timer(self):
+        return self.timers.remaining(self._tip_t)
+
+    @property
+    def shake_timer(self):
+        return self.timers.remaining(self._shake_t)
+
+    @property
+    def space_cooldown(self):
+        return self.ui_timers.remaining(self._space_cooldown_t)
+
+    @property
+    def result_timer(self):
+        return self.ui_timers.since(self._result_start)
+
+    def _show_tip(self, text, duration=180):
+        self.tip_text = text
+        self.timers.cancel(self._tip_t)
+        self._tip_t = self.timers.after(duration)
+
+    def _shake(self, duration, intensity):
+        self.shake_intensity = intensity
+        self.timers.cancel(self._shake_t)
+        self._shake_t = self.timers.after(duration)
+
+    def _reset_result_timer(self):
+        self._result_start = self.ui_timers.now
 
     # --------------------------------------------------
     #  主循环
     # --------------------------------------------------
     def run(self):
-        running = True
-        while running:
-            mouse_pos = pygame.mouse.get_pos()
-            mouse_click = False
-            space_pressed = False
+        while self.step():
+            pass
+        if self.pipeline is not None:
+            self.pipeline.stop()
+            print(self.pipeline.summary())
+        pygame.quit()
+        sys.exit()
 
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-                if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                    mouse_click = True
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
-                        if self.state in (STATE_PLAYING, STATE_HELP):
-                            self.state = STATE_MENU
-                    if event.key == pygame.K_SPACE:
-                        space_pressed = True
-
-            if self.space_cooldown > 0:
-                self.space_cooldown -= 1
-                space_pressed = False
-
-            if self.state == STATE_MENU:
-                self._update_menu(mouse_pos, mouse_click)
-                self._draw_menu(mouse_pos)
-            elif self.state == STATE_PLAYING:
-                self._update_playing(space_pressed)
-                self._draw_playing()
-            elif self.state == STATE_LEVEL_UP:
-                self._update_level_up(mouse_pos, mouse_click)
-                self._draw_level_up(mouse_pos)
-            elif self.state == STATE_WIN:
-                self._update_result(mouse_pos, mouse_click, True)
-                self._draw_result(mouse_pos, True)
-            elif self.state == STATE_GAME_OVER:
-                self._update_result(mouse_pos, mouse_click, False)
-                self._draw_result(mouse_pos, False)
-            elif self.state == STATE_HELP:
-                self._update_help(mouse_pos, mouse_click)
-                self._draw_help(mouse_pos)
+    def step(self, events=None, mouse_pos=None, keys=None, fps=FPS):
+        """
+        跑一帧：输入 → 更新 → 绘制 → flip。返回 False 表示收到退出事件。
+        events / mouse_pos / keys 为空时读实时输入（--replay 时读录像）；
+        无窗口测试可以自己传入。
+        """
+        global window, screen
+        running = True
+        prof = self.profiler
+        prof.begin_frame()
+        self.gc_pause.begin_frame()
+        self.tasks.begin_frame()
+        if self.quality is not None:
+            self.quality.begin_frame()
+        frame_start = tracer.now()
+        if events is None and self.replayer is not None:
+            frame = self.replayer.next_frame()
+            if frame is None:
+                print(f"{self.replayer.summary()}，"
+                      f"结束于 {self.state}，总分 {self.total_score}")
+                return False
+            _, events, mouse_pos, keys = frame
+            fps = 0
+        live = events is None
+        if live:
+            events = display.logical_events(self.idle.events())
+        paused = live and self.idle.paused and self.state == STATE_PLAYING
+        if paused:
+            # 失焦暂停：只认退出，不更新、不推进计时，这一帧也不录
+            events = [e for e in events if e.type == pygame.QUIT]
+        if mouse_pos is None:
+            mouse_pos = display.to_logical(pygame.mouse.get_pos())
+        if self.recorder is not None and not paused:
+            if keys is None:
+                keys = pygame.key.get_pressed()
+            self.recorder.record_frame(self._frame_ms, events, mouse_pos, keys)
+        self._keys = keys
+        mouse_click = False
+        space_pressed = False
+
+        for event in events:
+            if event.type == pygame.QUIT:
+                running = False
+            if prof.handle_event(event):
+                continue
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F4:
+                # F4：未开启时开始追踪，已开启时导出一份快照
+                if tracer.enabled:
+                    print(f"追踪已写入 {tracer.dump_snapshot()}")
+                else:
+                    tracer.enable()
+                continue
+            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                mouse_click = True
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    if self.state in (STATE_PLAYING, STATE_HELP):
+                        self.state = STATE_MENU
+                if event.key == pygame.K_SPACE:
+                    space_pressed = True
+
+        # 只在游戏画面推进游戏内计时，菜单 / 结算时暂停；失焦暂停时界面计时也停
+        if not paused:
+            if self.state == STATE_PLAYING:
+                self.timers.resume()
+            else:
+                self.timers.pause()
+            self.timers.tick()
+            self.ui_timers.tick()
 
+        if self.space_cooldown > 0:
+            space_pressed = False
+        prof.lap("input")
+
+        # 画的是更新前所处状态的画面（本帧切换的新状态下一帧才画）
+        state = self.state
+        if state == STATE_MENU:
+            self._update_menu(mouse_pos, mouse_click)
+        elif state == STATE_PLAYING and not paused:
+            self._update_playing(space_pressed)
+        elif state == STATE_LEVEL_UP:
+            self._update_level_up(mouse_pos, mouse_click)
+        elif state == STATE_WIN:
+            self._update_result(mouse_pos, mouse_click, True)
+        elif state == STATE_GAME_OVER:
+            self._update_result(mouse_pos, mouse_click, False)
+        elif state == STATE_HELP:
+            self._update_help(mouse_pos, mouse_click)
+        # 窗口最小化时不用画
+        drawing = self.render and (not live or self.idle.visible)
+        if drawing:
+            if self.pipeline is not None and state == STATE_PLAYING:
+                prof.lap("update")
+                self.pipeline.submit(self._playing_frame(snapshot=True))
+                prof.lap("snapshot")
+                self.pipeline.present(screen)
+                prof.lap("present")
+            else:
+                if self.pipeline is not None:
+                    self.pipeline.drain()
+                self._draw_state(state, mouse_pos)
+            if paused:
+                self._draw_paused()
+        prof.lap("ui")
+
+        if drawing:
+            # 绘制线程可能还在按旧比例画上一帧：重新配置画布前先等它画完
+            drain = self.pipeline.drain if self.pipeline is not None else None
+            if display.settle(before=drain):
+                window, screen = display.window, display.screen
+            display.present(window, screen)
+            # 性能浮层画在窗口上，不跟着画布缩小
+            prof.draw(window)
+            prof.lap("overlay")
             pygame.display.flip()
-            clock.tick(FPS)
-
-        pygame.quit()
-        sys.exit()
+            prof.lap("flip")
+        if self.render:
+            # 先给画质档位记账：后台任务是用空闲时间跑的，不算画面负担
+            if self.quality is not None:
+                self.quality.end_frame()
+            self.tasks.run()
+            prof.lap("tasks")
+        self.gc_pause.end_frame(self.state)
+        if live:
+            animating = not paused and self._animating()
+            self._frame_ms = self.idle.wait(clock, fps, animating,
+                                            ambient=self.state != STATE_PLAYING)
+        else:
+            self._frame_ms = clock.tick(fps)
+        prof.lap("wait")
+        tracer.record("frame", frame_start)
+        return running
+
+    def _animating(self):
+        """画面接下来还会自己动、不能降频：游戏中、纸屑没落完、结算按钮还没解锁、后台任务没跑完"""
+        if self.profiler.enabled or self.tasks.pending:
+            return True
+        if self.state == STATE_PLAYING:
+            return True
+        if self.state in (STATE_LEVEL_UP, STATE_WIN, STATE_GAME_OVER):
+            return bool(self.confetti.particles) or self.result_timer <= 30
+        return False
+
+    def _draw_paused(self):
+        overlay = view.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 110))
+        view.blit(screen, overlay, (0, 0))
+        card = pygame.Rect(SCREEN_WIDTH // 2 - 260, SCREEN_HEIGHT // 2 - 90, 520, 180)
+        draw_rounded_card(screen, card, NEAR_WHITE, 24, shadow=True)
+        title = font_large.render("已暂停", True, CHARCOAL)
+        view.blit(screen, title, (SCREEN_WIDTH // 2 - view.width(title) // 2, card.y + 28))
+        hint = font_small.render("点回游戏窗口继续", True, DARK_GRAY)
+        view.blit(screen, hint, (SCREEN_WIDTH // 2 - view.width(hint) // 2, card.y + 118))
+
+    def _rescaled(self):
+        load_fonts()
+        if self.pipeline is not None:
+            self.pipeline.resize(display.screen.get_size())
+        if self.world is not None:
+            self.world.load_ground()
+
+    def _draw_state(self, state, mouse_pos):
+        if state == STATE_MENU:
+            self._draw_menu(mouse_pos)
+        elif state == STATE_PLAYING:
+            self._draw_playing()
+        elif state == STATE_LEVEL_UP:
+            self._draw_level_up(mouse_pos)
+        elif state == STATE_WIN:
+            self._draw_result(mouse_pos, True)
+        elif state == STATE_GAME_OVER:
+            self._draw_result(mouse_pos, False)
+        elif state == STATE_HELP:
+            self._draw_help(mouse_pos)
 
     # --------------------------------------------------
     #  菜单
     # --------------------------------------------------
+    @traced
     def _update_menu(self, mouse_pos, mouse_click):
         self.menu_bg.update()
         for btn in [self.btn_start, self.btn_help, self.btn_quit]:
@@ -360,10 +665,12 @@ class Game:
             pygame.quit()
             sys.exit()
 
+    @traced
     def _draw_menu(self, mouse_pos):
         self.menu_bg.draw(screen)
 
-        t = pygame.time.get_ticks() / 1000
+        # 按帧计时，回放时画面和录制时逐帧一致
+        t = self.ui_timers.now / FPS
         title_y = 100 + math.sin(t * 1.5) * 8
 
         # 标题 — Google 四色
@@ -375,20 +682,20 @@ class Game:
             c = google_colors[i % len(google_colors)]
             s = font_title.render(ch, True, c)
             char_surfs.append(s)
-            total_w += s.get_width()
+            total_w += view.width(s)
 
         x_cursor = SCREEN_WIDTH // 2 - total_w // 2
         for i, s in enumerate(char_surfs):
             yo = math.sin(t * 2 + i * 0.5) * 4
             # 阴影
             shadow = font_title.render(title_str[i], True, (0, 0, 0, 40))
-            screen.blit(shadow, (x_cursor + 3, int(title_y + yo) + 3))
-            screen.blit(s, (x_cursor, int(title_y + yo)))
-            x_cursor += s.get_width()
+            view.blit(screen, shadow, (x_cursor + 3, int(title_y + yo) + 3))
+            view.blit(screen, s, (x_cursor, int(title_y + yo)))
+            x_cursor += view.width(s)
 
         # 副标题
         sub = font_small.render("保护地球，从我做起！", True, DARK_GRAY)
-        screen.blit(sub, (SCREEN_WIDTH // 2 - sub.get_width() // 2,
+        view.blit(screen, sub, (SCREEN_WIDTH // 2 - view.width(sub) // 2,
                            int(title_y) + 95))
 
         # 菜单小鸭
@@ -402,50 +709,51 @@ class Game:
 
         # 版本
         ver = font_small.render("v3.0  小学五年级编程作品", True, MID_GRAY)
-        screen.blit(ver, (SCREEN_WIDTH // 2 - ver.get_width() // 2,
+        view.blit(screen, ver, (SCREEN_WIDTH // 2 - view.width(ver) // 2,
                            SCREEN_HEIGHT - 48))
 
     def _draw_menu_duck(self, cx, cy):
         """菜单中的大号可爱小鸭"""
         # 阴影
-        s = pygame.Surface((80, 22), pygame.SRCALPHA)
-        pygame.draw.ellipse(s, (0, 0, 0, 25), (0, 0, 80, 22))
-        screen.blit(s, (cx - 40, cy + 35))
+        s = view.Surface((80, 22), pygame.SRCALPHA)
+        view.draw.ellipse(s, (0, 0, 0, 25), (0, 0, 80, 22))
+        view.blit(screen, s, (cx - 40, cy + 35))
         # 脚
-        pygame.draw.ellipse(screen, (255, 138, 51), (cx - 22, cy + 28, 26, 13))
-        pygame.draw.ellipse(screen, (255, 138, 51), (cx + 3, cy + 28, 26, 13))
+        view.draw.ellipse(screen, (255, 138, 51), (cx - 22, cy + 28, 26, 13))
+        view.draw.ellipse(screen, (255, 138, 51), (cx + 3, cy + 28, 26, 13))
         # 身体
-        pygame.draw.ellipse(screen, (255, 213, 79), (cx - 36, cy - 16, 72, 55))
-        belly = pygame.Surface((46, 32), pygame.SRCALPHA)
-        pygame.draw.ellipse(belly, (255, 236, 179, 120), (0, 0, 46, 32))
-        screen.blit(belly, (cx - 23, cy - 6))
+        view.draw.ellipse(screen, (255, 213, 79), (cx - 36, cy - 16, 72, 55))
+        belly = view.Surface((46, 32), pygame.SRCALPHA)
+        view.draw.ellipse(belly, (255, 236, 179, 120), (0, 0, 46, 32))
+        view.blit(screen, belly, (cx - 23, cy - 6))
         # 翅膀
-        pygame.draw.polygon(screen, (255, 193, 7), [
+        view.draw.polygon(screen, (255, 193, 7), [
             (cx + 26, cy - 6), (cx + 46, cy + 13), (cx + 26, cy + 22)
         ])
         # 头
-        pygame.draw.circle(screen, (255, 224, 100), (cx + 6, cy - 32), 28)
-        hl = pygame.Surface((26, 26), pygame.SRCALPHA)
-        pygame.draw.circle(hl, (255, 245, 180, 80), (13, 13), 13)
-        screen.blit(hl, (cx - 13, cy - 52))
+        view.draw.circle(screen, (255, 224, 100), (cx + 6, cy - 32), 28)
+        hl = view.Surface((26, 26), pygame.SRCALPHA)
+        view.draw.circle(hl, (255, 245, 180, 80), (13, 13), 13)
+        view.blit(screen, hl, (cx - 13, cy - 52))
         # 眼睛
-        pygame.draw.circle(screen, WHITE, (cx + 16, cy - 36), 10)
-        pygame.draw.circle(screen, (55, 55, 55), (cx + 18, cy - 36), 6)
-        pygame.draw.circle(screen, WHITE, (cx + 19, cy - 37), 3)
+        view.draw.circle(screen, WHITE, (cx + 16, cy - 36), 10)
+        view.draw.circle(screen, (55, 55, 55), (cx + 18, cy - 36), 6)
+        view.draw.circle(screen, WHITE, (cx + 19, cy - 37), 3)
         # 嘴
-        pygame.draw.polygon(screen, (255, 138, 51), [
+        view.draw.polygon(screen, (255, 138, 51), [
             (cx + 30, cy - 38), (cx + 50, cy - 30), (cx + 30, cy - 22)
         ])
-        pygame.draw.line(screen, (230, 115, 40),
-                         (cx + 30, cy - 30), (cx + 46, cy - 30), 2)
+        view.draw.line(screen, (230, 115, 40),
+                       (cx + 30, cy - 30), (cx + 46, cy - 30), 2)
         # 腮红
-        blush = pygame.Surface((18, 11), pygame.SRCALPHA)
-        pygame.draw.ellipse(blush, (255, 171, 145, 80), (0, 0, 18, 11))
-        screen.blit(blush, (cx - 4, cy - 22))
+        blush = view.Surface((18, 11), pygame.SRCALPHA)
+        view.draw.ellipse(blush, (255, 171, 145, 80), (0, 0, 18, 11))
+        view.blit(screen, blush, (cx - 4, cy - 22))
 
     # --------------------------------------------------
     #  帮助页
     # --------------------------------------------------
+    @traced
     def _update_help(self, mouse_pos, mouse_click):
         self.menu_bg.update()
         self.btn_back.update(mouse_pos)
@@ -453,6 +761,7 @@ class Game:
             play_sound(sound_click)
             self.state = STATE_MENU
 
+    @traced
     def _draw_help(self, mouse_pos):
         self.menu_bg.draw(screen)
 
@@ -461,7 +770,7 @@ class Game:
         draw_rounded_card(screen, card, NEAR_WHITE, 20, shadow=True)
 
         title = font_large.render("游戏帮助", True, CHARCOAL)
-        screen.blit(title, (SCREEN_WIDTH // 2 - title.get_width() // 2, 72))
+        view.blit(screen, title, (SCREEN_WIDTH // 2 - view.width(title) // 2, 72))
 
         sections = [
             ("操作说明", BLUE, [
@@ -488,12 +797,20 @@ class Game:
             y += 42
             for line in lines:
                 surf = font_small.render(line, True, DARK_GRAY)
-                screen.blit(surf, (200, y))
+                view.blit(screen, surf, (200, y))
                 y += 38
             y += 16
 
         self.btn_back.draw(screen)
 
+    # --------------------------------------------------
+    #  预热
+    # --------------------------------------------------
+    def _warm_up(self):
+        """生成器：启动后用每帧的空闲时间打开 HUD 字体、把第一关地面画好"""
+        yield from warm_fonts()
+        yield from groundcache.warm(SCREEN_WIDTH, SCREEN_HEIGHT, (1,))
+
     # --------------------------------------------------
     #  开始
     # --------------------------------------------------
@@ -503,26 +820,34 @@ class Game:
         self.level_manager.reset()
         self.world = self.level_manager.build_world()
         self.particles = ParticleSystem()
+        self.confetti.clear()
         self.total_score = 0
-        self.tip_timer = 180
-        self.tip_text = self.level_manager.get_config()["tip"]
+        self._show_tip(self.level_manager.get_config()["tip"])
+
+    def start_level(self, level_id):
+        """跳过前面的关卡直接开始第 level_id 关（调参时只测某一关）"""
+        self._start_game()
+        self.level_manager.current_level = level_id
+        self.world = self.level_manager.build_world()
+        self._show_tip(self.level_manager.get_config()["tip"])
 
     # --------------------------------------------------
     #  游戏中
     # --------------------------------------------------
+    @traced
     def _update_playing(self, space_pressed):
-        keys = pygame.key.get_pressed()
-        self.duck.handle_input(keys)
+        prof = self.profiler
+        keys = self._keys if self._keys is not None else pygame.key.get_pressed()
+        self.duck.handle_input(keys, self.world.collision if self.world else None)
+        prof.lap("input")
         self.duck.update()
+        prof.lap("duck")
 
         if self.world:
-            self.world.update()
+            self.world.update((self.duck.x, self.duck.y))
+        prof.lap("update")
         self.particles.update()
-
-        if self.shake_timer > 0:
-            self.shake_timer -= 1
-        if self.tip_timer > 0:
-            self.tip_timer -= 1
+        prof.lap("particles")
 
         if not self.world:
             return
@@ -540,22 +865,21 @@ class Game:
                 if self.duck.take_damage():
                     play_sound(sound_hurt)
                     self.particles.emit(px, py, (255, 80, 80), 20)
-                    self.shake_timer = 10
-                    self.shake_intensity = 7
+                    self._shake(10, 7)
 
         if space_pressed:
             self._handle_interact(level_id, px, py)
 
         if self.duck.lives <= 0:
             self.state = STATE_GAME_OVER
-            self.result_timer = 0
+            self._reset_result_timer()
             play_sound(sound_game_over)
             return
 
         if self.world.is_time_up():
             if self.world.score < LEVEL_CONFIGS[2]["target_score"]:
                 self.state = STATE_GAME_OVER
-                self.result_timer = 0
+                self._reset_result_timer()
                 play_sound(sound_game_over)
                 return
 
@@ -564,19 +888,25 @@ class Game:
             self.confetti.burst(70)
             if self.level_manager.current_level >= self.level_manager.total_levels:
                 self.state = STATE_WIN
-                self.result_timer = 0
+                self._reset_result_timer()
                 self.confetti.burst(100)
                 play_sound(sound_level_up)
             else:
                 self.state = STATE_LEVEL_UP
-                self.result_timer = 0
+                self._reset_result_timer()
                 play_sound(sound_level_up)
+                # 彩纸飘着的时候后台建下一关，点"下一关"时直接换上
+                if self.render:
+                    self.level_manager.preload_next(font_medium)
 
         if level_id == 1:
+            config = LEVEL_CONFIGS[1]
             trash_count = len([o for o in self.world.objects
                                if isinstance(o, Trash) and o.active])
-            if trash_count < 5:
-                self.world._spawn_trash(8)
+            if trash_count < config["trash_min"]:
+                self.world.prune_inactive()
+                self.world._spawn_trash(config["trash_refill"],
+                                        avoid=[(px, py, 70)])
 
     def _handle_interact(self, level_id, px, py):
         nearest = self.world.get_nearest_interactable(px, py, max_dist=80)
@@ -586,7 +916,7 @@ class Game:
             self._interact_level_2(nearest)
         elif level_id == 3:
             self._interact_level_3(nearest, px, py)
-        self.space_cooldown = 10
+        self._space_cooldown_t = self.ui_timers.after(10)
 
     def _interact_level_1(self, nearest, px, py):
         if nearest is None:
@@ -651,43 +981,68 @@ class Game:
     # --------------------------------------------------
     #  绘制游戏画面
     # --------------------------------------------------
+    @traced
     def _draw_playing(self):
-        shake_x, shake_y = 0, 0
+        self.profiler.lap("update")
+        self._compose_playing(screen, self._playing_frame(), self.profiler)
+
+    def _playing_frame(self, snapshot=False):
+        """
+        本帧游戏画面要画的东西。snapshot=True 时拷贝一份交给绘制线程；
+        抖动偏移总在主线程取随机数，两种模式下 ui 随机数流的消耗顺序一样。
+        """
+        shake = (0, 0)
         if self.shake_timer > 0:
-            shake_x = random.randint(-self.shake_intensity, self.shake_intensity)
-            shake_y = random.randint(-self.shake_intensity, self.shake_intensity)
-
-        game_surf = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-
-        if self.world:
-            self.world.draw_ground(game_surf)
-            self.world.draw_objects(game_surf)
-
-        self.particles.draw(game_surf)
-        self.duck.draw(game_surf)
-
-        if self.world:
-            self.world.draw_hud(game_surf, font_medium, self.duck.lives)
+            shake = (_ui_rng.randint(-self.shake_intensity, self.shake_intensity),
+                     _ui_rng.randint(-self.shake_intensity, self.shake_intensity))
+        world, duck, particles = self.world, self.duck, self.particles
+        if snapshot:
+            world = world.snapshot() if world else None
+            duck = duck.snapshot()
+            particles = particles.snapshot()
+        return PlayingFrame(world, duck, particles, shake,
+                            self.tip_text, self.tip_timer)
+
+    @traced
+    def _compose_playing(self, target, frame, prof=NO_LAPS):
+        """把一帧游戏画面画到 target（主线程画 screen，或绘制线程画后台画布）"""
+        world = frame.world
+        game_surf = view.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+        if world:
+            world.draw_ground(game_surf)
+            prof.lap("ground")
+            world.draw_objects(game_surf)
+            prof.lap("objects")
+
+        frame.particles.draw(game_surf)
+        prof.lap("particles")
+        frame.duck.draw(game_surf)
+        prof.lap("duck")
+
+        if world:
+            world.draw_hud(game_surf, font_medium, frame.duck.lives)
 
         # 提示文字 — 药丸标签
-        if self.tip_timer > 0 and self.tip_text:
-            alpha = min(200, self.tip_timer * 3)
-            tip_surf = font_small.render(self.tip_text, True, WHITE)
-            tw = tip_surf.get_width()
-            bg = pygame.Surface((tw + 42, 44), pygame.SRCALPHA)
-            pygame.draw.rect(bg, (60, 64, 67, alpha),
-                             (0, 0, tw + 42, 44), border_radius=22)
-            game_surf.blit(bg, (SCREEN_WIDTH // 2 - tw // 2 - 21, 80))
-            game_surf.blit(tip_surf, (SCREEN_WIDTH // 2 - tw // 2, 88))
-
-        screen.fill((0, 0, 0))
-        screen.blit(game_surf, (shake_x, shake_y))
+        if frame.tip_timer > 0 and frame.tip_text:
+            alpha = min(200, frame.tip_timer * 3)
+            tip_surf = font_small.render(frame.tip_text, True, WHITE)
+            tw = view.width(tip_surf)
+            bg = view.Surface((tw + 42, 44), pygame.SRCALPHA)
+            view.draw.rect(bg, (60, 64, 67, alpha),
+                           (0, 0, tw + 42, 44), border_radius=22)
+            view.blit(game_surf, bg, (SCREEN_WIDTH // 2 - tw // 2 - 21, 80))
+            view.blit(game_surf, tip_surf, (SCREEN_WIDTH // 2 - tw // 2, 88))
+
+        target.fill((0, 0, 0))
+        view.blit(target, game_surf, frame.shake)
+        prof.lap("hud")
 
     # --------------------------------------------------
     #  过关画面
     # --------------------------------------------------
+    @traced
     def _update_level_up(self, mouse_pos, mouse_click):
-        self.result_timer += 1
         self.confetti.update()
         self.btn_next.update(mouse_pos)
         if self.btn_next.is_clicked(mouse_pos, mouse_click) and self.result_timer > 30:
@@ -695,18 +1050,19 @@ class Game:
             self.level_manager.next_level()
             self.world = self.level_manager.build_world()
             self.duck.reset()
-            self.tip_text = self.level_manager.get_config()["tip"]
-            self.tip_timer = 180
+            self.confetti.clear()
+            self._show_tip(self.level_manager.get_config()["tip"])
             self.state = STATE_PLAYING
 
+    @traced
     def _draw_level_up(self, mouse_pos):
         if self.world:
             self.world.draw_ground(screen)
             self.world.draw_objects(screen)
 
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+        overlay = view.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
         overlay.fill((0, 0, 0, 140))
-        screen.blit(overlay, (0, 0))
+        view.blit(screen, overlay, (0, 0))
 
         self.confetti.draw(screen)
 
@@ -716,29 +1072,29 @@ class Game:
 
         bounce = abs(math.sin(self.result_timer * 0.06)) * 12
         title = font_large.render("过关啦！", True, GREEN)
-        screen.blit(title, (SCREEN_WIDTH // 2 - title.get_width() // 2,
+        view.blit(screen, title, (SCREEN_WIDTH // 2 - view.width(title) // 2,
                              185 - int(bounce)))
 
         score = font_medium.render(
             f"本关完成：{self.world.score if self.world else 0} 个任务",
             True, CHARCOAL)
-        screen.blit(score, (SCREEN_WIDTH // 2 - score.get_width() // 2, 320))
+        view.blit(screen, score, (SCREEN_WIDTH // 2 - view.width(score) // 2, 320))
 
         nxt = self.level_manager.current_level + 1
         if nxt <= 3:
             cfg = LEVEL_CONFIGS[nxt]
             nt = font_medium.render(f"下一关：{cfg['name']}", True, BLUE)
-            screen.blit(nt, (SCREEN_WIDTH // 2 - nt.get_width() // 2, 400))
+            view.blit(screen, nt, (SCREEN_WIDTH // 2 - view.width(nt) // 2, 400))
             dt = font_small.render(cfg["description"], True, DARK_GRAY)
-            screen.blit(dt, (SCREEN_WIDTH // 2 - dt.get_width() // 2, 452))
+            view.blit(screen, dt, (SCREEN_WIDTH // 2 - view.width(dt) // 2, 452))
 
         self.btn_next.draw(screen)
 
     # --------------------------------------------------
     #  胜利/失败
     # --------------------------------------------------
+    @traced
     def _update_result(self, mouse_pos, mouse_click, won):
-        self.result_timer += 1
         self.confetti.update()
         self.btn_retry.update(mouse_pos)
         self.btn_menu.update(mouse_pos)
@@ -749,8 +1105,10 @@ class Game:
                 self._start_game()
             if self.btn_menu.is_clicked(mouse_pos, mouse_click):
                 play_sound(sound_click)
+                self.confetti.clear()
                 self.state = STATE_MENU
 
+    @traced
     def _draw_result(self, mouse_pos, won):
         if won:
             draw_gradient_v(screen, (0, 0, SCREEN_WIDTH, SCREEN_HEIGHT),
@@ -769,16 +1127,16 @@ class Game:
 
         if won:
             title = font_large.render("恭喜通关！", True, GREEN)
-            screen.blit(title, (SCREEN_WIDTH // 2 - title.get_width() // 2,
+            view.blit(screen, title, (SCREEN_WIDTH // 2 - view.width(title) // 2,
                                  140 - int(bounce)))
 
             total_t = font_medium.render(f"总完成：{self.total_score} 个任务",
                                          True, CHARCOAL)
-            screen.blit(total_t, (SCREEN_WIDTH // 2 - total_t.get_width() // 2, 260))
+            view.blit(screen, total_t, (SCREEN_WIDTH // 2 - view.width(total_t) // 2, 260))
 
             msg = font_medium.render("你是环保小卫士！地球因你更美好！",
                                      True, DARK_GRAY)
-            screen.blit(msg, (SCREEN_WIDTH // 2 - msg.get_width() // 2, 350))
+            view.blit(screen, msg, (SCREEN_WIDTH // 2 - view.width(msg) // 2, 350))
 
             # 星星
             for i in range(3):
@@ -787,16 +1145,16 @@ class Game:
                 self._draw_star(screen, sx, sy, 22, YELLOW)
         else:
             title = font_large.render("游戏结束", True, RED)
-            screen.blit(title, (SCREEN_WIDTH // 2 - title.get_width() // 2,
+            view.blit(screen, title, (SCREEN_WIDTH // 2 - view.width(title) // 2,
                                  140 - int(bounce)))
 
             score_t = font_medium.render(
                 f"已完成：{self.world.score if self.world else 0} 个",
                 True, CHARCOAL)
-            screen.blit(score_t, (SCREEN_WIDTH // 2 - score_t.get_width() // 2, 280))
+            view.blit(screen, score_t, (SCREEN_WIDTH // 2 - view.width(score_t) // 2, 280))
 
             msg = font_medium.render("别灰心，再试一次吧！", True, DARK_GRAY)
-            screen.blit(msg, (SCREEN_WIDTH // 2 - msg.get_width() // 2, 370))
+            view.blit(screen, msg, (SCREEN_WIDTH // 2 - view.width(msg) // 2, 370))
 
         self.btn_retry.draw(screen)
         self.btn_menu.draw(screen)
@@ -808,14 +1166,14 @@ class Game:
             angle = math.radians(i * 36 - 90)
             r = size if i % 2 == 0 else size * 0.45
             points.append((cx + r * math.cos(angle), cy + r * math.sin(angle)))
-        pygame.draw.polygon(surface, color, points)
+        view.draw.polygon(surface, color, points)
         # 高光
         inner = []
         for i in range(10):
             angle = math.radians(i * 36 - 90)
             r = (size * 0.6 if i % 2 == 0 else size * 0.25)
             inner.append((cx + r * math.cos(angle), cy - 2 + r * math.sin(angle)))
-        pygame.draw.polygon(surface, (255, 235, 120), inner)
+        view.draw.polygon(surface, (255, 235, 120), inner)
 
 
 # ============================================================
@@ -0,0 +1,134 @@
+"""
+memdiag.py —— 内存诊断
+包含：每次游戏状态切换时拍 tracemalloc 快照、与上一次切换 / 同一状态首次进入时对比、
+列出增长最多的分配位置，退出时写出文本报告
+
+同一状态（比如回到菜单）第二次、第三次进入时内存还在涨，就说明有东西没释放。
+"""
+
+import gc
+import os
+import time
+import atexit
+import tracemalloc
+
+
+# 这些文件里的分配不计入（诊断工具自身、导入机制）
+_IGNORED = (
+    tracemalloc.__file__,
+    "<frozen importlib._bootstrap>",
+    "<frozen importlib._bootstrap_external>",
+    "<unknown>",
+)
+
+# 性能工具的分配多少取决于帧耗时（卡帧计数、追踪环形缓冲、帧浮层），
+# 机器快慢不同结果就不同，也不计入：判断只看游戏对象
+_TOOLS = ("gcpause.py", "tracing.py", "profiler.py", "sampler.py", "drawstats.py")
+
+
+class MemoryDiagnostics:
+    TOP = 10
+
+    def __init__(self, frames=1, top=TOP):
+        self.frames = frames
+        self.top = top
+        self.path = "memory.txt"
+        self.log = []               # [(标签, 已追踪字节数, 相对上次的增量)]
+        self.lines = []             # 报告正文
+        self._previous = None
+        self._previous_size = 0
+        self._baselines = {}        # 状态 -> 首次进入时的快照
+        self._atexit = False
+
+    # --------------------------------------------------
+    #  启停
+    # --------------------------------------------------
+    def start(self, path=None, dump_at_exit=True):
+        if path:
+            self.path = path
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+        if dump_at_exit and not self._atexit:
+            atexit.register(self._dump_at_exit)
+            self._atexit = True
+
+    def stop(self):
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    # --------------------------------------------------
+    #  快照
+    # --------------------------------------------------
+    def take_snapshot(self):
+        gc.collect()
+        snapshot = tracemalloc.take_snapshot()
+        return snapshot.filter_traces(
+            [tracemalloc.Filter(False, name) for name in _IGNORED]
+            + [tracemalloc.Filter(False, os.path.join("*", name)) for name in _TOOLS]
+            + [tracemalloc.Filter(False, __file__)])
+
+    @staticmethod
+    def traced_size(snapshot):
+        return sum(stat.size for stat in snapshot.statistics("filename"))
+
+    def growth(self, new, old, limit=None):
+        """new 相对 old 增长最多的位置（只列增长的）"""
+        diffs = [d for d in new.compare_to(old, "lineno") if d.size_diff > 0]
+        diffs.sort(key=lambda d: -d.size_diff)
+        return diffs[:limit or self.top]
+
+    def on_transition(self, old, new):
+        """挂到 Game.state_listeners 上"""
+        self.checkpoint(f"{old} -> {new}", new)
+
+    def checkpoint(self, label, state=None):
+        snapshot = self.take_snapshot()
+        size = self.traced_size(snapshot)
+        delta = 0
+        self.lines.append(f"[{time.strftime('%H:%M:%S')}] {label}  "
+                          f"追踪中 {size / 1024:.1f} KiB")
+        if self._previous is not None:
+            delta = size - self._previous_size
+            self.lines.append(f"  相对上一次切换 {delta / 1024:+.1f} KiB")
+            self._append_growth(self.growth(snapshot, self._previous))
+        if state is not None:
+            baseline = self._baselines.get(state)
+            if baseline is None:
+                self._baselines[state] = snapshot
+            else:
+                total = size - self.traced_size(baseline)
+                self.lines.append(f"  相对首次进入 {state} {total / 1024:+.1f} KiB")
+                self._append_growth(self.growth(snapshot, baseline))
+        self.log.append((label, size, delta))
+        self._previous = snapshot
+        self._previous_size = size
+        return size
+
+    def baseline_growth(self, state):
+        """当前内存相对首次进入 state 时的增长 [(字节数, 位置)]"""
+        baseline = self._baselines.get(state)
+        if baseline is None:
+            return []
+        return [(d.size_diff, str(d.traceback[0]))
+                for d in self.growth(self.take_snapshot(), baseline)]
+
+    def _append_growth(self, diffs):
+        for d in diffs:
+            frame = d.traceback[0]
+            where = f"{os.path.basename(frame.filename)}:{frame.lineno}"
+            self.lines.append(f"    {d.size_diff / 1024:+9.1f} KiB "
+                              f"{d.count_diff:+6d} 块  {where}")
+
+    # --------------------------------------------------
+    #  报告
+    # --------------------------------------------------
+    def dump(self, path=None):
+        path = path or self.path
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(self.lines) + "\n")
+        return path
+
+    def _dump_at_exit(self):
+        if self.lines:
+            print(f"内存诊断已写入 {self.dump()}")
+        self.stop()
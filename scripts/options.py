@@ -0,0 +1,81 @@
+"""
+options.py —— 启动参数
+包含：调试 / 性能工具的命令行开关（不认识的参数原样忽略，不影响正常启动）
+
+  --trace [PATH]     记录区间追踪，退出时写出 Chrome trace JSON（默认 trace.json）
+  --profile [PATH]   后台采样主线程调用栈，退出时写出折叠栈（默认 profile.folded）
+  --profile-hz N     每秒采样次数（默认 200）
+  --draw-stats [PATH]  统计每帧 Surface 分配与绘制调用，退出时写出 JSON（默认 drawstats.json）
+  --memory [PATH]    每次状态切换拍 tracemalloc 快照并对比，退出时写出报告（默认 memory.txt）
+  --hitch-log [PATH] 记录每一帧超预算的卡顿以及当帧是否跑了 GC（默认 hitches.log）
+  --no-gc-tune       关闭 GC 停顿管理（冻结对象、推迟完整回收），用于对比
+  --record [PATH]    把随机种子和逐帧输入录成二进制录像（默认 session.rec）
+  --replay PATH      按录像回放：不读实时输入、不限帧率，放完打印耗时后退出
+  --seed N           固定随机种子（不给时每次启动随机取一个）
+  --headless         不开窗口也不出声音（配合 --replay 跑基准）
+  --pipeline         游戏画面在绘制线程里画，和下一帧的更新重叠（画面晚一帧）
+  --render-size WxH  内部渲染分辨率（如 720x450、1080x675），画完放大一次贴到窗口
+  --quality TIER     画质 auto / high / medium / low（默认 auto：掉帧时自动降档，见 quality.py）
+  --display FLAGS    显示标志，逗号分隔：scaled,vsync,doublebuf（默认取环境变量 GHX_DISPLAY，
+                     见 display.py）
+  --no-idle          菜单 / 结算画面没人操作、窗口最小化或失焦时也照常 60 FPS（见 idle.py）
+"""
+
+import os
+import sys
+import argparse
+
+
+def _size(text):
+    """ "720x450" -> (720, 450) """
+    try:
+        w, h = text.lower().split("x")
+        return int(w), int(h)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"分辨率格式应为 宽x高：{text}")
+
+
+DISPLAY_FLAGS = ("scaled", "vsync", "doublebuf")
+
+
+def _flags(text):
+    """ "scaled,vsync" -> ("scaled", "vsync") """
+    names = tuple(name.strip().lower() for name in text.split(",") if name.strip())
+    unknown = [name for name in names if name not in DISPLAY_FLAGS]
+    if unknown:
+        raise argparse.ArgumentTypeError(
+            f"不认识的显示标志：{', '.join(unknown)}（可选 {', '.join(DISPLAY_FLAGS)}）")
+    return names
+
+
+def parse(argv=None):
+    parser = argparse.ArgumentParser(add_help=False, allow_abbrev=False)
+    parser.add_argument("--trace", nargs="?", const="trace.json", default=None,
+                        metavar="PATH")
+    parser.add_argument("--profile", nargs="?", const="profile.folded",
+                        default=None, metavar="PATH")
+    parser.add_argument("--profile-hz", type=int, default=200, metavar="N")
+    parser.add_argument("--draw-stats", nargs="?", const="drawstats.json",
+                        default=None, metavar="PATH")
+    parser.add_argument("--memory", nargs="?", const="memory.txt",
+                        default=None, metavar="PATH")
+    parser.add_argument("--hitch-log", nargs="?", const="hitches.log",
+                        default=None, metavar="PATH")
+    parser.add_argument("--no-gc-tune", action="store_true")
+    parser.add_argument("--record", nargs="?", const="session.rec",
+                        default=None, metavar="PATH")
+    parser.add_argument("--replay", default=None, metavar="PATH")
+    parser.add_argument("--seed", type=int, default=None, metavar="N")
+    parser.add_argument("--headless", action="store_true")
+    parser.add_argument("--pipeline", action="store_true")
+    parser.add_argument("--render-size", type=_size, default=None, metavar="WxH")
+    parser.add_argument("--quality", choices=("auto", "high", "medium", "low"),
+                        default=None)
+    parser.add_argument("--display", type=_flags,
+                        default=os.environ.get("GHX_DISPLAY", ""), metavar="FLAGS")
+    parser.add_argument("--no-idle", action="store_true")
+    options, _ = parser.parse_known_args(argv)
+    return options
+
+
+OPTIONS = parse(sys.argv[1:])
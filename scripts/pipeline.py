@@ -0,0 +1,139 @@
+"""
+pipeline.py —— 模拟 / 绘制流水线（--pipeline）
+包含：一帧画面所需数据的快照、后台绘制线程、两块离屏画布轮换的双缓冲
+
+平时每帧是 更新 → 绘制 → flip 串行，两段耗时相加。流水线模式下：
+  主线程   取事件 → 更新第 N 帧 → 拍快照交给绘制线程 → 贴上最近画完的一帧 → flip
+  绘制线程 把最新的快照画到后台画布上（和主线程更新第 N+1 帧同时进行）
+pygame 的 blit / fill 会释放 GIL，多核机器上更新和绘制可以真正重叠；
+代价是画面晚一帧。事件和 flip 仍在主线程。
+
+快照（GameWorld / Duck / ParticleSystem 的 snapshot()）是浅拷贝加组件数组拷贝，
+主线程接着改原物体不会影响正在画的那一帧。绘制线程还没画完时又来了新快照，
+旧的直接丢掉（只画最新的）。
+"""
+
+import threading
+import traceback
+
+import pygame
+
+
+class PlayingFrame:
+    """游戏画面一帧要画的东西：世界、小鸭、粒子，外加抖动偏移和提示文字"""
+
+    __slots__ = ("world", "duck", "particles", "shake", "tip_text", "tip_timer")
+
+    def __init__(self, world, duck, particles, shake=(0, 0), tip_text="",
+                 tip_timer=0):
+        self.world = world
+        self.duck = duck
+        self.particles = particles
+        self.shake = shake
+        self.tip_text = tip_text
+        self.tip_timer = tip_timer
+
+
+class _NoLaps:
+    """绘制线程里不往帧性能浮层打点（FrameProfiler 只给主线程用）"""
+
+    def lap(self, name):
+        pass
+
+
+NO_LAPS = _NoLaps()
+
+
+class RenderPipeline:
+    def __init__(self, size, draw):
+        """draw(surface, frame)：在绘制线程里把一帧画到 surface 上"""
+        self.draw = draw
+        self._cond = threading.Condition()
+        self._surfaces = [pygame.Surface(size), pygame.Surface(size)]
+        self._pending = None    # 等着画的最新快照
+        self._ready = None      # 最近画完的画布下标
+        self._busy = False
+        self._running = True
+        self.submitted = 0
+        self.drawn = 0
+        self.dropped = 0
+        self._thread = threading.Thread(target=self._run, name="render",
+                                        daemon=True)
+        self._thread.start()
+
+    # --------------------------------------------------
+    #  主线程
+    # --------------------------------------------------
+    def submit(self, frame):
+        with self._cond:
+            if self._pending is not None:
+                self.dropped += 1
+            self._pending = frame
+            self.submitted += 1
+            self._cond.notify_all()
+
+    def present(self, target):
+        """
+        把最近画完的一帧贴到 target。刚进入流水线、一帧都还没画完时等第一帧。
+        贴图时持锁：绘制线程此时只可能在画另一块画布。
+        """
+        with self._cond:
+            while (self._ready is None and self._running
+                   and (self._pending is not None or self._busy)):
+                self._cond.wait()
+            if self._ready is None:
+                return False
+            target.blit(self._surfaces[self._ready], (0, 0))
+            return True
+
+    def drain(self):
+        """离开游戏画面时调用：等绘制线程停手，之后主线程可以放心自己画"""
+        with self._cond:
+            while self._pending is not None or self._busy:
+                self._cond.wait()
+            self._ready = None
+
+    def resize(self, size):
+        """画布大小变了（改窗口大小，见 display.py）：等绘制线程停手后换两块新画布"""
+        self.drain()
+        with self._cond:
+            self._surfaces = [pygame.Surface(size), pygame.Surface(size)]
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._pending = None
+            self._cond.notify_all()
+        self._thread.join()
+
+    # --------------------------------------------------
+    #  绘制线程
+    # --------------------------------------------------
+    def _run(self):
+        cond = self._cond
+        while True:
+            with cond:
+                while self._pending is None and self._running:
+                    cond.wait()
+                if not self._running:
+                    return
+                frame, self._pending = self._pending, None
+                self._busy = True
+                index = 1 if self._ready == 0 else 0
+            done = False
+            try:
+                self.draw(self._surfaces[index], frame)
+                done = True
+            except Exception:
+                traceback.print_exc()
+            finally:
+                with cond:
+                    self._busy = False
+                    if done:
+                        self._ready = index
+                        self.drawn += 1
+                    cond.notify_all()
+
+    def summary(self):
+        return (f"流水线：提交 {self.submitted} 帧，画了 {self.drawn} 帧，"
+                f"来不及画而丢掉 {self.dropped} 帧")
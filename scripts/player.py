@@ -6,7 +6,12 @@ player.py —— 小鸭角色模块  (Google Doodle 美术风格)
 import pygame
 import math
 import os
+import copy
 
+from timers import Scheduler
+import view
+import display
+import quality
 from gfx import (
     draw_soft_circle, draw_soft_ellipse, draw_pill_badge,
     YELLOW, WHITE, CHARCOAL, NEAR_BLACK,
@@ -38,14 +43,14 @@ def _load_chinese_font(size):
     for path in paths:
         if os.path.exists(path):
             try:
-                return pygame.font.Font(path, size)
+                return view.font(path, size)
             except Exception:
                 continue
-    return pygame.font.Font(None, size)
+    return view.font(None, size)
 
 
 class Duck:
-    def __init__(self, screen_width=1440, screen_height=900):
+    def __init__(self, screen_width=1440, screen_height=900, scheduler=None):
         self.x = screen_width // 2
         self.y = screen_height // 2
         self.width = 80
@@ -55,20 +60,25 @@ class Duck:
         self.screen_width = screen_width
         self.screen_height = screen_height
 
+        # 无敌 / 减速 / 提示的倒计时登记在调度器里；
+        # 没有外部调度器时自带一个，由 update() 推进
+        self._owns_scheduler = scheduler is None
+        self.scheduler = scheduler if scheduler is not None else Scheduler()
+        self._invincible_t = None
+        self._slow_t = None
+        self._hint_t = None
+
         self.lives = 3
         self.score = 0
         self.invincible = False
-        self.invincible_timer = 0
 
         self.carrying = None
         self.carrying_category = None
         self.carrying_type = None
 
         self.interact_hint = ""
-        self.hint_timer = 0
 
         self.slowed = False
-        self.slow_timer = 0
 
         self.facing_right = True
         self.bob_timer = 0
@@ -76,37 +86,46 @@ class Duck:
         self.is_blinking = False
         self.walk_frame = 0
 
+        self._load_fonts()
+        display.on_rescale(self._load_fonts)
+
+    def _load_fonts(self):
+        """字号按画布比例，窗口比例变了重开（见 display.py）"""
         self._label_font = _load_chinese_font(24)
         self._hint_font = _load_chinese_font(22)
 
-    def handle_input(self, keys):
+    def handle_input(self, keys, walkable=None):
+        """
+        walkable: 关卡的 CollisionMap，有的话按轴分离地贴着障碍滑动
+        """
         moving = False
         current_speed = self.base_speed
         if self.slowed:
             current_speed = self.base_speed * 0.4
-            self.slow_timer -= 1
-            if self.slow_timer <= 0:
-                self.slowed = False
 
+        dx = dy = 0
         if keys[pygame.K_LEFT]:
-            self.x -= current_speed
+            dx -= current_speed
             self.facing_right = False
             moving = True
         if keys[pygame.K_RIGHT]:
-            self.x += current_speed
+            dx += current_speed
             self.facing_right = True
             moving = True
         if keys[pygame.K_UP]:
-            self.y -= current_speed
+            dy -= current_speed
             moving = True
         if keys[pygame.K_DOWN]:
-            self.y += current_speed
+            dy += current_speed
             moving = True
 
-        self.x = max(self.width // 2,
-                     min(self.screen_width - self.width // 2, self.x))
-        self.y = max(self.height // 2 + 75,
-                     min(self.screen_height - self.height // 2, self.y))
+        nx = max(self.width // 2,
+                 min(self.screen_width - self.width // 2, self.x + dx))
+        ny = max(self.height // 2 + 75,
+                 min(self.screen_height - self.height // 2, self.y + dy))
+        if walkable is not None:
+            nx, ny = walkable.slide(self.x, self.y, nx - self.x, ny - self.y)
+        self.x, self.y = nx, ny
 
         if moving:
             self.walk_frame += 1
@@ -121,24 +140,40 @@ class Duck:
             if self.blink_timer > 128:
                 self.is_blinking = False
                 self.blink_timer = 0
-        if self.invincible:
-            self.invincible_timer -= 1
-            if self.invincible_timer <= 0:
-                self.invincible = False
-        if self.hint_timer > 0:
-            self.hint_timer -= 1
+        if self._owns_scheduler:
+            self.scheduler.tick()
+
+    # 剩余帧数（只读，由调度器算出）
+    @property
+    def invincible_timer(self):
+        return self.scheduler.remaining(self._invincible_t)
+
+    @property
+    def slow_timer(self):
+        return self.scheduler.remaining(self._slow_t)
+
+    @property
+    def hint_timer(self):
+        return self.scheduler.remaining(self._hint_t)
+
+    def _end_invincible(self):
+        self.invincible = False
+
+    def _end_slow(self):
+        self.slowed = False
 
     def take_damage(self):
         if not self.invincible:
             self.lives -= 1
             self.invincible = True
-            self.invincible_timer = 90
+            self._invincible_t = self.scheduler.after(90, self._end_invincible)
             return True
         return False
 
     def apply_slow(self, duration=60):
         self.slowed = True
-        self.slow_timer = duration
+        self.scheduler.cancel(self._slow_t)
+        self._slow_t = self.scheduler.after(duration, self._end_slow)
 
     def pick_up(self, item_name, category, item_type):
         self.carrying = item_name
@@ -152,13 +187,20 @@ class Duck:
 
     def show_hint(self, text, duration=90):
         self.interact_hint = text
-        self.hint_timer = duration
+        self.scheduler.cancel(self._hint_t)
+        self._hint_t = self.scheduler.after(duration)
 
     def get_rect(self):
         return pygame.Rect(self.x - self.width // 2,
                            self.y - self.height // 2,
                            self.width, self.height)
 
+    def snapshot(self):
+        """绘制线程用的只读副本（见 pipeline.py）"""
+        snap = copy.copy(self)
+        snap.scheduler = self.scheduler.snapshot()
+        return snap
+
     def draw(self, screen):
         if self.invincible and self.invincible_timer % 6 < 3:
             return
@@ -169,32 +211,34 @@ class Duck:
         d = 1 if self.facing_right else -1
 
         # ---- 地面阴影 ----
-        shadow = pygame.Surface((60, 16), pygame.SRCALPHA)
-        pygame.draw.ellipse(shadow, (0, 0, 0, 28), (0, 0, 60, 16))
-        screen.blit(shadow, (cx - 30, cy + 33))
+        if quality.shadows:
+            shadow = view.Surface((60, 16), pygame.SRCALPHA)
+            view.draw.ellipse(shadow, (0, 0, 0, 28), (0, 0, 60, 16))
+            view.blit(screen, shadow, (cx - 30, cy + 33))
 
         # ---- 脚 ----
         foot_y = cy + 28
         foot_off = math.sin(self.walk_frame * 0.3) * 5 if self.walk_frame > 0 else 0
-        pygame.draw.ellipse(screen, DUCK_FOOT,
-                            (cx - 22, foot_y + int(foot_off), 23, 12))
-        pygame.draw.ellipse(screen, DUCK_FOOT,
-                            (cx + 1, foot_y - int(foot_off), 23, 12))
+        view.draw.ellipse(screen, DUCK_FOOT,
+                          (cx - 22, foot_y + int(foot_off), 23, 12))
+        view.draw.ellipse(screen, DUCK_FOOT,
+                          (cx + 1, foot_y - int(foot_off), 23, 12))
         # 脚趾纹
-        pygame.draw.line(screen, (230, 115, 40),
-                         (cx - 15, foot_y + int(foot_off) + 5),
-                         (cx - 7, foot_y + int(foot_off)), 2)
-        pygame.draw.line(screen, (230, 115, 40),
-                         (cx + 8, foot_y - int(foot_off) + 5),
-                         (cx + 16, foot_y - int(foot_off)), 2)
+        view.draw.line(screen, (230, 115, 40),
+                       (cx - 15, foot_y + int(foot_off) + 5),
+                       (cx - 7, foot_y + int(foot_off)), 2)
+        view.draw.line(screen, (230, 115, 40),
+                       (cx + 8, foot_y - int(foot_off) + 5),
+                       (cx + 16, foot_y - int(foot_off)), 2)
 
         # ---- 身体 ----
         body_rect = pygame.Rect(cx - 33, cy - 15, 66, 50)
-        pygame.draw.ellipse(screen, DUCK_BODY, body_rect)
+        view.draw.ellipse(screen, DUCK_BODY, body_rect)
         # 腹部高光
-        belly = pygame.Surface((40, 30), pygame.SRCALPHA)
-        pygame.draw.ellipse(belly, (*DUCK_BODY_LIGHT, 120), (0, 0, 40, 30))
-        screen.blit(belly, (cx - 20, cy - 5))
+        if quality.highlights:
+            belly = view.Surface((40, 30), pygame.SRCALPHA)
+            view.draw.ellipse(belly, (*DUCK_BODY_LIGHT, 120), (0, 0, 40, 30))
+            view.blit(screen, belly, (cx - 20, cy - 5))
 
         # ---- 翅膀 ----
         wing_bob = math.sin(self.bob_timer * 2) * 5
@@ -206,43 +250,47 @@ class Duck:
             (wing_x - d * 3, cy + 17),
         ]
         # 翅膀阴影
-        shadow_pts = [(p[0] + 2, p[1] + 2) for p in pts]
-        s = pygame.Surface((100, 66), pygame.SRCALPHA)
-        offset_pts = [(p[0] - cx + 50, p[1] - cy + 16) for p in shadow_pts]
-        pygame.draw.polygon(s, (0, 0, 0, 20), offset_pts)
-        screen.blit(s, (cx - 50, cy - 16))
-        pygame.draw.polygon(screen, DUCK_WING, pts)
+        if quality.shadows:
+            shadow_pts = [(p[0] + 2, p[1] + 2) for p in pts]
+            s = view.Surface((100, 66), pygame.SRCALPHA)
+            offset_pts = [(p[0] - cx + 50, p[1] - cy + 16) for p in shadow_pts]
+            view.draw.polygon(s, (0, 0, 0, 20), offset_pts)
+            view.blit(screen, s, (cx - 50, cy - 16))
+        view.draw.polygon(screen, DUCK_WING, pts)
         # 翅膀高光
-        hl_pts = [pts[0], (wing_x + d * 8, cy + 3 + int(wing_bob // 2)), pts[3]]
-        pygame.draw.polygon(screen, (255, 210, 60), hl_pts)
+        if quality.highlights:
+            hl_pts = [pts[0], (wing_x + d * 8, cy + 3 + int(wing_bob // 2)), pts[3]]
+            view.draw.polygon(screen, (255, 210, 60), hl_pts)
 
         # ---- 头 ----
         head_x = cx + d * 5
         head_y = cy - 30
         # 头部阴影
-        head_shadow = pygame.Surface((56, 56), pygame.SRCALPHA)
-        pygame.draw.circle(head_shadow, (0, 0, 0, 18), (28, 30), 25)
-        screen.blit(head_shadow, (head_x - 28, head_y - 27))
+        if quality.shadows:
+            head_shadow = view.Surface((56, 56), pygame.SRCALPHA)
+            view.draw.circle(head_shadow, (0, 0, 0, 18), (28, 30), 25)
+            view.blit(screen, head_shadow, (head_x - 28, head_y - 27))
         # 头
-        pygame.draw.circle(screen, DUCK_HEAD, (head_x, head_y), 25)
+        view.draw.circle(screen, DUCK_HEAD, (head_x, head_y), 25)
         # 头部高光
-        hl = pygame.Surface((24, 24), pygame.SRCALPHA)
-        pygame.draw.circle(hl, (*DUCK_HEAD_LIGHT, 80), (12, 12), 12)
-        screen.blit(hl, (head_x - 15, head_y - 20))
+        if quality.highlights:
+            hl = view.Surface((24, 24), pygame.SRCALPHA)
+            view.draw.circle(hl, (*DUCK_HEAD_LIGHT, 80), (12, 12), 12)
+            view.blit(screen, hl, (head_x - 15, head_y - 20))
 
         # ---- 眼睛 ----
         eye_x = head_x + d * 10
         eye_y = head_y - 3
         if self.is_blinking:
-            pygame.draw.line(screen, DUCK_EYE,
-                             (eye_x - 5, eye_y), (eye_x + 5, eye_y), 3)
+            view.draw.line(screen, DUCK_EYE,
+                           (eye_x - 5, eye_y), (eye_x + 5, eye_y), 3)
         else:
             # 白底
-            pygame.draw.circle(screen, WHITE, (eye_x, eye_y), 8)
+            view.draw.circle(screen, WHITE, (eye_x, eye_y), 8)
             # 瞳孔
-            pygame.draw.circle(screen, DUCK_EYE, (eye_x + d * 2, eye_y), 5)
+            view.draw.circle(screen, DUCK_EYE, (eye_x + d * 2, eye_y), 5)
             # 高光
-            pygame.draw.circle(screen, WHITE, (eye_x + d * 2 + 1, eye_y - 2), 2)
+            view.draw.circle(screen, WHITE, (eye_x + d * 2 + 1, eye_y - 2), 2)
 
         # ---- 嘴巴 ----
         beak_x = head_x + d * 23
@@ -252,17 +300,17 @@ class Duck:
             (beak_x, beak_y),
             (head_x + d * 16, beak_y + 7),
         ]
-        pygame.draw.polygon(screen, DUCK_BEAK, beak_pts)
+        view.draw.polygon(screen, DUCK_BEAK, beak_pts)
         # 嘴巴中线
-        pygame.draw.line(screen, (230, 115, 40),
-                         (head_x + d * 16, beak_y), (beak_x, beak_y), 2)
+        view.draw.line(screen, (230, 115, 40),
+                       (head_x + d * 16, beak_y), (beak_x, beak_y), 2)
 
         # ---- 腮红 ----
         blush_x = head_x - d * 2
         blush_y = head_y + 10
-        blush = pygame.Surface((16, 10), pygame.SRCALPHA)
-        pygame.draw.ellipse(blush, (*DUCK_BLUSH, 80), (0, 0, 16, 10))
-        screen.blit(blush, (blush_x - 8, blush_y - 5))
+        blush = view.Surface((16, 10), pygame.SRCALPHA)
+        view.draw.ellipse(blush, (*DUCK_BLUSH, 80), (0, 0, 16, 10))
+        view.blit(screen, blush, (blush_x - 8, blush_y - 5))
 
         # ---- 头顶：携带物品 ----
         if self.carrying:
@@ -277,16 +325,16 @@ class Duck:
             alpha = min(255, self.hint_timer * 6)
             hint_surf = self._hint_font.render(
                 self.interact_hint, True, WHITE)
-            hw, hh = hint_surf.get_size()
+            hw, hh = view.size(hint_surf)
             pad = 16
-            bg = pygame.Surface((hw + pad * 2, hh + 12), pygame.SRCALPHA)
-            pygame.draw.rect(bg, (60, 64, 67, min(200, alpha)),
-                             (0, 0, hw + pad * 2, hh + 12),
-                             border_radius=18)
+            bg = view.Surface((hw + pad * 2, hh + 12), pygame.SRCALPHA)
+            view.draw.rect(bg, (60, 64, 67, min(200, alpha)),
+                           (0, 0, hw + pad * 2, hh + 12),
+                           border_radius=18)
             hx = cx - hw // 2 - pad
             hy = cy + 50
-            screen.blit(bg, (hx, hy))
-            screen.blit(hint_surf, (hx + pad, hy + 6))
+            view.blit(screen, bg, (hx, hy))
+            view.blit(screen, hint_surf, (hx + pad, hy + 6))
 
         # ---- 减速指示 ----
         if self.slowed:
@@ -297,14 +345,14 @@ class Duck:
         self.x = self.screen_width // 2
         self.y = self.screen_height // 2
         self.invincible = False
-        self.invincible_timer = 0
         self.carrying = None
         self.carrying_category = None
         self.carrying_type = None
         self.slowed = False
-        self.slow_timer = 0
         self.interact_hint = ""
-        self.hint_timer = 0
+        for t in (self._invincible_t, self._slow_t, self._hint_t):
+            self.scheduler.cancel(t)
+        self._invincible_t = self._slow_t = self._hint_t = None
 
     def full_reset(self):
         self.reset()
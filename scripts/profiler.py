@@ -0,0 +1,187 @@
+"""
+profiler.py —— 帧性能分析浮层
+包含：按子系统分段计时、滚动帧时长分位数（p50/p95/p99）、帧时长折线图
+游戏中按 F3 开关；关闭时每个打点只多一次属性判断
+"""
+
+import time
+from collections import deque
+
+import pygame
+
+
+# 浮层里默认的子系统显示顺序（没列出的名字按首次出现追加在后面）
+DEFAULT_SECTIONS = ["input", "update", "ground", "objects", "particles",
+                    "duck", "hud", "ui", "overlay", "flip", "tasks", "wait"]
+
+TARGET_MS = 1000 / 60
+
+
+class FrameProfiler:
+    """
+    用"打点"计时：lap(name) 把上一次打点到现在的时间记到 name 上，
+    同一帧里同名多次打点会累加。begin_frame() 结束上一帧并开始新一帧。
+    """
+
+    HISTORY = 240       # 保留最近多少帧（60FPS 下约 4 秒）
+    SMOOTHING = 0.1     # 分段耗时的指数平滑系数
+    TOGGLE_KEY = pygame.K_F3
+
+    def __init__(self, sections=DEFAULT_SECTIONS, history=HISTORY):
+        self.enabled = False
+        self.sections = list(sections)
+        self.frame_times = deque(maxlen=history)
+        self.averages = {}
+        self._current = {}
+        self._frame_start = None
+        self._last = 0
+        self._font = None
+        self._panel = None
+        # 可选的 DrawStats：每帧归档一次计数，浮层里显示上一帧的次数
+        self.counters = None
+        # 浮层里多显示的几行：每个都是返回一行文字的函数（如当前画质档位、卡帧统计）
+        self.status = []
+
+    # --------------------------------------------------
+    #  开关
+    # --------------------------------------------------
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.frame_times.clear()
+        self.averages.clear()
+        self._current = {}
+        self._frame_start = None
+
+    def handle_event(self, event):
+        """处理 F3；返回 True 表示事件已被消费"""
+        if event.type == pygame.KEYDOWN and event.key == self.TOGGLE_KEY:
+            self.toggle()
+            return True
+        return False
+
+    # --------------------------------------------------
+    #  打点
+    # --------------------------------------------------
+    def begin_frame(self):
+        if self.counters is not None:
+            self.counters.end_frame()
+        if not self.enabled:
+            return
+        now = time.perf_counter_ns()
+        if self._frame_start is not None:
+            self._finish_frame(now)
+        self._frame_start = now
+        self._last = now
+        self._current = {}
+
+    def lap(self, name):
+        if not self.enabled:
+            return
+        now = time.perf_counter_ns()
+        current = self._current
+        current[name] = current.get(name, 0) + now - self._last
+        self._last = now
+
+    def _finish_frame(self, now):
+        self.frame_times.append((now - self._frame_start) / 1e6)
+        for name in self._current:
+            if name not in self.sections:
+                self.sections.append(name)
+        k = self.SMOOTHING
+        for name in self.sections:
+            ms = self._current.get(name, 0) / 1e6
+            old = self.averages.get(name)
+            self.averages[name] = ms if old is None else old + (ms - old) * k
+
+    # --------------------------------------------------
+    #  统计
+    # --------------------------------------------------
+    def percentiles(self, qs=(0.5, 0.95, 0.99)):
+        if not self.frame_times:
+            return [0.0] * len(qs)
+        ordered = sorted(self.frame_times)
+        n = len(ordered)
+        return [ordered[min(n - 1, int(q * n))] for q in qs]
+
+    # --------------------------------------------------
+    #  绘制
+    # --------------------------------------------------
+    def draw(self, surface):
+        if not self.enabled:
+            return
+        if self._font is None:
+            self._font = pygame.font.Font(None, 22)
+        font = self._font
+        shown = [name for name in self.sections if name in self.averages]
+        counter_lines = self._counter_lines()
+        counter_lines.extend(line() for line in self.status)
+        line_h = 20
+        graph_h = 60
+        width = 300
+        height = (14 + line_h * (2 + len(shown) + len(counter_lines))
+                  + graph_h + 10)
+        if self._panel is None or self._panel.get_size() != (width, height):
+            self._panel = pygame.Surface((width, height), pygame.SRCALPHA)
+            self._panel.fill((20, 22, 26, 200))
+
+        x0 = surface.get_width() - width - 12
+        y0 = 90            # 避开两个游戏顶部的 HUD 条
+        surface.blit(self._panel, (x0, y0))
+
+        p50, p95, p99 = self.percentiles()
+        last = self.frame_times[-1] if self.frame_times else 0.0
+        y = y0 + 8
+        for text, color in (
+            (f"frame {last:5.1f} ms   {1000 / last if last else 0:4.0f} fps",
+             (255, 255, 255)),
+            (f"p50 {p50:5.1f}  p95 {p95:5.1f}  p99 {p99:5.1f} ms",
+             (255, 214, 102) if p95 > TARGET_MS * 1.5 else (180, 230, 180)),
+        ):
+            surface.blit(font.render(text, True, color), (x0 + 10, y))
+            y += line_h
+
+        # 每个子系统：名字、平滑后的毫秒数、占 1 帧预算的条
+        for name in shown:
+            ms = self.averages[name]
+            surface.blit(font.render(f"{name:<9s}", True, (200, 204, 210)),
+                         (x0 + 10, y))
+            surface.blit(font.render(f"{ms:6.2f}", True, (255, 255, 255)),
+                         (x0 + 90, y))
+            bar_w = int(min(1.0, ms / TARGET_MS) * 130)
+            if bar_w:
+                color = (120, 200, 255) if name != "wait" else (90, 96, 104)
+                pygame.draw.rect(surface, color, (x0 + 150, y + 4, bar_w, 10))
+            y += line_h
+
+        for text in counter_lines:
+            surface.blit(font.render(text, True, (200, 204, 210)), (x0 + 10, y))
+            y += line_h
+
+        self._draw_sparkline(surface, pygame.Rect(x0 + 10, y + 4,
+                                                  width - 20, graph_h))
+
+    def _counter_lines(self):
+        if self.counters is None:
+            return []
+        last = self.counters.last
+        lines = ["  ".join(f"{kind} {last[kind]}" for kind in last)]
+        for kind, label, per_frame in self.counters.top(3):
+            lines.append(f"{per_frame:5.1f} {label[:34]}")
+        return lines
+
+    def _draw_sparkline(self, surface, rect):
+        pygame.draw.rect(surface, (40, 44, 52), rect)
+        if len(self.frame_times) < 2:
+            return
+        scale_ms = max(TARGET_MS * 2, max(self.frame_times))
+        # 60FPS 预算线
+        target_y = rect.bottom - int(TARGET_MS / scale_ms * rect.height)
+        pygame.draw.line(surface, (90, 160, 90),
+                         (rect.left, target_y), (rect.right, target_y))
+        step = rect.width / (self.frame_times.maxlen - 1)
+        points = [
+            (rect.left + i * step,
+             rect.bottom - min(rect.height, ms / scale_ms * rect.height))
+            for i, ms in enumerate(self.frame_times)
+        ]
+        pygame.draw.lines(surface, (255, 214, 102), False, points)
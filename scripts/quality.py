@@ -0,0 +1,167 @@
+"""
+quality.py —— 画质档位与自适应调节
+包含：三档画质（阴影、高光、发光光圈、粒子数、纸屑密度、菜单浮动圆、渐变精度）、
+按最近一段帧耗时自动升降档的调节器
+
+绘制代码直接读本模块的开关：
+
+    if quality.shadows:
+        ...画阴影
+    count = quality.share(20, quality.particles)
+
+--quality high / medium / low 固定一档；默认 auto 从 high 起步，由
+QualityGovernor 在连续超出 60 FPS 预算时降一档、长时间有富余时再升回去。
+粒子和纸屑只在发射时按比例减量，各用自己的随机数流，不影响玩法与录像回放。
+只画一次就缓存起来的底图（菜单渐变等）用 full() 按最高档画，不随档位变。
+"""
+
+import time
+from contextlib import contextmanager
+from collections import deque
+
+
+LOW = 0
+MEDIUM = 1
+HIGH = 2
+NAMES = ("low", "medium", "high")
+
+TIERS = {
+    HIGH: {
+        "shadows": True,          # 物体 / 卡片 / 按钮的半透明投影
+        "highlights": True,       # 高光条、高光点
+        "glow": True,             # 垃圾周围的发光光圈
+        "soft_particles": True,   # 粒子 / 水滴 / 纸屑用半透明临时画布画
+        "particles": 1.0,         # 粒子发射数量比例
+        "confetti": 1.0,          # 纸屑数量比例
+        "menu_circles": 24,       # 菜单背景浮动圆个数
+        "gradient_step": 1,       # 实时渐变每条色带的行数
+    },
+    MEDIUM: {
+        "shadows": True,
+        "highlights": False,
+        "glow": False,
+        "soft_particles": True,
+        "particles": 0.6,
+        "confetti": 0.5,
+        "menu_circles": 12,
+        "gradient_step": 2,
+    },
+    LOW: {
+        "shadows": False,
+        "highlights": False,
+        "glow": False,
+        "soft_particles": False,
+        "particles": 0.35,
+        "confetti": 0.25,
+        "menu_circles": 0,
+        "gradient_step": 4,
+    },
+}
+
+tier = HIGH
+shadows = True
+highlights = True
+glow = True
+soft_particles = True
+particles = 1.0
+confetti = 1.0
+menu_circles = 24
+gradient_step = 1
+
+
+def set_tier(value):
+    global tier
+    tier = max(LOW, min(HIGH, value))
+    globals().update(TIERS[tier])
+    return tier
+
+
+def parse(name):
+    """"high" / "medium" / "low" -> 档位"""
+    return NAMES.index(name)
+
+
+def share(count, fraction):
+    """按比例减量，原本有的至少留 1 个"""
+    if count <= 0:
+        return 0
+    return max(1, int(count * fraction + 0.5))
+
+
+@contextmanager
+def full():
+    """临时切到最高档（画要缓存的底图用），结束后恢复"""
+    saved = tier
+    set_tier(HIGH)
+    try:
+        yield
+    finally:
+        set_tier(saved)
+
+
+# ============================================================
+#  自适应调节
+# ============================================================
+_now = time.perf_counter
+
+
+class QualityGovernor:
+    """
+    每帧 begin_frame() / end_frame() 量一次本帧工作耗时（不含 clock.tick 的等待）。
+    取最近 WINDOW 帧的中位数（偶发的单帧卡顿归 gcpause.py 管，不因此降档）：
+      · 超过预算 → 降一档；
+      · 低于预算的 UP_RATIO 并且距上次换档已过 up_delay 帧 → 升一档。
+    升上去没多久又降回来，说明这一档刚好在边缘，下次升档的等待时间加倍。
+    """
+
+    WINDOW = 45             # 取中位数的帧数（60FPS 下 0.75 秒）
+    UP_RATIO = 0.6          # 中位数低于预算的这个比例才算有富余
+    UP_DELAY = 300          # 距上次换档至少这么多帧才试着升档
+    MAX_UP_DELAY = 3600
+    BOUNCE_FRAMES = 240     # 升档后这么多帧内又降档算一次来回
+
+    def __init__(self, budget_ms=1000 / 60, start=HIGH):
+        self.budget_ms = budget_ms
+        self.samples = deque(maxlen=self.WINDOW)
+        self.frame = 0
+        self.up_delay = self.UP_DELAY
+        self.changes = 0
+        self._changed_frame = 0
+        self._last_up_frame = None
+        self._frame_start = None
+        set_tier(start)
+
+    def begin_frame(self):
+        self._frame_start = _now()
+
+    def end_frame(self):
+        """在 flip 之后、跑后台任务之前调用；换档时返回新档位，否则返回 None"""
+        if self._frame_start is None:
+            return None
+        self.frame += 1
+        self.samples.append((_now() - self._frame_start) * 1000)
+        self._frame_start = None
+        if len(self.samples) < self.WINDOW:
+            return None
+        median = sorted(self.samples)[self.WINDOW // 2]
+        if median > self.budget_ms and tier > LOW:
+            if (self._last_up_frame is not None
+                    and self.frame - self._last_up_frame < self.BOUNCE_FRAMES):
+                self.up_delay = min(self.MAX_UP_DELAY, self.up_delay * 2)
+            return self._change(tier - 1)
+        if (median < self.budget_ms * self.UP_RATIO and tier < HIGH
+                and self.frame - self._changed_frame >= self.up_delay):
+            self._last_up_frame = self.frame
+            return self._change(tier + 1)
+        return None
+
+    def _change(self, value):
+        set_tier(value)
+        self.samples.clear()
+        self._changed_frame = self.frame
+        self.changes += 1
+        return tier
+
+    def status(self):
+        """性能浮层里显示的一行"""
+        return f"quality {NAMES[tier]} (auto, {self.changes} changes)"
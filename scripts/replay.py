@@ -0,0 +1,198 @@
+"""
+replay.py —— 输入录制与回放
+包含：把随机种子和逐帧输入写成紧凑的二进制录像（gzip）、从录像逐帧还原
+事件 / 鼠标位置 / 方向键状态，用来无窗口全速重放一局做可重复的性能基准
+
+文件格式（小端）：
+  头部   "GHXR" 版本(B) 游戏标识(4s) 帧率(H) 种子(Q)
+  每帧   上一帧耗时 ms(H) 本帧记录数(H)，后面跟若干条记录：
+    KEYDOWN / KEYUP      类型(B) 键码(I)
+    MOUSEDOWN / MOUSEUP  类型(B) 按钮(B) x(h) y(h)
+    MOTION               类型(B) 按住的键(B) x(h) y(h)
+    MOUSE_POS            类型(B) x(h) y(h)      轮询到的鼠标位置，变化时才写
+    KEYS                 类型(B) 方向键位图(B)  变化时才写
+    QUIT                 类型(B)
+其它事件（窗口、焦点等）不影响游戏逻辑，不录。
+"""
+
+import gzip
+import time
+import struct
+import atexit
+
+import pygame
+
+
+MAGIC = b"GHXR"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sB4sHQ")
+_FRAME = struct.Struct("<HH")
+_KEY = struct.Struct("<I")
+_BUTTON = struct.Struct("<Bhh")
+_POS = struct.Struct("<hh")
+_BYTE = struct.Struct("<B")
+
+KEYDOWN, KEYUP, MOUSEDOWN, MOUSEUP, MOTION, MOUSE_POS, KEYS, QUIT = range(1, 9)
+
+# 两个游戏里用 get_pressed() 轮询的键（位图里的顺序）
+TRACKED_KEYS = (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN)
+
+
+class KeyState:
+    """回放时代替 pygame.key.get_pressed() 的返回值"""
+
+    def __init__(self, mask=0):
+        self.mask = mask
+
+    def __getitem__(self, key):
+        try:
+            return bool(self.mask >> TRACKED_KEYS.index(key) & 1)
+        except ValueError:
+            return False
+
+
+def key_mask(keys):
+    mask = 0
+    for i, key in enumerate(TRACKED_KEYS):
+        if keys[key]:
+            mask |= 1 << i
+    return mask
+
+
+# ============================================================
+#  录制
+# ============================================================
+class InputRecorder:
+    def __init__(self, path, game_id, seed, fps=60):
+        self.path = path
+        self.frames = 0
+        self._file = gzip.open(path, "wb")
+        self._file.write(_HEADER.pack(MAGIC, VERSION, game_id.encode("ascii"),
+                                      fps, seed))
+        self._mouse = None
+        self._mask = 0
+        atexit.register(self.close)
+
+    def record_frame(self, dt_ms, events, mouse_pos, keys):
+        """
+        写一帧：dt_ms 是上一帧的耗时；keys 为 get_pressed() 或同样可按键码取值的对象，
+        不轮询按键的游戏传 None
+        """
+        records = []
+        for event in events:
+            record = self._encode(event)
+            if record:
+                records.append(record)
+        mouse_pos = (int(mouse_pos[0]), int(mouse_pos[1]))
+        if mouse_pos != self._mouse:
+            self._mouse = mouse_pos
+            records.append(_BYTE.pack(MOUSE_POS) + _POS.pack(*mouse_pos))
+        mask = key_mask(keys) if keys is not None else 0
+        if mask != self._mask:
+            self._mask = mask
+            records.append(_BYTE.pack(KEYS) + _BYTE.pack(mask))
+        self._file.write(_FRAME.pack(min(int(dt_ms), 0xFFFF), len(records)))
+        self._file.write(b"".join(records))
+        self.frames += 1
+
+    @staticmethod
+    def _encode(event):
+        t = event.type
+        if t == pygame.KEYDOWN:
+            return _BYTE.pack(KEYDOWN) + _KEY.pack(event.key)
+        if t == pygame.KEYUP:
+            return _BYTE.pack(KEYUP) + _KEY.pack(event.key)
+        if t in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP):
+            kind = MOUSEDOWN if t == pygame.MOUSEBUTTONDOWN else MOUSEUP
+            return _BYTE.pack(kind) + _BUTTON.pack(event.button, *event.pos)
+        if t == pygame.MOUSEMOTION:
+            buttons = sum(1 << i for i, down in enumerate(event.buttons) if down)
+            return _BYTE.pack(MOTION) + _BUTTON.pack(buttons, *event.pos)
+        if t == pygame.QUIT:
+            return _BYTE.pack(QUIT)
+        return None
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            print(f"输入录像已写入 {self.path}（{self.frames} 帧）")
+
+
+# ============================================================
+#  回放
+# ============================================================
+class InputReplayer:
+    def __init__(self, path, game_id=None):
+        self.path = path
+        with gzip.open(path, "rb") as f:
+            data = f.read()
+        magic, version, game, self.fps, self.seed = _HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} 不是可识别的输入录像")
+        self.game_id = game.decode("ascii")
+        if game_id is not None and self.game_id != game_id:
+            raise ValueError(f"{path} 录的是 {self.game_id}，不是 {game_id}")
+        self._data = data
+        self._offset = _HEADER.size
+        self._mouse = (0, 0)
+        self._mask = 0
+        self.frames = 0
+        self._started = None
+
+    @property
+    def finished(self):
+        return self._offset >= len(self._data)
+
+    def next_frame(self):
+        """返回 (dt_ms, events, mouse_pos, keys)；录像读完时返回 None"""
+        if self.finished:
+            return None
+        if self._started is None:
+            self._started = time.perf_counter()
+        data = self._data
+        dt_ms, count = _FRAME.unpack_from(data, self._offset)
+        offset = self._offset + _FRAME.size
+        events = []
+        for _ in range(count):
+            kind = data[offset]
+            offset += 1
+            if kind in (KEYDOWN, KEYUP):
+                (key,) = _KEY.unpack_from(data, offset)
+                offset += _KEY.size
+                events.append(pygame.event.Event(
+                    pygame.KEYDOWN if kind == KEYDOWN else pygame.KEYUP,
+                    key=key, mod=0, unicode="", scancode=0))
+            elif kind in (MOUSEDOWN, MOUSEUP):
+                button, x, y = _BUTTON.unpack_from(data, offset)
+                offset += _BUTTON.size
+                events.append(pygame.event.Event(
+                    pygame.MOUSEBUTTONDOWN if kind == MOUSEDOWN
+                    else pygame.MOUSEBUTTONUP, button=button, pos=(x, y)))
+            elif kind == MOTION:
+                buttons, x, y = _BUTTON.unpack_from(data, offset)
+                offset += _BUTTON.size
+                events.append(pygame.event.Event(
+                    pygame.MOUSEMOTION, pos=(x, y), rel=(0, 0),
+                    buttons=tuple(buttons >> i & 1 for i in range(3))))
+            elif kind == MOUSE_POS:
+                self._mouse = _POS.unpack_from(data, offset)
+                offset += _POS.size
+            elif kind == KEYS:
+                self._mask = data[offset]
+                offset += 1
+            elif kind == QUIT:
+                events.append(pygame.event.Event(pygame.QUIT))
+            else:
+                raise ValueError(f"{self.path} 第 {self.frames} 帧有未知记录 {kind}")
+        self._offset = offset
+        self.frames += 1
+        return dt_ms, events, self._mouse, KeyState(self._mask)
+
+    def summary(self):
+        elapsed = time.perf_counter() - (self._started or time.perf_counter())
+        ms = elapsed * 1000 / max(1, self.frames)
+        fps = self.frames / elapsed if elapsed > 0 else 0
+        return (f"回放 {self.path}：{self.frames} 帧，用时 {elapsed:.2f} s，"
+                f"平均 {ms:.2f} ms/帧（{fps:.0f} FPS），种子 {self.seed}")
@@ -0,0 +1,124 @@
+"""
+sampler.py —— 低开销采样分析器
+包含：后台线程定时抓取主线程调用栈、按游戏状态分组的折叠栈统计、
+flamegraph 折叠格式导出
+
+cProfile 给每次函数调用都加钩子，大量细小的绘制调用会被严重放大；
+这里每隔几毫秒看一眼主线程在干什么，开销与调用次数无关。
+输出的 .folded 文件可以直接交给 flamegraph.pl、speedscope 或 inferno。
+"""
+
+import os
+import sys
+import atexit
+import threading
+
+
+class SamplingProfiler:
+    MAX_DEPTH = 96
+    # 不计入栈的包装层（@traced 的 wrapper 会夹在每个被追踪的函数外面）
+    SKIP = {"tracing:wrapper"}
+
+    def __init__(self, hz=200, state_fn=None, thread_id=None):
+        self.interval = 1.0 / max(1, hz)
+        # 返回当前游戏状态（menu / playing ……），作为每条栈的根
+        self.state_fn = state_fn
+        self.thread_id = thread_id or threading.main_thread().ident
+        self.stacks = {}
+        self.samples = 0
+        self.path = "profile.folded"
+        self._labels = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    # --------------------------------------------------
+    #  启停
+    # --------------------------------------------------
+    def start(self, path=None, dump_at_exit=True):
+        if path:
+            self.path = path
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sampler",
+                                        daemon=True)
+        self._thread.start()
+        if dump_at_exit:
+            atexit.register(self._dump_at_exit)
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None
+
+    # --------------------------------------------------
+    #  采样
+    # --------------------------------------------------
+    def _run(self):
+        wait = self._stop.wait
+        interval = self.interval
+        while not wait(interval):
+            self.sample()
+
+    def _label(self, code):
+        """code 对象 → "模块:函数"，结果缓存"""
+        label = self._labels.get(code)
+        if label is None:
+            module = os.path.splitext(os.path.basename(code.co_filename))[0]
+            label = f"{module}:{code.co_name}"
+            self._labels[code] = label
+        return label
+
+    def sample(self):
+        frame = sys._current_frames().get(self.thread_id)
+        if frame is None:
+            return
+        parts = []
+        depth = 0
+        skip = self.SKIP
+        while frame is not None and depth < self.MAX_DEPTH:
+            label = self._label(frame.f_code)
+            if label not in skip:
+                parts.append(label)
+            frame = frame.f_back
+            depth += 1
+        state = self.state_fn() if self.state_fn else None
+        if state:
+            parts.append(f"state:{state}")
+        parts.reverse()
+        key = ";".join(parts)
+        self.stacks[key] = self.stacks.get(key, 0) + 1
+        self.samples += 1
+
+    # --------------------------------------------------
+    #  导出
+    # --------------------------------------------------
+    def by_state(self):
+        """{状态: 样本数}"""
+        totals = {}
+        for stack, count in self.stacks.items():
+            root = stack.split(";", 1)[0]
+            state = root[6:] if root.startswith("state:") else "?"
+            totals[state] = totals.get(state, 0) + count
+        return totals
+
+    def dump(self, path=None):
+        """写出折叠栈（每行 "帧;帧;帧 次数"），返回文件路径"""
+        path = path or self.path
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in sorted(self.stacks.items()):
+                f.write(f"{stack} {count}\n")
+        return path
+
+    def _dump_at_exit(self):
+        self.stop()
+        if self.samples:
+            states = ", ".join(f"{k} {v}" for k, v in
+                               sorted(self.by_state().items()))
+            print(f"采样 {self.samples} 次（{states}）已写入 {self.dump()}")
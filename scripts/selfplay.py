@@ -0,0 +1,306 @@
+"""
+selfplay.py —— 机器人自对弈压测
+包含：进程池里批量跑机器人对局（默认不绘制、无窗口），汇总通关率、
+通关用时、分数分布和每帧耗时分布，可写出逐局 CSV
+
+每个工作进程只建一个 Game，一局结束后由机器人点"返回菜单"再开下一局，
+所以测到的是长时间连续游玩的真实路径。每局的种子 = --seed + 局号，
+同样的参数跑两次结果一致，可以当回归信号用（--min-win-rate 不达标时退出码为 1）。
+
+用法：
+  python selfplay.py                          # 环保小鸭，200 局，进程数 = CPU 核数
+  python selfplay.py --game sort --games 1000 # 根目录的垃圾分类
+  python selfplay.py --games 2000 --csv selfplay.csv
+  python selfplay.py --render                 # 照常绘制（无窗口），连绘制开销一起测
+"""
+
+import os
+import sys
+import csv
+import time
+import copy
+import random
+import argparse
+import importlib.util
+import multiprocessing
+
+import numpy as np
+
+
+FPS = 60
+BUCKET_MS = 0.05            # 帧耗时直方图的桶宽
+BUCKETS = 1000              # 最后一个桶装 >= 50 ms 的帧
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_worker = None              # 工作进程里的 (游戏, 模块, Game, 本局记录, 原始关卡配置)
+
+
+# ============================================================
+#  工作进程
+# ============================================================
+def _load_game_module(kind):
+    if kind == "duck":
+        import main
+        return main
+    # 根目录 main.py 和 scripts/main.py 同名，按路径单独加载
+    spec = importlib.util.spec_from_file_location(
+        "sort_main", os.path.join(_ROOT, "main.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _init_worker(kind, render):
+    global _worker
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+    # SDL 默认把 SIGTERM 变成 QUIT 事件，进程池收尾时的 terminate() 就杀不掉工作进程
+    os.environ["SDL_NO_SIGNAL_HANDLERS"] = "1"
+    # 游戏模块导入时会解析命令行开关，不让它看到这里的参数
+    sys.argv = sys.argv[:1]
+    module = _load_game_module(kind)
+    game = module.Game()
+    game.render = render
+    record = {}
+    # 每局先恢复原始配置再套用这一局的覆盖值（调参时不同局的配置不同）
+    baseline = copy.deepcopy(getattr(module, "LEVEL_CONFIGS", {}))
+    if kind == "duck":
+        def on_transition(old, new):
+            if new == module.STATE_LEVEL_UP:
+                record["level_frames"].append(record["frames"])
+        game.state_listeners.append(on_transition)
+    _worker = (kind, module, game, record, baseline)
+
+
+def make_task(index, seed, mistakes, max_frames, level=None, overrides=None,
+              tag=None):
+    """
+    level: 只打这一关（仅小鸭；从这一关直接开始，过关即结束），为空时打完整一局
+    overrides: {关卡号: {配置键: 值}}，覆盖 LEVEL_CONFIGS
+    tag: 原样带回结果里，调参时用来区分配置
+    """
+    return {"index": index, "seed": seed, "mistakes": mistakes,
+            "max_frames": max_frames, "level": level,
+            "overrides": overrides or {}, "tag": tag}
+
+
+def _apply_overrides(configs, baseline, overrides):
+    for level_id, config in configs.items():
+        config.clear()
+        config.update(baseline[level_id])
+    for level_id, values in overrides.items():
+        configs[level_id].update(values)
+
+
+def play_one(task):
+    """跑一局，返回这一局的统计（帧耗时只回传直方图）"""
+    seed, mistakes = task["seed"], task["mistakes"]
+    max_frames, level = task["max_frames"], task["level"]
+    kind, module, game, record, baseline = _worker
+    import rng
+    from bot import DuckBot, SortBot
+
+    if baseline:
+        # 原地修改：各模块拿到的是同一个 LEVEL_CONFIGS
+        _apply_overrides(module.LEVEL_CONFIGS, baseline, task["overrides"])
+    rng.seed(seed)
+    bot_rng = random.Random(seed)
+    if kind == "duck":
+        bot = DuckBot(game, bot_rng, mistakes)
+        step = lambda: game.step(*bot.next_input(), fps=0)
+        if level is None:
+            finished = lambda: game.state in (module.STATE_WIN,
+                                              module.STATE_GAME_OVER)
+        else:
+            finished = lambda: game.state != module.STATE_PLAYING
+    else:
+        bot = SortBot(game, bot_rng, mistakes)
+        step = lambda: game.step(*bot.next_input(), dt_ms=1000 // FPS, fps=0)
+        finished = lambda: game.state == module.STATE_RESULT
+
+    # 上一局停在结算画面：先让机器人点回菜单（不计入统计）
+    while game.state != module.STATE_MENU:
+        step()
+
+    record.clear()
+    record.update(frames=0, level_frames=[])
+    if level is not None:
+        game.start_level(level)
+    hist = np.zeros(BUCKETS + 1, dtype=np.int64)
+    total_ms = 0.0
+    worst_ms = 0.0
+    now = time.perf_counter
+    while record["frames"] < max_frames:
+        start = now()
+        step()
+        ms = (now() - start) * 1000
+        record["frames"] += 1
+        hist[min(int(ms / BUCKET_MS), BUCKETS)] += 1
+        total_ms += ms
+        worst_ms = max(worst_ms, ms)
+        if finished():
+            break
+
+    frames = record["frames"]
+    result = {"index": task["index"], "seed": seed, "tag": task["tag"],
+              "frames": frames, "seconds": frames / FPS,
+              "mean_ms": total_ms / max(1, frames), "max_ms": worst_ms}
+    if kind == "duck":
+        if game.state == module.STATE_WIN or (
+                level is not None and game.state == module.STATE_LEVEL_UP):
+            outcome, score = "win", game.total_score
+        else:
+            outcome = ("game_over" if game.state == module.STATE_GAME_OVER
+                       else "timeout")
+            score = game.total_score + (game.world.score if game.world else 0)
+        result.update(outcome=outcome, score=score,
+                      level=game.level_manager.current_level,
+                      lives=game.duck.lives,
+                      level_frames=list(record["level_frames"]))
+        if level is not None:
+            # 单关模式：不点"下一关"，直接回菜单等下一局
+            game.state = module.STATE_MENU
+    else:
+        outcome = "win" if finished() else "timeout"
+        result.update(outcome=outcome, score=game.score, correct=game.correct,
+                      level=1, lives=0, level_frames=[])
+    return result, hist
+
+
+# ============================================================
+#  汇总
+# ============================================================
+def hist_percentiles(hist, qs):
+    """从直方图估计分位数（取桶的上沿，单位 ms）"""
+    cum = np.cumsum(hist)
+    total = cum[-1]
+    out = []
+    for q in qs:
+        i = int(np.searchsorted(cum, q / 100 * total))
+        out.append((min(i, BUCKETS) + 1) * BUCKET_MS)
+    return out
+
+
+def summarize(kind, results, hist, wall):
+    n = len(results)
+    lines = [f"{n} 局，用时 {wall:.1f} s（{n / wall:.1f} 局/秒）"]
+    outcomes = {}
+    for r in results:
+        outcomes[r["outcome"]] = outcomes.get(r["outcome"], 0) + 1
+    lines.append("结果：" + "  ".join(f"{k} {v} ({v / n:.1%})"
+                                      for k, v in sorted(outcomes.items())))
+
+    wins = [r["seconds"] for r in results if r["outcome"] == "win"]
+    if wins:
+        p50, p90 = np.percentile(wins, [50, 90])
+        lines.append(f"完成用时（游戏内秒）：平均 {np.mean(wins):.1f}  "
+                     f"p50 {p50:.1f}  p90 {p90:.1f}  最长 {max(wins):.1f}")
+
+    scores = [r["score"] for r in results]
+    lines.append(f"分数：平均 {np.mean(scores):.1f}  最低 {min(scores)}  "
+                 f"p50 {np.percentile(scores, 50):.0f}  最高 {max(scores)}")
+
+    if kind == "duck":
+        reached = {}
+        for r in results:
+            reached[r["level"]] = reached.get(r["level"], 0) + 1
+        lines.append("结束时所在关卡：" + "  ".join(
+            f"第 {k} 关 {v}" for k, v in sorted(reached.items())))
+        # 每关用时：相邻两次过关之间的帧数（含过关画面停留）
+        per_level = {}
+        for r in results:
+            previous = 0
+            for level, frame in enumerate(r["level_frames"], 1):
+                per_level.setdefault(level, []).append((frame - previous) / FPS)
+                previous = frame
+        for level, times in sorted(per_level.items()):
+            lines.append(f"  第 {level} 关通过 {len(times)} 次，"
+                         f"平均 {np.mean(times):.1f} s")
+
+    frames = int(hist.sum())
+    p50, p90, p99, p999 = hist_percentiles(hist, (50, 90, 99, 99.9))
+    worst = max(r["max_ms"] for r in results)
+    mean = sum(r["mean_ms"] * r["frames"] for r in results) / max(1, frames)
+    lines.append(f"每帧耗时（{frames} 帧）：平均 {mean:.3f} ms  p50 {p50:.2f}  "
+                 f"p90 {p90:.2f}  p99 {p99:.2f}  p99.9 {p999:.2f}  "
+                 f"最长 {worst:.1f} ms")
+    return lines
+
+
+def write_csv(path, results):
+    fields = ["index", "seed", "outcome", "score", "level", "lives",
+              "frames", "seconds", "mean_ms", "max_ms"]
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fields, extrasaction="ignore")
+        writer.writeheader()
+        for r in sorted(results, key=lambda r: r["index"]):
+            writer.writerow(r)
+
+
+# ============================================================
+#  入口
+# ============================================================
+def run(kind="duck", games=200, workers=None, seed=0, mistakes=None,
+        max_minutes=10, render=False, progress=True):
+    """跑 games 局，返回 (逐局结果列表, 合并后的帧耗时直方图, 墙钟秒数)"""
+    if mistakes is None:
+        mistakes = default_mistakes(kind)
+    max_frames = int(max_minutes * 60 * FPS)
+    tasks = [make_task(i, seed + i, mistakes, max_frames) for i in range(games)]
+    return run_tasks(kind, tasks, workers, render, progress)
+
+
+def default_mistakes(kind):
+    return 0.0 if kind == "duck" else 0.1
+
+
+def run_tasks(kind, tasks, workers=None, render=False, progress=True):
+    """在进程池里跑一组 make_task() 生成的任务"""
+    workers = workers or os.cpu_count() or 1
+    results = []
+    hist = np.zeros(BUCKETS + 1, dtype=np.int64)
+    start = time.perf_counter()
+    with multiprocessing.Pool(workers, _init_worker, (kind, render)) as pool:
+        for result, h in pool.imap_unordered(play_one, tasks, chunksize=2):
+            results.append(result)
+            hist += h
+            if progress and len(results) % max(1, len(tasks) // 10) == 0:
+                print(f"  {len(results)}/{len(tasks)}")
+    return results, hist, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="机器人自对弈压测")
+    parser.add_argument("--game", choices=("duck", "sort"), default="duck",
+                        help="duck = scripts/main.py，sort = 根目录 main.py")
+    parser.add_argument("--games", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=None,
+                        help="进程数（默认 CPU 核数）")
+    parser.add_argument("--seed", type=int, default=0, help="第 i 局的种子为 seed + i")
+    parser.add_argument("--mistakes", type=float, default=None,
+                        help="机器人放错桶的概率（默认小鸭 0，分类 0.1）")
+    parser.add_argument("--max-minutes", type=float, default=10,
+                        help="单局上限（游戏内分钟），到了记为 timeout")
+    parser.add_argument("--render", action="store_true", help="照常绘制")
+    parser.add_argument("--csv", default=None, help="写出逐局结果")
+    parser.add_argument("--min-win-rate", type=float, default=None,
+                        help="通关率低于它时退出码为 1")
+    args = parser.parse_args(argv)
+
+    results, hist, wall = run(args.game, args.games, args.workers, args.seed,
+                              args.mistakes, args.max_minutes, args.render)
+    for line in summarize(args.game, results, hist, wall):
+        print(line)
+    if args.csv:
+        write_csv(args.csv, results)
+        print(f"逐局结果已写入 {args.csv}")
+    if args.min_win_rate is not None:
+        rate = sum(r["outcome"] == "win" for r in results) / len(results)
+        if rate < args.min_win_rate:
+            print(f"通关率 {rate:.1%} 低于 {args.min_win_rate:.1%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
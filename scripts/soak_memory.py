@@ -0,0 +1,183 @@
+"""
+soak_memory.py —— 内存浸泡测试
+包含：无窗口驱动 scripts/main.py 连续打 N 局（菜单 → 三关 → 结算 → 菜单），
+每回到一次菜单记录 tracemalloc 追踪量，超过阈值就以非 0 退出码失败
+
+默认用 bot.py 的 DuckBot 按正式的 LEVEL_CONFIGS 打（和 selfplay.py 一样只按键 /
+点鼠标，走的是真人操作的路径；机器人第二关多半超时结束，第三关走得少），
+默认 5 局约 2.6 万帧，开着 tracemalloc 要跑几分钟。
+--fast 换成粗暴的驱动：直接把小鸭"瞬移"到要交互的物体上再按空格，并把各关
+目标分调低，每局都很快走到第三关和结算，只为把状态切换和刷新路径反复走一遍。
+
+用法：
+  python soak_memory.py                       # 默认 5 局，第 1 局当预热
+  python soak_memory.py --sessions 10 --max-growth-kb 128
+  python soak_memory.py --report memory.txt   # 同时写出逐次切换的对比报告
+  python soak_memory.py --fast                # 瞬移驱动 + 调低的目标分
+"""
+
+import os
+import sys
+import random
+import argparse
+from collections import defaultdict
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from main import (
+    Game, STATE_MENU, STATE_PLAYING, STATE_LEVEL_UP, STATE_WIN,
+    STATE_GAME_OVER,
+)
+from level import LEVEL_CONFIGS
+from items import Trash, TrashBin, Faucet, SeedlingPile, PlantSpot
+from memdiag import MemoryDiagnostics
+from options import OPTIONS
+from bot import DuckBot
+
+_NO_KEYS = defaultdict(bool)
+
+# --fast 用的目标分：每局都能快速走到第三关和结算
+SOAK_TARGETS = {1: 6, 2: 6, 3: 4}
+
+
+# ============================================================
+#  --fast 驱动：每帧决定要喂给 Game.step 的输入
+# ============================================================
+def _click(button):
+    pos = button.rect.center
+    return [pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=pos)], pos
+
+
+def _space():
+    return [pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE,
+                               mod=0, unicode=" ", scancode=0)]
+
+
+def _target(game):
+    """当前关卡下一个要交互的物体"""
+    world, duck = game.world, game.duck
+    level_id = game.level_manager.current_level
+    objects = [o for o in world.objects if o.active]
+    if level_id == 1:
+        if duck.carrying is None:
+            wanted = [o for o in objects if isinstance(o, Trash)]
+        else:
+            wanted = [o for o in objects if isinstance(o, TrashBin)
+                      and o.category == duck.carrying_category]
+    elif level_id == 2:
+        wanted = [o for o in objects if isinstance(o, Faucet) and o.is_open]
+    else:
+        if duck.carrying is None:
+            wanted = [o for o in objects if isinstance(o, SeedlingPile)]
+        else:
+            wanted = [o for o in objects
+                      if isinstance(o, PlantSpot) and not o.planted]
+    if not wanted:
+        return None
+    return min(wanted, key=lambda o: o.distance_to(duck.x, duck.y))
+
+
+class TeleportDriver:
+    """和 DuckBot 一样的接口，但直接改小鸭坐标，不走路"""
+
+    def __init__(self, game):
+        self.game = game
+
+    def next_input(self):
+        """返回 (events, mouse_pos, keys)"""
+        events, mouse_pos = self._input(self.game)
+        return events, mouse_pos, _NO_KEYS
+
+    @staticmethod
+    def _input(game):
+        state = game.state
+        if state == STATE_MENU:
+            return _click(game.btn_start)
+        if state == STATE_LEVEL_UP:
+            return _click(game.btn_next) if game.result_timer > 30 else ([], (0, 0))
+        if state in (STATE_WIN, STATE_GAME_OVER):
+            return _click(game.btn_menu) if game.result_timer > 30 else ([], (0, 0))
+        if state == STATE_PLAYING and game.world and game.space_cooldown == 0:
+            target = _target(game)
+            if target is not None:
+                game.duck.x, game.duck.y = target.x, target.y
+                return _space(), (0, 0)
+        return [], (0, 0)
+
+
+# ============================================================
+#  浸泡
+# ============================================================
+def soak(sessions, warmup, max_frames, report=None, seed=0, fast=False):
+    OPTIONS.seed = seed
+    game = Game()
+    driver = TeleportDriver(game) if fast else DuckBot(game, random.Random(seed))
+    diag = MemoryDiagnostics()
+    diag.start(report, dump_at_exit=False)
+    game.state_listeners.append(diag.on_transition)
+
+    menu_sizes = []
+    frames = 0
+    in_session = False
+
+    def on_transition(old, new):
+        nonlocal in_session
+        if new == STATE_PLAYING:
+            in_session = True
+        elif new == STATE_MENU and in_session:
+            in_session = False
+            # diag 的监听器先跑，log 最后一条就是这次回到菜单的快照
+            menu_sizes.append(diag.log[-1][1])
+            print(f"第 {len(menu_sizes)} 局结束  追踪中 "
+                  f"{menu_sizes[-1] / 1024:.1f} KiB  共 {frames} 帧")
+
+    game.state_listeners.append(on_transition)
+
+    while len(menu_sizes) < sessions and frames < max_frames:
+        game.step(*driver.next_input(), fps=0)
+        frames += 1
+
+    if report:
+        diag.dump(report)
+    return game, diag, menu_sizes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="scripts/main.py 内存浸泡测试")
+    parser.add_argument("--sessions", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1,
+                        help="前几局只用来填满各种缓存，不计入增长")
+    parser.add_argument("--max-growth-kb", type=float, default=64,
+                        help="预热之后允许的总增长")
+    parser.add_argument("--max-frames", type=int, default=200000)
+    parser.add_argument("--report", default=None, help="写出逐次切换的对比报告")
+    parser.add_argument("--fast", action="store_true",
+                        help="瞬移驱动，目标分调低（只走状态切换，不测玩法）")
+    args = parser.parse_args(argv)
+
+    if args.fast:
+        for level_id, target in SOAK_TARGETS.items():
+            LEVEL_CONFIGS[level_id]["target_score"] = target
+
+    game, diag, sizes = soak(args.sessions, args.warmup, args.max_frames,
+                             args.report, fast=args.fast)
+    if len(sizes) <= args.warmup:
+        print(f"只完成了 {len(sizes)} 局，不足以判断")
+        return 2
+
+    growth = (sizes[-1] - sizes[args.warmup - 1 if args.warmup else 0]) / 1024
+    print(f"预热后增长 {growth:+.1f} KiB（阈值 {args.max_growth_kb} KiB）")
+    if growth > args.max_growth_kb:
+        print("疑似泄漏，增长最多的位置：")
+        for size, where in diag.baseline_growth(STATE_MENU):
+            print(f"  {size / 1024:+9.1f} KiB  {where}")
+        return 1
+    print("通过")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+"""
+tasks.py —— 按帧分时的协作式任务调度
+包含：生成器任务、优先级、取消、按本帧剩余预算运行、防饿死
+
+太贵、一帧做不完，又和 pygame 纠缠太深不适合丢给线程的准备工作
+（emoji 栅格化、地面贴图、字体预热、下一关预载……）写成生成器，
+每做完一小块就 yield 一次。主循环在 flip 之后、等下一帧之前调用 run()，
+调度器只在本帧还没用完预算时一块一块地推进任务，超出预算前停手。
+
+    tasks = TaskScheduler(1000 / 60)
+    task = tasks.submit(warm_icons(), priority=5, name="icons")
+    ...每帧：tasks.begin_frame() ... 更新 / 绘制 / flip ... tasks.run()
+    task.cancel()        # 不再需要时
+
+priority 数字越小越先跑；同优先级的任务每块之间轮转。
+"""
+
+import heapq
+import time
+
+
+_now = time.perf_counter
+
+
+class Task:
+    __slots__ = ("name", "priority", "gen", "on_done", "done", "cancelled",
+                 "result", "error", "slices")
+
+    def __init__(self, gen, priority, name, on_done):
+        self.gen = gen
+        self.priority = priority
+        self.name = name
+        self.on_done = on_done
+        self.done = False
+        self.cancelled = False
+        self.result = None
+        self.error = None
+        self.slices = 0
+
+    def cancel(self):
+        """取消：生成器会被 close()，不会再跑"""
+        if not self.done:
+            self.cancelled = True
+            self.done = True
+            self.gen.close()
+
+    def step(self):
+        """推进一块；返回 False 表示任务结束了"""
+        self.slices += 1
+        try:
+            next(self.gen)
+            return True
+        except StopIteration as e:
+            self.result = e.value
+        except Exception as e:
+            self.error = e
+            print(f"后台任务 {self.name} 出错：{e!r}")
+        self.done = True
+        if self.on_done is not None and self.error is None:
+            self.on_done(self.result)
+        return False
+
+    def finish(self):
+        """不管预算，立刻跑完（马上就要用结果时）"""
+        while not self.done:
+            self.step()
+        return self.result
+
+
+class TaskScheduler:
+    RESERVE_MS = 2.0        # 给 GC / 等待留的余量，预算剩这么多就停手
+    STARVE_FRAMES = 30      # 连续这么多帧没有余量时也强制推进一块，避免永远做不完
+
+    def __init__(self, budget_ms=1000 / 60):
+        self.budget_ms = budget_ms
+        self._heap = []
+        self._seq = 0
+        self._frame_start = None
+        self._starved = 0
+        self.last_ms = 0.0      # 上一次 run() 用掉的时间
+        self.last_slices = 0
+
+    # --------------------------------------------------
+    #  登记
+    # --------------------------------------------------
+    def submit(self, gen, priority=10, name=None, on_done=None):
+        """gen: 生成器对象；结束时 on_done(返回值)"""
+        task = Task(gen, priority, name or getattr(gen, "__name__", "task"),
+                    on_done)
+        self._push(task)
+        return task
+
+    def _push(self, task):
+        self._seq += 1
+        heapq.heappush(self._heap, (task.priority, self._seq, task))
+
+    def cancel_all(self, name=None):
+        for _, _, task in self._heap:
+            if name is None or task.name == name:
+                task.cancel()
+
+    @property
+    def pending(self):
+        return sum(1 for _, _, task in self._heap if not task.done)
+
+    # --------------------------------------------------
+    #  每帧
+    # --------------------------------------------------
+    def begin_frame(self):
+        self._frame_start = _now()
+
+    def run(self):
+        """在 flip 之后、等待下一帧之前调用；返回本次用掉的 ms"""
+        start = _now()
+        frame_start = self._frame_start if self._frame_start is not None else start
+        deadline = frame_start + (self.budget_ms - self.RESERVE_MS) / 1000
+        slices = 0
+        heap = self._heap
+        while heap:
+            task = heap[0][2]
+            if task.done:
+                heapq.heappop(heap)
+                continue
+            if _now() >= deadline:
+                # 没有余量：饿得太久就硬推一块
+                if slices or self._starved < self.STARVE_FRAMES:
+                    break
+            heapq.heappop(heap)
+            slices += 1
+            if task.step():
+                self._push(task)
+        if heap and not slices:
+            self._starved += 1
+        else:
+            self._starved = 0
+        self.last_slices = slices
+        self.last_ms = (_now() - start) * 1000
+        return self.last_ms
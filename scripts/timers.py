@@ -0,0 +1,106 @@
+"""
+timers.py —— 以帧（tick）为单位的计时调度器
+包含：一次性 / 周期定时器、回调、暂停与恢复
+代替各处每帧手动 -1 的倒计时字段：只有到期的定时器才会在 tick 时被处理
+"""
+
+import copy
+import heapq
+
+
+class Timer:
+    __slots__ = ("deadline", "period", "callback", "cancelled")
+
+    def __init__(self, deadline, period, callback):
+        self.deadline = deadline
+        self.period = period
+        self.callback = callback
+        self.cancelled = False
+
+
+class Scheduler:
+    """
+    小根堆存放 (到期帧, 序号, 定时器)。取消采用惰性删除：
+    只打标记，等它浮到堆顶时再丢掉，所以 tick() 的开销只和到期数量有关。
+    """
+
+    def __init__(self):
+        self.now = 0
+        self.paused = False
+        self._heap = []
+        self._seq = 0
+
+    # --------------------------------------------------
+    #  登记
+    # --------------------------------------------------
+    def after(self, ticks, callback=None):
+        """ticks 帧后触发一次；callback 可以为空，只当倒计时用"""
+        return self._push(Timer(self.now + max(0, int(ticks)), 0, callback))
+
+    def every(self, ticks, callback):
+        """每 ticks 帧触发一次"""
+        ticks = max(1, int(ticks))
+        return self._push(Timer(self.now + ticks, ticks, callback))
+
+    def _push(self, timer):
+        self._seq += 1
+        heapq.heappush(self._heap, (timer.deadline, self._seq, timer))
+        return timer
+
+    def cancel(self, timer):
+        if timer is not None:
+            timer.cancelled = True
+
+    # --------------------------------------------------
+    #  查询
+    # --------------------------------------------------
+    def remaining(self, timer):
+        """还剩几帧到期；没有 / 已取消 / 已到期都返回 0"""
+        if timer is None or timer.cancelled:
+            return 0
+        return max(0, timer.deadline - self.now)
+
+    def active(self, timer):
+        return self.remaining(timer) > 0
+
+    def since(self, tick):
+        """从某一帧到现在经过了多少帧"""
+        return self.now - tick
+
+    def snapshot(self):
+        """只读副本：时间停在当前帧，只用来查询 remaining / active / since"""
+        snap = copy.copy(self)
+        snap._heap = []
+        return snap
+
+    # --------------------------------------------------
+    #  推进
+    # --------------------------------------------------
+    def pause(self):
+        self.paused = True
+
+    def resume(self):
+        self.paused = False
+
+    def tick(self):
+        if self.paused:
+            return
+        self.now += 1
+        heap = self._heap
+        while heap and heap[0][0] <= self.now:
+            _, _, timer = heapq.heappop(heap)
+            if timer.cancelled:
+                continue
+            if timer.period:
+                timer.deadline += timer.period
+                self._push(timer)
+            else:
+                # 一次性定时器触发后视为取消，remaining() 归零
+                timer.cancelled = True
+            if timer.callback is not None:
+                timer.callback()
+
+    def clear(self):
+        for _, _, timer in self._heap:
+            timer.cancelled = True
+        self._heap.clear()
@@ -0,0 +1,203 @@
+"""
+tracing.py —— 轻量级区间追踪
+包含：span 上下文管理器、traced 装饰器、预分配环形缓冲、Chrome trace JSON 导出
+导出的文件可直接拖进 Perfetto（ui.perfetto.dev）或 chrome://tracing 查看单帧卡顿
+"""
+
+import os
+import json
+import time
+import atexit
+import functools
+import threading
+
+_now = time.perf_counter_ns     # 单调时钟，纳秒
+
+
+class _NullSpan:
+    """关闭追踪时所有 span() 共用的空上下文"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "start")
+
+    def __init__(self, tracer, name):
+        self.tracer = tracer
+        self.name = name
+
+    def __enter__(self):
+        self.start = _now()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.record(self.name, self.start)
+        return False
+
+
+class Tracer:
+    """
+    区间记录存在定长的并列数组里（容量取 2 的幂），写满后覆盖最旧的记录，
+    长时间运行内存也不会增长；导出时只保留最近 capacity 条。
+    --pipeline 时绘制线程也在记录：写指针在锁里领一个槽位，各写各的槽。
+    """
+
+    CAPACITY = 1 << 16
+
+    def __init__(self, capacity=CAPACITY):
+        size = 1
+        while size < capacity:
+            size <<= 1
+        self.capacity = size
+        self._mask = size - 1
+        self._names = [None] * size
+        self._starts = [0] * size
+        self._durs = [0] * size
+        self._tids = [0] * size
+        self._written = 0
+        self._lock = threading.Lock()
+        self.enabled = False
+        self.path = "trace.json"
+        self._origin = _now()
+        self._atexit = False
+
+    # --------------------------------------------------
+    #  开关
+    # --------------------------------------------------
+    def enable(self, path=None, dump_at_exit=True):
+        if path:
+            self.path = path
+        self.enabled = True
+        if dump_at_exit and not self._atexit:
+            atexit.register(self._dump_at_exit)
+            self._atexit = True
+
+    def disable(self):
+        self.enabled = False
+
+    def clear(self):
+        with self._lock:
+            self._written = 0
+
+    # --------------------------------------------------
+    #  记录
+    # --------------------------------------------------
+    def now(self):
+        """区间起点；关闭时返回 0，配合 record() 手动记录"""
+        return _now() if self.enabled else 0
+
+    def record(self, name, start, end=None):
+        if not self.enabled or not start:
+            return
+        if end is None:
+            end = _now()
+        with self._lock:
+            i = self._written & self._mask
+            self._written += 1
+        self._names[i] = name
+        self._starts[i] = start
+        self._durs[i] = end - start
+        self._tids[i] = threading.get_ident()
+
+    def span(self, name):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def __len__(self):
+        return min(self._written, self.capacity)
+
+    # --------------------------------------------------
+    #  导出
+    # --------------------------------------------------
+    def events(self):
+        """按时间顺序返回 [(name, start_ns, dur_ns, tid)]"""
+        n = len(self)
+        first = self._written - n
+        out = []
+        for k in range(first, self._written):
+            i = k & self._mask
+            out.append((self._names[i], self._starts[i], self._durs[i],
+                        self._tids[i]))
+        out.sort(key=lambda e: e[1])
+        return out
+
+    def to_chrome(self):
+        pid = os.getpid()
+        threads = {t.ident: t.name for t in threading.enumerate()}
+        trace = []
+        seen = set()
+        for name, start, dur, tid in self.events():
+            if tid not in seen:
+                seen.add(tid)
+                trace.append({"name": "thread_name", "ph": "M", "pid": pid,
+                              "tid": tid,
+                              "args": {"name": threads.get(tid, str(tid))}})
+            trace.append({
+                "name": name,
+                "cat": "game",
+                "ph": "X",
+                "ts": (start - self._origin) / 1000,
+                "dur": dur / 1000,
+                "pid": pid,
+                "tid": tid,
+            })
+        return {"traceEvents": trace, "displayTimeUnit": "ms"}
+
+    def dump(self, path=None):
+        """写出 Chrome trace JSON，返回文件路径"""
+        path = path or self.path
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_chrome(), f, ensure_ascii=False)
+        return path
+
+    def dump_snapshot(self):
+        """热键导出：在默认文件名后加时间戳，不覆盖之前的文件"""
+        stem, ext = os.path.splitext(self.path)
+        return self.dump(f"{stem}-{time.strftime('%Y%m%d-%H%M%S')}{ext or '.json'}")
+
+    def _dump_at_exit(self):
+        if self._written:
+            print(f"追踪已写入 {self.dump()}")
+
+
+# 全局追踪器：各模块直接 from tracing import tracer, traced
+tracer = Tracer()
+
+
+def span(name):
+    return tracer.span(name)
+
+
+def traced(name=None):
+    """
+    把函数调用记成一个区间。用法：@traced 或 @traced("名字")
+    关闭时只多一次属性判断。
+    """
+    def wrap(fn):
+        label = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return fn(*args, **kwargs)
+            start = _now()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                tracer.record(label, start)
+        return wrapper
+
+    if callable(name):
+        fn, name = name, None
+        return wrap(fn)
+    return wrap
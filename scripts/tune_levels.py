@@ -0,0 +1,230 @@
+"""
+tune_levels.py —— 关卡难度调参
+包含：对 LEVEL_CONFIGS 的参数做网格 / 随机扫描，每组配置在进程池里用机器人
+无窗口打若干局（只打指定的那一关），输出通关率与通关用时表
+
+每组配置用同一批种子（第 i 局种子 = --seed + i），配置之间的差异不会被
+随机出生点的运气盖住。机器人比孩子熟练得多（见 bot.py），得到的通关率
+是上限，--target-win-rate 要按这个留余量；--mistakes 可以让它笨一点。
+
+参数写法（键都是 LEVEL_CONFIGS[关卡] 里的键）：
+  time_limit=45,60,75        逐个列出
+  faucet_reopen_interval=150:400:50   起:止:步长（含两端）
+  lumberjack_ai=patrol,duck  字符串也可以
+
+用法：
+  python tune_levels.py --level 2                      # 用预设的扫描范围
+  python tune_levels.py --level 2 --param time_limit=45:90:15 --games 100
+  python tune_levels.py --level 3 --samples 12         # 从全部组合里随机取 12 组
+  python tune_levels.py --level 1 --target-win-rate 0.8 --halving --csv tune.csv
+"""
+
+import sys
+import random
+import argparse
+import itertools
+
+import numpy as np
+
+from selfplay import make_task, run_tasks, default_mistakes, FPS
+from level import LEVEL_CONFIGS
+
+
+# 每关默认扫描的参数
+PRESETS = {
+    1: {"target_score": [10, 15, 20],
+        "trash_min": [3, 5, 8],
+        "trash_refill": [4, 8]},
+    2: {"target_score": [15, 20],
+        "time_limit": [45, 60, 75, 90],
+        "faucet_reopen_interval": [150, 200, 300, 400]},
+    3: {"target_score": [8, 12, 16],
+        "lumberjacks": [3, 5, 7],
+        "lumberjack_speed_max": [2.0, 3.0]},
+}
+
+
+# ============================================================
+#  参数
+# ============================================================
+def _number(text):
+    try:
+        return int(text)
+    except ValueError:
+        try:
+            return float(text)
+        except ValueError:
+            return text
+
+
+def parse_param(spec):
+    """"key=a,b,c" 或 "key=lo:hi:step" -> (key, [值...])"""
+    key, _, values = spec.partition("=")
+    if not values:
+        raise argparse.ArgumentTypeError(f"参数格式应为 key=值列表：{spec}")
+    if values.count(":") == 2:
+        lo, hi, step = (_number(v) for v in values.split(":"))
+        out = []
+        v = lo
+        while v <= hi + 1e-9:
+            out.append(round(v, 6) if isinstance(v, float) else v)
+            v += step
+        return key, out
+    return key, [_number(v) for v in values.split(",")]
+
+
+def configurations(grid, samples=None, rng=None):
+    """grid: {键: [值...]}；返回 [{键: 值}]，samples 给定时随机取这么多组"""
+    keys = list(grid)
+    combos = [dict(zip(keys, values))
+              for values in itertools.product(*(grid[k] for k in keys))]
+    if samples is not None and samples < len(combos):
+        combos = (rng or random.Random(0)).sample(combos, samples)
+    return combos
+
+
+# ============================================================
+#  评估
+# ============================================================
+def evaluate(level, configs, games, seed, mistakes, max_minutes, workers,
+             seed_offset=0):
+    """每组配置打 games 局，返回 [(配置, 该配置的逐局结果)]"""
+    max_frames = int(max_minutes * 60 * FPS)
+    tasks = []
+    for c, config in enumerate(configs):
+        for i in range(games):
+            tasks.append(make_task(len(tasks), seed + seed_offset + i, mistakes,
+                                   max_frames, level=level,
+                                   overrides={level: config}, tag=c))
+    results, _, wall = run_tasks("duck", tasks, workers)
+    grouped = [[] for _ in configs]
+    for r in results:
+        grouped[r["tag"]].append(r)
+    print(f"  {len(configs)} 组 × {games} 局，用时 {wall:.1f} s")
+    return list(zip(configs, grouped))
+
+
+def stats(results):
+    n = len(results)
+    count = lambda outcome: sum(r["outcome"] == outcome for r in results)
+    wins = [r["seconds"] for r in results if r["outcome"] == "win"]
+    row = {"games": n,
+           "win_rate": count("win") / n,
+           "fail_rate": count("game_over") / n,
+           "timeout_rate": count("timeout") / n,
+           "mean_score": float(np.mean([r["score"] for r in results]))}
+    if wins:
+        row["mean_s"] = float(np.mean(wins))
+        row["p50_s"], row["p90_s"] = (float(v) for v in np.percentile(wins, [50, 90]))
+    else:
+        row["mean_s"] = row["p50_s"] = row["p90_s"] = float("nan")
+    return row
+
+
+def merge(old, new):
+    """同一组配置两轮的结果合并"""
+    by_config = {tuple(sorted(c.items())): list(rs) for c, rs in old}
+    for c, rs in new:
+        by_config.setdefault(tuple(sorted(c.items())), []).extend(rs)
+    return [(dict(k), rs) for k, rs in by_config.items()]
+
+
+# ============================================================
+#  输出
+# ============================================================
+def table(keys, rows):
+    widths = [max(10, len(k)) for k in keys]
+    header = ["局数", "通关率", "失败", "超时", "平均s", "p50 s", "p90 s", "平均分"]
+    lines = ["  ".join([f"{k:>{w}s}" for k, w in zip(keys, widths)]
+                       + [f"{h:>10s}" for h in header])]
+    for config, row in rows:
+        cells = [f"{config[k]!s:>{w}s}" for k, w in zip(keys, widths)]
+        cells += [f"{row['games']:>10d}",
+                  f"{row['win_rate']:>10.1%}", f"{row['fail_rate']:>10.1%}",
+                  f"{row['timeout_rate']:>10.1%}",
+                  f"{row['mean_s']:>10.1f}", f"{row['p50_s']:>10.1f}",
+                  f"{row['p90_s']:>10.1f}", f"{row['mean_score']:>10.1f}"]
+        lines.append("  ".join(cells))
+    return lines
+
+
+def write_csv(path, keys, rows):
+    import csv
+    fields = ["games", "win_rate", "fail_rate", "timeout_rate",
+              "mean_s", "p50_s", "p90_s", "mean_score"]
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow([*keys, *fields])
+        for config, row in rows:
+            writer.writerow([config[k] for k in keys] + [row[k] for k in fields])
+
+
+# ============================================================
+#  入口
+# ============================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="LEVEL_CONFIGS 难度调参")
+    parser.add_argument("--level", type=int, choices=(1, 2, 3), required=True)
+    parser.add_argument("--param", action="append", type=parse_param, default=[],
+                        metavar="KEY=VALUES", help="要扫描的参数，可以给多个")
+    parser.add_argument("--games", type=int, default=50, help="每组配置打几局")
+    parser.add_argument("--samples", type=int, default=None,
+                        help="从全部组合里随机取这么多组（默认全部）")
+    parser.add_argument("--halving", action="store_true",
+                        help="先每组打 1/4 局，只给离目标最近的 1/3 补满（需要 --target-win-rate）")
+    parser.add_argument("--target-win-rate", type=float, default=None,
+                        help="按通关率与它的差距排序")
+    parser.add_argument("--mistakes", type=float, default=None)
+    parser.add_argument("--max-minutes", type=float, default=5,
+                        help="单局上限（游戏内分钟），到了记为超时")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--csv", default=None)
+    args = parser.parse_args(argv)
+    if args.halving and args.target_win_rate is None:
+        parser.error("--halving 要和 --target-win-rate 一起用（按离目标的远近筛选）")
+    # 拼错的键会被当成新键塞进配置，整轮扫描都白跑
+    unknown = [key for key, _ in args.param or ()
+               if key not in LEVEL_CONFIGS[args.level]]
+    if unknown:
+        parser.error(f"第 {args.level} 关没有这些参数：{', '.join(unknown)}"
+                     f"（可用：{', '.join(LEVEL_CONFIGS[args.level])}）")
+
+    grid = dict(args.param) if args.param else PRESETS[args.level]
+    keys = list(grid)
+    configs = configurations(grid, args.samples, random.Random(args.seed))
+    mistakes = (default_mistakes("duck") if args.mistakes is None
+                else args.mistakes)
+    target = args.target_win_rate
+    distance = lambda row: abs(row["win_rate"] - target)
+    print(f"第 {args.level} 关：{len(configs)} 组配置，每组 {args.games} 局")
+
+    run = lambda cs, n, offset=0: evaluate(
+        args.level, cs, n, args.seed, mistakes, args.max_minutes,
+        args.workers, offset)
+    if args.halving and len(configs) > 3:
+        first = max(1, args.games // 4)
+        evaluated = run(configs, first)
+        evaluated.sort(key=lambda item: distance(stats(item[1])))
+        keep = evaluated[:max(1, len(evaluated) // 3)]
+        print(f"  保留离目标最近的 {len(keep)} 组补满 {args.games} 局")
+        evaluated = merge(keep, run([c for c, _ in keep], args.games - first,
+                                    offset=first))
+    else:
+        evaluated = run(configs, args.games)
+
+    rows = [(config, stats(results)) for config, results in evaluated]
+    if target is not None:
+        rows.sort(key=lambda item: distance(item[1]))
+    else:
+        rows.sort(key=lambda item: [item[0][k] for k in keys])
+    for line in table(keys, rows):
+        print(line)
+    if args.csv:
+        write_csv(args.csv, keys, rows)
+        print(f"调参结果已写入 {args.csv}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,206 @@
+"""
+view.py —— 内部渲染分辨率
+包含：逻辑坐标 → 画布像素 的统一变换、按比例缩放的绘图函数、画布
+
+游戏逻辑、碰撞、鼠标、按钮一律用逻辑坐标（1440x900）。所有画到屏幕上的东西
+都经过本模块：
+
+    view.draw.rect(surf, color, (x, y, w, h), border_radius=8)
+    view.blit(target, source, (x, y))
+    s = view.Surface((w, h), pygame.SRCALPHA)     # 临时画布也按比例建
+    w, h = view.size(text_surf)                   # 换回逻辑尺寸再排版
+    font = view.font(path, 30)                    # 字号按比例
+
+--render-size 720x450 时画布只有 1440x900 的 1/4 像素，每帧画完由
+display.present() 放大一次贴到窗口；窗口被拖小时画布跟着按窗口比例缩小
+（见 display.py）。鼠标坐标由 display.to_logical() 换回逻辑坐标。
+比例为 1（默认）时这些名字直接就是 pygame 自己的函数
+（Surface 除外），不多一层 Python 调用，画面和以前逐像素相同。
+
+放大本身是一次整窗写入（720x450 → 1440x900 约 0.8 ms，非整数倍的
+1080x675 约 1.7 ms），省下的是每帧若干次整屏 blit / fill / 半透明叠加
+和大块 SRCALPHA 临时画布的填充；绘制调用次数不变，调用开销为主的画面省不了多少。
+"""
+
+import math
+
+import pygame
+
+
+scale = 1.0
+logical_size = (1440, 900)
+render_size = (1440, 900)
+
+
+def _round(v):
+    return math.floor(v * scale + 0.5)
+
+
+def _pt(p):
+    return (p[0] * scale, p[1] * scale)
+
+
+def _rect(r):
+    """按两条边分别取整，相邻的矩形缩小后不会出现缝"""
+    x, y, w, h = r
+    x0, y0 = _round(x), _round(y)
+    return (x0, y0, max(1, _round(x + w) - x0) if w > 0 else 0,
+            max(1, _round(y + h) - y0) if h > 0 else 0)
+
+
+def _width(w):
+    """线宽：0 表示填充，必须保持 0；细线至少 1 像素"""
+    return max(1, _round(w)) if w > 0 else w
+
+
+def _size(size):
+    return (max(1, _round(size[0])) if size[0] > 0 else 0,
+            max(1, _round(size[1])) if size[1] > 0 else 0)
+
+
+# ============================================================
+#  按比例缩放的 pygame.draw
+# ============================================================
+class _ScaledDraw:
+    @staticmethod
+    def rect(surface, color, rect, width=0, border_radius=0, **radii):
+        radii = {k: (_round(v) if v > 0 else v) for k, v in radii.items()}
+        return pygame.draw.rect(surface, color, _rect(rect), _width(width),
+                                _round(border_radius) if border_radius > 0 else 0,
+                                **radii)
+
+    @staticmethod
+    def circle(surface, color, center, radius, width=0, **quadrants):
+        return pygame.draw.circle(surface, color, _pt(center),
+                                  max(1, radius * scale) if radius > 0 else 0,
+                                  _width(width), **quadrants)
+
+    @staticmethod
+    def ellipse(surface, color, rect, width=0):
+        return pygame.draw.ellipse(surface, color, _rect(rect), _width(width))
+
+    @staticmethod
+    def arc(surface, color, rect, start_angle, stop_angle, width=1):
+        return pygame.draw.arc(surface, color, _rect(rect), start_angle,
+                               stop_angle, _width(width))
+
+    @staticmethod
+    def line(surface, color, start_pos, end_pos, width=1):
+        return pygame.draw.line(surface, color, _pt(start_pos), _pt(end_pos),
+                                _width(width))
+
+    @staticmethod
+    def lines(surface, color, closed, points, width=1):
+        return pygame.draw.lines(surface, color, closed,
+                                 [_pt(p) for p in points], _width(width))
+
+    @staticmethod
+    def polygon(surface, color, points, width=0):
+        return pygame.draw.polygon(surface, color, [_pt(p) for p in points],
+                                   _width(width))
+
+
+def _scaled_blit(target, source, dest, area=None, special_flags=0):
+    if area is not None:
+        area = _rect(area)
+    return target.blit(source, (_round(dest[0]), _round(dest[1])), area,
+                       special_flags)
+
+
+def _scaled_surface(size, flags=0, *args):
+    return pygame.Surface(_size(size), flags, *args)
+
+
+def _scaled_font(path, size):
+    return pygame.font.Font(path, max(1, _round(size)))
+
+
+def _scaled_transform(surface, size):
+    return pygame.transform.smoothscale(surface, _size(size))
+
+
+def _logical_size(surf):
+    w, h = surf.get_size()
+    return (math.floor(w / scale + 0.5), math.floor(h / scale + 0.5))
+
+
+def _logical_width(surf):
+    return math.floor(surf.get_width() / scale + 0.5)
+
+
+def _logical_height(surf):
+    return math.floor(surf.get_height() / scale + 0.5)
+
+
+def _logical_rect(surf, **kwargs):
+    rect = pygame.Rect((0, 0), _logical_size(surf))
+    for key, value in kwargs.items():
+        setattr(rect, key, value)
+    return rect
+
+
+def _surface(size, flags=0, *args):
+    # 运行时再取 pygame.Surface：--draw-stats 会临时把它换成计数子类
+    return pygame.Surface(size, flags, *args)
+
+
+# ============================================================
+#  配置
+# ============================================================
+def configure(logical, render=None):
+    """
+    logical：游戏坐标系的大小；render：画布像素大小（None 表示和逻辑一样）。
+    宽高比不一致时按较小的比例，画布取整后的大小见 render_size。
+    """
+    global scale, logical_size, render_size
+    global draw, blit, Surface, font, smoothscale, size, width, height, rect
+    logical_size = tuple(logical)
+    if render is None:
+        scale = 1.0
+    else:
+        scale = min(render[0] / logical[0], render[1] / logical[1])
+    render_size = (_round(logical[0]), _round(logical[1]))
+    if scale == 1.0:
+        draw = pygame.draw
+        blit = pygame.Surface.blit
+        Surface = _surface
+        font = pygame.font.Font
+        smoothscale = pygame.transform.smoothscale
+        size = pygame.Surface.get_size
+        width = pygame.Surface.get_width
+        height = pygame.Surface.get_height
+        rect = pygame.Surface.get_rect
+    else:
+        draw = _ScaledDraw
+        blit = _scaled_blit
+        Surface = _scaled_surface
+        font = _scaled_font
+        smoothscale = _scaled_transform
+        size = _logical_size
+        width = _logical_width
+        height = _logical_height
+        rect = _logical_rect
+    return render_size
+
+
+def ln(v):
+    """逻辑长度 → 画布像素（取整；正数至少 1）"""
+    return max(1, _round(v)) if v > 0 else _round(v)
+
+
+def pixels(size):
+    """逻辑尺寸 → view.Surface(size) 实际的像素尺寸"""
+    return _size(size)
+
+
+# ============================================================
+#  画布
+# ============================================================
+def canvas(window):
+    """画所有东西的画布：大小和窗口正好一样时就是窗口本身"""
+    if render_size == tuple(window.get_size()):
+        return window
+    return pygame.Surface(render_size).convert(window)
+
+
+configure(logical_size)